@@ -1,48 +1,92 @@
 import streamlit as st
 import pandas as pd
 import os
-from src.data_generator import TennisDataGenerator
-from src.data_processor import DataProcessor
-from src.model_trainer import ModelTrainer
-from src.text_processor import TextProcessor
+import threading
+from src.instrumentation import metrics, ensure_metrics_server, SamplingProfiler
 
-def initialize_session_state():
-    if 'model' not in st.session_state:
-        st.session_state.model = ModelTrainer()
-        preprocessor = st.session_state.model.load_model()
-    
-    if 'processor' not in st.session_state:
-        st.session_state.processor = DataProcessor()
-        st.session_state.processor.preprocessor = preprocessor
-    
-    if 'text_processor' not in st.session_state:
+# The model stack (sklearn, shap, numba), langchain, pyarrow and faker are
+# imported where a page first needs them, so the first page renders without
+# waiting for them. TENNIS_EAGER_STARTUP=1 restores loading everything up front.
+EAGER_STARTUP = os.environ.get('TENNIS_EAGER_STARTUP', '0') == '1'
+
+def get_model():
+    # Process-wide model shared read-only by all sessions; reloaded when the file changes
+    from src.model_registry import get_registry
+    return get_registry().get()
+
+def get_demand_index():
+    from src.demand_index import get_demand_index
+    return get_demand_index()
+
+def get_prediction_monitor():
+    from src.prediction_monitor import get_prediction_monitor
+    return get_prediction_monitor()
+
+@st.cache_resource
+def start_preload():
+    # Once per process: import the model stack and load the model and demand
+    # index off the script thread. get_model() waits on the registry lock if
+    # a page needs the model before this finishes.
+    thread = threading.Thread(target=preload, name='model-preload', daemon=True)
+    thread.start()
+    return thread
+
+def preload():
+    try:
+        get_model()
+        get_demand_index()
+    except Exception:
+        # Surfaced again, with the page, when the model is first needed
+        metrics.inc('preload_errors')
+
+def get_openai_api_key():
+    try:
+        return st.secrets.get("OPENAI_API_KEY")
+    except Exception:
+        return None
+
+def get_text_processor(api_key):
+    # Built on first use of the natural-language tab, once per session
+    if st.session_state.get('text_processor') is None:
+        from src.text_processor import TextProcessor
+        from src.llm_cache import get_llm_cache
         try:
-            api_key = st.secrets.get("OPENAI_API_KEY")
-            if not api_key:
-                st.warning("OpenAI API key not found. Natural Language processing will be disabled.")
-                st.session_state.text_processor = None
-            else:
-                st.session_state.text_processor = TextProcessor(api_key)
+            st.session_state.text_processor = TextProcessor(api_key, cache=get_llm_cache())
         except Exception as e:
             st.warning("Error initializing Text Processor. Natural Language processing will be disabled.")
             st.session_state.text_processor = None
+    return st.session_state.text_processor
+
+def initialize_session_state():
+    if EAGER_STARTUP:
+        # Loads the model on the first run of the process only; later sessions reuse it
+        get_model()
+        get_demand_index()
+    else:
+        start_preload()
 
 def main():
     st.title("Tennis Court Price Predictor")
     
+    # Optional Prometheus/JSON endpoint, started once per process
+    if os.environ.get('TENNIS_METRICS_PORT'):
+        ensure_metrics_server(int(os.environ['TENNIS_METRICS_PORT']))
+    
     # Initialize session state
     initialize_session_state()
     
     # Sidebar for navigation
     page = st.sidebar.selectbox(
         "Navigate to",
-        ["Price Prediction", "View Dataset", "About"]
+        ["Price Prediction", "View Dataset", "Diagnostics", "About"]
     )
     
     if page == "Price Prediction":
         show_prediction_page()
     elif page == "View Dataset":
         show_dataset_page()
+    elif page == "Diagnostics":
+        show_diagnostics_page()
     else:
         show_about_page()
 
@@ -104,7 +148,8 @@ def show_prediction_page():
                 show_prediction_results(input_data)
     
     with tab2:
-        if st.session_state.text_processor is None:
+        api_key = get_openai_api_key()
+        if not api_key:
             st.error("Natural Language processing is currently disabled. Please configure OpenAI API key in Streamlit secrets.")
             return
             
@@ -138,8 +183,12 @@ def show_prediction_page():
         )
         
         if st.button("Process Text"):
+            text_processor = get_text_processor(api_key)
+            if text_processor is None:
+                return
+            
             # Process natural language input
-            processed_data = st.session_state.text_processor.process_text(text_input)
+            processed_data = text_processor.process_text(text_input)
             st.json(processed_data)
             
             # Convert the JSON string to dictionary if it's not already
@@ -150,6 +199,14 @@ def show_prediction_page():
                 features = processed_data
                 
             # Create a DataFrame with default values
+            now = pd.Timestamp.now()
+            court = {
+                'court_surface': features.get('court_surface', 'Hard'),
+                'court_type': features.get('court_type', 'Indoor'),
+                'court_quality': features.get('court_quality', 'Standard'),
+                'day_of_week': now.strftime('%A'),
+                'booking_time': now.strftime('%H:%M')
+            }
             input_data = pd.DataFrame({
                 'booking_date': [pd.Timestamp.now()],
                 'booking_time': [pd.Timestamp.now().strftime('%H:%M')],
@@ -167,7 +224,7 @@ def show_prediction_page():
                 'day_of_week': [pd.Timestamp.now().strftime('%A')],
                 'season': [get_season(pd.Timestamp.now())],
                 'booking_lead_time': [0],
-                'historical_demand': [0.5],
+                'historical_demand': [get_demand_index().demand(court)],
                 'temperature': [20],
                 'precipitation_chance': [0],
                 'special_requests': [False]
@@ -177,15 +234,98 @@ def show_prediction_page():
             show_prediction_results(input_data)
 
 def show_dataset_page():
+    from src.data_generator import SURFACE_TYPES, COURT_QUALITY
+    from src.dataset_store import CATEGORY_COLUMNS
+    from src.dataset_explorer import get_explorer, GROUP_COLUMNS
+    
     st.header("Historical Booking Data")
     
-    # Load and display dataset
-    df = pd.read_csv('data/tennis_bookings.csv')
-    st.dataframe(df)
+    explorer = get_explorer()
+    first_date, last_date = explorer.date_range()
+    
+    # Totals come from the explorer's per-day rollup; rows from a pushed-down Parquet scan
+    col1, col2 = st.columns(2)
+    with col1:
+        seasons = st.multiselect("Season", CATEGORY_COLUMNS['season'])
+        surfaces = st.multiselect("Court Surface", SURFACE_TYPES)
+    with col2:
+        qualities = st.multiselect("Court Quality", COURT_QUALITY)
+        dates = st.date_input("Booking Dates", (first_date.date(), last_date.date()),
+                              min_value=first_date.date(), max_value=last_date.date())
+    
+    filters = []
+    if seasons:
+        filters.append(('season', 'in', seasons))
+    if surfaces:
+        filters.append(('court_surface', 'in', surfaces))
+    if qualities:
+        filters.append(('court_quality', 'in', qualities))
+    if len(dates) == 2:
+        filters.append(('booking_date', '>=', pd.Timestamp(dates[0])))
+        filters.append(('booking_date', '<', pd.Timestamp(dates[1]) + pd.Timedelta(days=1)))
+    
+    # Display one page of bookings at a time
+    total = explorer.count_rows(filters)
+    num_pages = explorer.num_pages(filters)
+    page_number = st.number_input(f"Page (of {num_pages})", min_value=1,
+                                  max_value=num_pages, value=1)
+    st.caption(f"{total:,} matching bookings")
+    st.dataframe(explorer.page(page_number - 1, filters))
     
     # Display basic statistics
     st.subheader("Dataset Statistics")
-    st.write(df.describe())
+    st.write(explorer.summary(filters))
+    
+    st.subheader("Revenue Breakdown")
+    col1, col2 = st.columns(2)
+    with col1:
+        rows = st.selectbox("Rows", GROUP_COLUMNS, index=GROUP_COLUMNS.index('court_type'))
+    with col2:
+        columns = st.selectbox("Columns", GROUP_COLUMNS,
+                               index=GROUP_COLUMNS.index('day_of_week'))
+    by = [rows] if rows == columns else [rows, columns]
+    aggregates = explorer.aggregate(by, filters)
+    if len(by) == 2:
+        st.dataframe(aggregates.pivot(index=rows, columns=columns, values='revenue'))
+    st.dataframe(aggregates)
+
+def show_diagnostics_page():
+    st.header("Diagnostics")
+    
+    loaded = get_model()
+    st.write(f"Model version: {loaded.version}")
+    
+    # Per-stage latency since process start
+    snapshot = metrics.to_dict()
+    st.subheader("Stage Latency")
+    if snapshot['stages']:
+        st.dataframe(pd.DataFrame(snapshot['stages']).T)
+    else:
+        st.info("No requests recorded yet.")
+    
+    st.subheader("Counters")
+    st.json(snapshot['counters'])
+    st.write(f"Explanation cache: {loaded.explanations.hits} hits, "
+             f"{loaded.explanations.misses} misses")
+    if st.session_state.get('text_processor') is not None:
+        from src.llm_cache import get_llm_cache
+        st.json(get_llm_cache().stats())
+    
+    # Served quotes against the model's training-time input distribution
+    st.subheader("Input Drift")
+    report = get_prediction_monitor().drift_report()
+    if report['status'] == 'drift':
+        st.warning(f"Drift in: {', '.join(report['drifted'])}")
+    elif report['status'] != 'ok':
+        st.info(f"Drift status: {report['status']} ({report['logged']:,} quotes logged)")
+    if 'features' in report:
+        st.dataframe(pd.DataFrame(report['features']).T)
+        st.dataframe(pd.DataFrame(report['price']).T)
+    
+    st.checkbox("Profile quotes in this session", key='profile_quotes')
+    
+    with st.expander("Prometheus metrics"):
+        st.code(metrics.render_prometheus())
 
 def show_about_page():
     st.header("About Tennis Court Price Predictor")
@@ -223,7 +363,10 @@ def create_input_dataframe(date, time, duration, surface, court_type,
         'day_of_week': [date.strftime("%A")],
         'season': get_season(date),
         'booking_lead_time': [(date - pd.Timestamp.now().date()).days],
-        'historical_demand': [0.5],  # Could be calculated based on historical data
+        'historical_demand': [get_demand_index().demand({
+            'court_surface': surface, 'court_type': court_type, 'court_quality': quality,
+            'day_of_week': date.strftime("%A"), 'booking_time': time.strftime("%H:%M")
+        })],
         'temperature': [20],  # Could be fetched from weather API
         'precipitation_chance': [0],  # Could be fetched from weather API
         'special_requests': [False]
@@ -243,14 +386,33 @@ def get_season(date):
         return 'Fall'
 
 def show_prediction_results(input_data):
-    # Preprocess input data
-    X = st.session_state.processor.prepare_data(input_data, is_training=False)
+    if not st.session_state.get('profile_quotes'):
+        render_prediction_results(input_data)
+        return
+    
+    # Sample this script thread while the quote is served
+    with SamplingProfiler() as profiler:
+        render_prediction_results(input_data)
+    st.download_button("Download quote profile (collapsed stacks)",
+                       profiler.collapsed(), file_name="quote_profile.folded")
+
+@metrics.timed('quote')
+def render_prediction_results(input_data):
+    # Use one model snapshot for the whole request, even if a reload happens meanwhile
+    loaded = get_model()
+    
+    # Preprocess input data straight into a feature vector (no DataFrame round trip)
+    booking = input_data.iloc[0].to_dict()
+    X = loaded.fast_pricer.features(booking).copy()
     
-    # Make prediction
-    prediction = st.session_state.model.predict(X)[0]
+    # Start the explanation in the background so the price renders first
+    explanation_future = loaded.explanations.explain_async(X)
     
-    # Get feature importance
-    shap_values = st.session_state.model.explain_prediction(X)
+    # Make prediction: precomputed grid first, the live forest for off-grid quotes
+    prediction = loaded.grid_pricer.lookup(booking) if loaded.grid_pricer else None
+    if prediction is None:
+        prediction = loaded.fast_pricer.predict_features(X)
+    get_prediction_monitor().record(loaded, booking, prediction)
     
     # Display results
     st.subheader("Prediction Results")
@@ -304,12 +466,13 @@ def show_prediction_results(input_data):
     # Feature importance visualization
     st.subheader("Feature Importance")
     
-    # Create a DataFrame for feature importance
+    # Top 10 features by absolute SHAP value (cached per encoded input)
+    shap_values = explanation_future.result()
+    top_features = loaded.explanations.top_features(shap_values, k=10)
     feature_importance = pd.DataFrame({
-        'feature': st.session_state.processor.preprocessor.get_feature_names_out(),
-        'importance': abs(shap_values[0])
+        'feature': [name for name, _ in top_features],
+        'importance': [abs(value) for _, value in top_features]
     })
-    feature_importance = feature_importance.sort_values('importance', ascending=False).head(10)
     
     # Plot feature importance
     st.bar_chart(feature_importance.set_index('feature'))
@@ -0,0 +1,46 @@
+import argparse
+import asyncio
+import time
+from benchmarks.bench_rule_parser import CORPUS
+from benchmarks.stub_llm import StubBookingLLM
+from src.text_processor import TextProcessor
+
+# Run from the repository root: python -m benchmarks.bench_async_extraction
+
+async def run_async(processor, texts, batch_size, concurrency):
+    results = [result async for result in processor.process_texts(
+        texts, batch_size=batch_size, concurrency=concurrency, backoff=0.05)]
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs async batched LLM extraction")
+    parser.add_argument('--texts', type=int, default=400)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--failure-rate', type=float, default=0.05)
+    parser.add_argument('--serial-sample', type=int, default=20)
+    args = parser.parse_args()
+    
+    corpus = [text for text, _ in CORPUS]
+    texts = [f"{corpus[i % len(corpus)]} (note {i})" for i in range(args.texts)]
+    
+    # Rules disabled so every text exercises the LLM path
+    llm = StubBookingLLM(latency=args.latency, failure_rate=0.0)
+    processor = TextProcessor(llm=llm, use_rules=False)
+    start = time.perf_counter()
+    for text in texts[:args.serial_sample]:
+        processor.process_text(text)
+    serial = args.serial_sample / (time.perf_counter() - start)
+    print(f"serial process_text          {serial:8.1f} texts/sec")
+    
+    for batch_size, concurrency in [(1, 8), (8, 4), (8, 16), (16, 16)]:
+        llm = StubBookingLLM(latency=args.latency, failure_rate=args.failure_rate)
+        processor = TextProcessor(llm=llm, use_rules=False)
+        results = asyncio.run(run_async(processor, texts, batch_size, concurrency))
+        stats = processor.last_run_stats
+        failed = sum(result.error is not None for result in results)
+        print(f"async batch={batch_size:<3d} conc={concurrency:<3d}    "
+              f"{stats['texts_per_sec']:8.1f} texts/sec  "
+              f"requests={stats['llm_requests']} retries={stats['retries']} failed={failed}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import time
+import numpy as np
+from src.data_generator import TennisDataGenerator
+from src.demand_index import DemandIndex
+
+# Run from the repository root: python -m benchmarks.bench_demand_index
+
+def main():
+    parser = argparse.ArgumentParser(description="Demand index rebuild/update/lookup latency")
+    parser.add_argument('--events', default='100000,1000000,5000000')
+    parser.add_argument('--lookups', type=int, default=200_000)
+    parser.add_argument('--updates', type=int, default=200_000)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.events.split(',')]
+    history = TennisDataGenerator(max(sizes), seed=0).generate_data_fast()
+    bookings = history.head(max(args.lookups, args.updates)).to_dict('records')
+
+    print(f"{'events':>10}{'rebuild ms':>14}{'record us':>12}{'demand us':>12}{'lookup us':>12}")
+    for n in sizes:
+        start = time.perf_counter()
+        index = DemandIndex.from_bookings(history.head(n))
+        rebuild_ms = (time.perf_counter() - start) * 1000
+
+        # Lookups go through the dict path the app uses and the raw slot path
+        start = time.perf_counter()
+        for booking in bookings[:args.lookups]:
+            index.demand(booking)
+        demand_us = (time.perf_counter() - start) / args.lookups * 1e6
+
+        slots = np.random.default_rng(0).integers(0, len(index.weights), size=args.lookups).tolist()
+        start = time.perf_counter()
+        for slot in slots:
+            index.lookup(slot)
+        lookup_us = (time.perf_counter() - start) / args.lookups * 1e6
+
+        start = time.perf_counter()
+        for booking in bookings[:args.updates]:
+            index.record(booking)
+        record_us = (time.perf_counter() - start) / args.updates * 1e6
+
+        print(f"{n:>10}{rebuild_ms:>14.1f}{record_us:>12.2f}{demand_us:>12.2f}{lookup_us:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import time
+import numpy as np
+from src.data_generator import TennisDataGenerator
+from src.explanations import ExplanationService
+from src.model_registry import get_registry
+from src.model_trainer import DEFAULT_MODEL_PATH
+
+# Run from the repository root: python -m benchmarks.bench_explanations
+
+def per_row_ms(fn, X):
+    start = time.perf_counter()
+    for row in X:
+        fn(row)
+    return (time.perf_counter() - start) / len(X) * 1000
+
+def fidelity(exact, approx, k=10):
+    # Mean absolute error plus how many of the exact top-k features are recovered
+    mae = np.abs(exact - approx).mean()
+    overlap = np.mean([
+        len(set(np.argsort(-np.abs(e))[:k]) & set(np.argsort(-np.abs(a))[:k])) / k
+        for e, a in zip(exact, approx)
+    ])
+    return mae, overlap
+
+def main():
+    parser = argparse.ArgumentParser(description="Explanation latency and fidelity")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--rows', type=int, default=200)
+    args = parser.parse_args()
+    
+    loaded = get_registry().get(args.model)
+    df = TennisDataGenerator(args.rows, seed=0).generate_data_fast().drop(columns='price')
+    X = loaded.processor.preprocessor.transform(df)
+    
+    service = ExplanationService.from_loaded(loaded, cache_size=len(X))
+    exact_ms = per_row_ms(lambda row: service.explain(row, mode='exact'), X)
+    cached_ms = per_row_ms(lambda row: service.explain(row, mode='exact'), X)
+    
+    service = ExplanationService.from_loaded(loaded, cache_size=0)
+    start = time.perf_counter()
+    exact = service.explain_batch(X, mode='exact')
+    batch_ms = (time.perf_counter() - start) / len(X) * 1000
+    approx_ms = per_row_ms(lambda row: service.explain(row, mode='approximate'), X)
+    approx = service.explain_batch(X, mode='approximate')
+    mae, overlap = fidelity(exact, approx)
+    
+    print(f"{'mode':<22}{'ms/row':>10}  fidelity vs exact")
+    print(f"{'exact':<22}{exact_ms:>10.3f}  reference")
+    print(f"{'exact (cache hit)':<22}{cached_ms:>10.3f}  identical")
+    print(f"{'exact (batch)':<22}{batch_ms:>10.3f}  identical")
+    print(f"{'approximate (Saabas)':<22}{approx_ms:>10.3f}  "
+          f"MAE {mae:.4f}, top-10 overlap {overlap:.1%}")
+
+if __name__ == "__main__":
+    main()
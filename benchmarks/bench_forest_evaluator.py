@@ -0,0 +1,49 @@
+import argparse
+import time
+import numpy as np
+from src.data_generator import TennisDataGenerator
+from src.forest_evaluator import FlatForest, numba
+from src.model_registry import get_registry
+from src.model_trainer import DEFAULT_MODEL_PATH
+
+# Run from the repository root: python -m benchmarks.bench_forest_evaluator
+
+def per_call_ms(fn, X, min_seconds=0.5):
+    fn(X)
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        fn(X)
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="sklearn predict vs flat-array forest")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--batch-sizes', default='1,10,100,1000,10000,100000')
+    args = parser.parse_args()
+    
+    loaded = get_registry().get(args.model)
+    model = loaded.trainer.model
+    forest = FlatForest.from_sklearn(model)
+    
+    sizes = [int(s) for s in args.batch_sizes.split(',')]
+    df = TennisDataGenerator(max(sizes), seed=0).generate_data_fast()
+    X_all = loaded.processor.preprocessor.transform(df)
+    
+    evaluators = [('sklearn', model.predict),
+                  ('flat numpy', lambda X: forest.predict(X, use_numba=False))]
+    if numba is not None:
+        evaluators.append(('flat numba', lambda X: forest.predict(X, use_numba=True)))
+    
+    reference = model.predict(X_all)
+    for name, fn in evaluators[1:]:
+        assert np.array_equal(fn(X_all), reference), f"{name} differs from model.predict"
+    
+    print(f"{'rows':>8}" + ''.join(f"{name + ' ms':>16}" for name, _ in evaluators))
+    for n in sizes:
+        X = X_all[:n]
+        timings = [per_call_ms(fn, X) for _, fn in evaluators]
+        print(f"{n:>8}" + ''.join(f"{t:>16.3f}" for t in timings))
+
+if __name__ == "__main__":
+    main()
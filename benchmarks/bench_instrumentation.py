@@ -0,0 +1,42 @@
+import argparse
+import time
+from src.data_generator import TennisDataGenerator
+from src.instrumentation import MetricsRegistry, metrics
+from src.model_registry import get_registry
+from src.model_trainer import DEFAULT_MODEL_PATH
+
+# Run from the repository root: python -m benchmarks.bench_instrumentation
+
+def per_call_us(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrics overhead on the quote path")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+    
+    registry = MetricsRegistry()
+    
+    def empty_span():
+        with registry.span('noop'):
+            pass
+    print(f"empty span                 {per_call_us(empty_span, 100_000):8.2f} us")
+    
+    loaded = get_registry().get(args.model)
+    booking = TennisDataGenerator(1, seed=0).generate_data_fast().iloc[0].to_dict()
+    quote = lambda: loaded.fast_pricer.price(booking)
+    quote()
+    
+    metrics.enabled = False
+    off = per_call_us(quote, args.calls)
+    metrics.enabled = True
+    on = per_call_us(quote, args.calls)
+    print(f"quote, metrics off         {off:8.2f} us")
+    print(f"quote, metrics on          {on:8.2f} us  ({on / off - 1:+.2%})")
+
+if __name__ == "__main__":
+    main()
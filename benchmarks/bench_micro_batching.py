@@ -0,0 +1,66 @@
+import argparse
+import threading
+import time
+import numpy as np
+from src.batching import MicroBatcher
+from src.data_generator import TennisDataGenerator
+from src.instrumentation import metrics
+from src.model_registry import get_registry
+from src.model_trainer import DEFAULT_MODEL_PATH
+
+# Run from the repository root: python -m benchmarks.bench_micro_batching
+
+def drive(handler, rows, clients, requests_per_client):
+    latencies = []
+    lock = threading.Lock()
+    
+    def client(offset):
+        local = []
+        for i in range(requests_per_client):
+            row = rows[(offset + i) % len(rows)]
+            start = time.perf_counter()
+            handler(row)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+    
+    threads = [threading.Thread(target=client, args=(c * 7,)) for c in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, np.percentile(np.array(latencies) * 1000, 99)
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request predict vs micro-batched predict")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=100, help="requests per client")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--latency-budget-ms', type=float, default=None)
+    args = parser.parse_args()
+    
+    loaded = get_registry().get(args.model)
+    df = TennisDataGenerator(1000, seed=0).generate_data_fast().drop(columns='price')
+    rows = loaded.processor.preprocessor.transform(df)
+    
+    rate, p99 = drive(lambda row: loaded.trainer.predict(row[np.newaxis, :]),
+                      rows, args.clients, args.requests)
+    print(f"per-request predict   {rate:9.1f} req/s  p99={p99:8.2f} ms")
+    
+    batcher = MicroBatcher(lambda items: loaded.trainer.predict(np.vstack(items)),
+                           max_wait_ms=args.max_wait_ms, workers=args.workers,
+                           latency_budget_ms=args.latency_budget_ms, name='bench')
+    rate, p99 = drive(batcher, rows, args.clients, args.requests)
+    batcher.close()
+    
+    counters = metrics.to_dict()['counters']
+    mean_batch = counters['bench_rows'] / counters['bench_batches']
+    print(f"micro-batched         {rate:9.1f} req/s  p99={p99:8.2f} ms  "
+          f"mean batch={mean_batch:.1f} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import gc
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from src.data_generator import TennisDataGenerator
+from src.drift_sketch import DriftSketch
+from src.instrumentation import metrics, current_rss_mb
+from src.prediction_monitor import PredictionMonitor, RECORD_DTYPE, segment_paths
+
+# Run from the repository root: python -m benchmarks.bench_prediction_monitor
+# Measures what logging adds to a request (the record() call), how many
+# quotes per second the background writer sustains, and that memory stays
+# flat as the number of logged quotes grows: "RSS +MB" is the resident set
+# growth from just before the monitor is created to just before it is
+# closed, so it covers the queue, encode buffers and sketches but not the
+# benchmark's own bookings. Rate 0 submits flat out, which overloads the
+# writer on purpose: the excess is dropped, not queued.
+
+def run(monitor, loaded, bookings, n, producers, rate):
+    # n quotes from `producers` threads, paced to `rate` quotes/s in total
+    per_thread = n // producers
+    call_seconds = []
+    
+    def produce():
+        spent = 0.0
+        start = time.perf_counter()
+        for i in range(per_thread):
+            if rate and i % 100 == 0:
+                delay = start + i * producers / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            booking = bookings[i % len(bookings)]
+            call_start = time.perf_counter()
+            monitor.record(loaded, booking, booking['price'])
+            spent += time.perf_counter() - call_start
+        call_seconds.append(spent)
+    
+    start = time.perf_counter()
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    monitor.flush(timeout=600)
+    elapsed = time.perf_counter() - start
+    return per_thread * producers, sum(call_seconds) / (per_thread * producers), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Prediction log and drift monitor overhead/throughput")
+    parser.add_argument('--quotes', default='100000,1000000')
+    parser.add_argument('--producers', default='1,4')
+    parser.add_argument('--rates', default='0,50000,200000',
+                        help="offered quotes/s (0 = as fast as possible)")
+    parser.add_argument('--max-queue-size', type=int, default=65_536)
+    args = parser.parse_args()
+    
+    history = TennisDataGenerator(100_000, seed=0).generate_data_fast()
+    bookings = history.to_dict('records')
+    loaded = SimpleNamespace(version='bench',
+                             trainer=SimpleNamespace(drift_snapshot=DriftSketch.from_chunks(lambda: [history])))
+    
+    print(f"record size: {RECORD_DTYPE.itemsize} bytes")
+    print(f"{'quotes':>10}{'producers':>11}{'offered/s':>11}{'record us':>11}{'logged/s':>11}"
+          f"{'dropped':>9}{'writer us':>11}{'log MB':>8}{'RSS +MB':>9}")
+    with tempfile.TemporaryDirectory(prefix='tennis_log_') as workdir:
+        for n in [int(q) for q in args.quotes.split(',')]:
+            for producers in [int(p) for p in args.producers.split(',')]:
+                for rate in [int(r) for r in args.rates.split(',')]:
+                    metrics.reset()
+                    gc.collect()
+                    rss_before = current_rss_mb()
+                    log_dir = os.path.join(workdir, f'{n}_{producers}_{rate}')
+                    monitor = PredictionMonitor(log_dir, max_queue_size=args.max_queue_size)
+                    quotes, record_seconds, elapsed = run(monitor, loaded, bookings, n,
+                                                          producers, rate)
+                    status = monitor.drift_report()['status']
+                    rss_growth = (current_rss_mb() - rss_before) if rss_before is not None else 0
+                    monitor.close()
+                    # Background thread time per logged quote (encode, write, sketch)
+                    writer = metrics.to_dict()['stages'].get('prediction_log_write')
+                    writer_us = (writer['mean_ms'] * writer['count'] * 1000 / monitor.logged
+                                 if writer else 0)
+                    log_mb = sum(os.path.getsize(p) for p in segment_paths(log_dir)) / 2**20
+                    print(f"{quotes:>10,}{producers:>11}{rate or 'max':>11}"
+                          f"{record_seconds * 1e6:>11.2f}{monitor.logged / elapsed:>11,.0f}"
+                          f"{monitor.dropped:>9,}{writer_us:>11.2f}{log_mb:>8.1f}"
+                          f"{rss_growth:>9.1f}  {status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import time
+from src.data_generator import TennisDataGenerator
+from src.pricing_engine import PricingEngine
+from src.model_registry import get_registry
+from src.model_trainer import DEFAULT_MODEL_PATH
+
+# Run from the repository root: python -m benchmarks.bench_pricing_engine
+
+def bench_per_row(loaded, df):
+    # Mirrors show_prediction_results: one-row frame, prepare_data, predict
+    start = time.perf_counter()
+    for i in range(len(df)):
+        X = loaded.processor.prepare_data(df.iloc[[i]].copy(), is_training=False)
+        loaded.trainer.predict(X)[0]
+    return len(df) / (time.perf_counter() - start)
+
+def bench_engine(engine, df):
+    start = time.perf_counter()
+    engine.price(df)
+    return len(df) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row vs batch pricing throughput")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--per-row-sample', type=int, default=200)
+    parser.add_argument('--batch-sizes', default='1000,10000,50000')
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    args = parser.parse_args()
+    
+    loaded = get_registry().get(args.model)
+    df = TennisDataGenerator(args.rows, seed=0).generate_data_fast().drop(columns='price')
+    
+    per_row = bench_per_row(loaded, df.head(args.per_row_sample))
+    print(f"per-row path        {per_row:12,.0f} rows/sec")
+    
+    for batch_size in [int(b) for b in args.batch_sizes.split(',')]:
+        engine = PricingEngine(loaded.trainer, loaded.processor,
+                               batch_size=batch_size, n_jobs=args.n_jobs)
+        rate = bench_engine(engine, df)
+        print(f"engine batch={batch_size:<7d} {rate:12,.0f} rows/sec  ({rate / per_row:,.0f}x)")
+
+if __name__ == "__main__":
+    main()
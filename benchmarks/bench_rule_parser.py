@@ -0,0 +1,82 @@
+import time
+from src.rule_parser import RuleBasedBookingParser
+
+# Run from the repository root: python -m benchmarks.bench_rule_parser
+
+# Hand-labelled booking texts: (text, expected fields). Texts the rules
+# should hand to the LLM are labelled None.
+CORPUS = [
+    ("I want to book a hard court for 2 hours of singles play",
+     {'duration': 2, 'court_surface': 'Hard', 'num_players': 2, 'match_type': 'Singles'}),
+    ("Need an indoor court for 1.5 hours of training with a coach",
+     {'duration': 1.5, 'court_type': 'Indoor', 'match_type': 'Training', 'coaching_requested': True}),
+    ("Looking for a premium court for doubles match, 2 hours outdoor",
+     {'duration': 2, 'court_type': 'Outdoor', 'num_players': 4, 'match_type': 'Doubles',
+      'court_quality': 'Premium'}),
+    ("Book an elite indoor court with ball machine for 2 hours",
+     {'duration': 2, 'court_type': 'Indoor', 'ball_machine': True, 'court_quality': 'Elite'}),
+    ("3 hour training session on clay court with coaching",
+     {'duration': 3, 'court_surface': 'Clay', 'match_type': 'Training', 'coaching_requested': True}),
+    ("1 hour practice on standard outdoor court",
+     {'duration': 1, 'court_type': 'Outdoor', 'match_type': 'Training', 'court_quality': 'Standard'}),
+    ("Elite indoor court for 2.5 hours with coaching and ball machine",
+     {'duration': 2.5, 'court_type': 'Indoor', 'coaching_requested': True, 'ball_machine': True,
+      'court_quality': 'Elite'}),
+    ("Standard grass court for 1.5 hours doubles game",
+     {'duration': 1.5, 'court_surface': 'Grass', 'num_players': 4, 'match_type': 'Doubles',
+      'court_quality': 'Standard'}),
+    ("I want to book an indoor hard court for 2 hours of singles training with a coach.",
+     {'duration': 2, 'court_surface': 'Hard', 'court_type': 'Indoor', 'match_type': 'Training',
+      'coaching_requested': True}),
+    ("An hour and a half on clay for 4 players, no coach please",
+     {'duration': 1.5, 'court_surface': 'Clay', 'num_players': 4, 'coaching_requested': False}),
+    ("90 minutes of doubles on a carpet court",
+     {'duration': 1.5, 'court_surface': 'Carpet', 'num_players': 4, 'match_type': 'Doubles'}),
+    ("Two hour singles game outside, we don't need a ball machine",
+     {'duration': 2, 'court_type': 'Outdoor', 'num_players': 2, 'match_type': 'Singles',
+      'ball_machine': False}),
+    ("2 1/2 hrs premium grass court with an instructor",
+     {'duration': 2.5, 'court_surface': 'Grass', 'coaching_requested': True,
+      'court_quality': 'Premium'}),
+    ("Covered court, elite, one hour, drills with the ball machine",
+     {'duration': 1, 'court_type': 'Indoor', 'match_type': 'Training', 'ball_machine': True,
+      'court_quality': 'Elite'}),
+    ("Can we get a court this weekend for the club tournament?", None),
+    ("Either 1 hour or 2 hours on hard court", None),
+    ("Something nice for my birthday with friends", None),
+]
+
+def evaluate(parser, corpus):
+    handled = correct_fields = total_fields = exact = 0
+    for text, expected in corpus:
+        result = parser.parse(text)
+        if result.needs_llm():
+            continue
+        handled += 1
+        if expected is None:
+            continue
+        matches = sum(result.fields.get(k) == v for k, v in expected.items())
+        correct_fields += matches
+        total_fields += len(expected)
+        exact += result.fields == expected
+    return handled, correct_fields, total_fields, exact
+
+def main():
+    parser = RuleBasedBookingParser()
+    handled, correct_fields, total_fields, exact = evaluate(parser, CORPUS)
+    labelled = sum(expected is not None for _, expected in CORPUS)
+    
+    texts = [text for text, _ in CORPUS] * 2000
+    start = time.perf_counter()
+    for text in texts:
+        parser.parse(text)
+    rate = len(texts) / (time.perf_counter() - start)
+    
+    print(f"coverage (no LLM call)   {handled}/{len(CORPUS)}")
+    print(f"exact matches            {exact}/{labelled}")
+    print(f"field accuracy           {correct_fields}/{total_fields} "
+          f"({correct_fields / max(total_fields, 1):.1%})")
+    print(f"throughput               {rate:,.0f} texts/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import time
+from src.demand_index import get_demand_index
+from src.model_registry import get_registry
+from src.schedule_optimizer import optimize_schedule, make_courts, DEFAULT_PRICE_MULTIPLIERS
+
+# Run from the repository root: python -m benchmarks.bench_schedule_optimizer
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule optimizer solve time vs horizon and courts")
+    parser.add_argument('--days', default='7,30,90')
+    parser.add_argument('--courts', default='12,48,192')
+    parser.add_argument('--durations', default='1,1.5,2')
+    parser.add_argument('--workers', default='1')
+    args = parser.parse_args()
+
+    durations = [float(d) for d in args.durations.split(',')]
+    # Warm the model and demand index so the timings cover the solve only
+    get_registry().get()
+    get_demand_index()
+
+    print(f"{'days':>6}{'courts':>8}{'workers':>9}{'slots':>10}"
+          f"{'candidates':>12}{'seconds':>10}{'slots/s':>12}")
+    for days in [int(d) for d in args.days.split(',')]:
+        for n_courts in [int(c) for c in args.courts.split(',')]:
+            for workers in [int(w) for w in args.workers.split(',')]:
+                start = time.perf_counter()
+                schedule = optimize_schedule(make_courts(n_courts), days=days,
+                                             durations=durations, n_jobs=workers)
+                seconds = time.perf_counter() - start
+                candidates = len(schedule) * len(durations) * len(DEFAULT_PRICE_MULTIPLIERS)
+                print(f"{days:>6}{n_courts:>8}{workers:>9}{len(schedule):>10,}"
+                      f"{candidates:>12,}{seconds:>10.2f}{len(schedule) / seconds:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
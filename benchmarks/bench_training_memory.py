@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Run from the repository root: python -m benchmarks.bench_training_memory
+# Data generation and each measurement run in fresh interpreters, and the
+# parent imports nothing heavy: Linux carries ru_maxrss across fork/exec.
+
+def generate(n, path):
+    from src.data_generator import TennisDataGenerator
+    from src.dataset_store import BookingDatasetWriter
+    BookingDatasetWriter(path).write_chunks(TennisDataGenerator(n, seed=0).generate_chunks(500_000))
+
+def child(mode, path, fit_trees):
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+    from src.data_processor import DataProcessor, TRAINING_COLUMNS
+    from src.dataset_store import load_bookings, iter_bookings
+    from src.instrumentation import peak_rss_mb
+    
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    processor = DataProcessor()
+    if mode == 'in-memory':
+        df = load_bookings(path=path)
+        X, y = processor.prepare_data(df, is_training=True)
+    else:
+        X, y = processor.prepare_streaming(
+            lambda: iter_bookings(columns=TRAINING_COLUMNS, path=path), dtype=np.float32)
+    prepare_seconds = time.perf_counter() - start
+    prepare_peak = peak_rss_mb()
+    
+    if fit_trees:
+        RandomForestRegressor(n_estimators=fit_trees, max_depth=10, random_state=42).fit(X, y)
+    print(json.dumps({'baseline_mb': baseline, 'prepare_peak_mb': prepare_peak,
+                      'fit_peak_mb': peak_rss_mb(), 'prepare_seconds': prepare_seconds,
+                      'X_mb': X.data.nbytes / 2**20 if hasattr(X, 'data') else 0}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of training data preparation")
+    parser.add_argument('--rows', default='250000,1000000,4000000')
+    parser.add_argument('--modes', default='in-memory,streamed')
+    parser.add_argument('--fit-trees', type=int, default=0,
+                        help="also fit a small forest to include the fit-time copy")
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    parser.add_argument('--generate', nargs=2, metavar=('ROWS', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.generate:
+        generate(int(args.generate[0]), args.generate[1])
+        return
+    if args.child:
+        child(args.child[0], args.child[1], args.fit_trees)
+        return
+    
+    command = [sys.executable, '-m', 'benchmarks.bench_training_memory']
+    
+    # Peak RSS in MB: after imports, after building (X, y), and after the optional fit
+    print(f"{'rows':>10}{'mode':>11}{'imports':>9}{'prepare':>9}{'fit':>8}{'X MB':>8}{'seconds':>9}")
+    with tempfile.TemporaryDirectory(prefix='tennis_mem_') as workdir:
+        for n in [int(r) for r in args.rows.split(',')]:
+            path = os.path.join(workdir, f'bookings_{n}')
+            subprocess.run(command + ['--generate', str(n), path], check=True)
+            for mode in args.modes.split(','):
+                output = subprocess.run(
+                    command + ['--fit-trees', str(args.fit_trees), '--child', mode, path],
+                    check=True, capture_output=True, text=True).stdout
+                r = json.loads(output.strip().splitlines()[-1])
+                print(f"{n:>10}{mode:>11}{r['baseline_mb']:>9.0f}{r['prepare_peak_mb']:>9.0f}"
+                      f"{r['fit_peak_mb']:>8.0f}{r['X_mb']:>8.0f}{r['prepare_seconds']:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# Cold-start import cost per module, from python -X importtime. Run from the
+# repository root:
+#   python -m benchmarks.import_time_report app --max-ms 400
+# Each module is imported in a fresh interpreter; with --max-ms the script
+# exits non-zero when a module's total import time exceeds the budget.
+
+LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def import_times(module):
+    # [(name, self_us, cumulative_us, depth)] in the order imports finished
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            check=True, capture_output=True, text=True).stderr
+    entries = []
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+def report(module, top):
+    entries = import_times(module)
+    total_ms = sum(e[1] for e in entries) / 1000
+    print(f"{module}: {total_ms:,.0f} ms across {len(entries)} modules")
+
+    # Top-level packages pulled in, by cumulative time
+    packages = {}
+    for name, _, cumulative_us, depth in entries:
+        if depth == 0:
+            packages[name] = packages.get(name, 0) + cumulative_us
+    print(f"  {'top-level import':<40}{'cumulative ms':>15}")
+    for name, us in sorted(packages.items(), key=lambda p: -p[1])[:top]:
+        print(f"  {name:<40}{us / 1000:>15.1f}")
+
+    print(f"  {'slowest module bodies':<40}{'self ms':>15}")
+    for name, self_us, _, _ in sorted(entries, key=lambda e: -e[1])[:top]:
+        print(f"  {name:<40}{self_us / 1000:>15.1f}")
+    return total_ms
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time breakdown and budget check")
+    parser.add_argument('modules', nargs='*', default=['app'])
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help="fail when any module takes longer than this to import")
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        total_ms = report(module, args.top)
+        if args.max_ms is not None and total_ms > args.max_ms:
+            over_budget.append(f"{module} ({total_ms:,.0f} ms)")
+        print()
+    if over_budget:
+        print(f"Over the {args.max_ms:,.0f} ms import budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
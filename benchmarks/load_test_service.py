@@ -0,0 +1,72 @@
+import argparse
+import json
+import threading
+import time
+import urllib.request
+import numpy as np
+from src.data_generator import TennisDataGenerator
+
+# Run from the repository root: python -m benchmarks.load_test_service
+# Without --url an in-process server is started on a free port.
+
+def make_bookings(n):
+    df = TennisDataGenerator(n, seed=0).generate_data_fast().drop(columns='price')
+    df['booking_date'] = df['booking_date'].astype(str)
+    return json.loads(df.to_json(orient='records'))
+
+def worker(url, bookings, requests_per_client, latencies, errors):
+    for i in range(requests_per_client):
+        body = json.dumps({'booking': bookings[i % len(bookings)]}).encode('utf-8')
+        request = urllib.request.Request(url + '/price', data=body,
+                                         headers={'Content-Type': 'application/json'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors.append(1)
+
+def run(url, concurrency, requests_per_client, bookings):
+    latencies, errors = [], []
+    threads = [threading.Thread(target=worker,
+                                args=(url, bookings, requests_per_client, latencies, errors))
+               for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    ms = np.array(latencies) * 1000
+    print(f"concurrency={concurrency:<4d} {len(latencies) / elapsed:9.1f} req/s  "
+          f"p50={np.percentile(ms, 50):7.2f} ms  p95={np.percentile(ms, 95):7.2f} ms  "
+          f"p99={np.percentile(ms, 99):7.2f} ms  errors={len(errors)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP pricing service")
+    parser.add_argument('--url', default=None)
+    parser.add_argument('--concurrency', default='1,8,32')
+    parser.add_argument('--requests', type=int, default=200, help="requests per client")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+    
+    server = None
+    url = args.url
+    if url is None:
+        from src.pricing_service import create_server
+        server = create_server(port=0, max_wait_ms=args.max_wait_ms)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+    
+    bookings = make_bookings(500)
+    for concurrency in [int(c) for c in args.concurrency.split(',')]:
+        run(url, concurrency, args.requests, bookings)
+    
+    if server is not None:
+        server.shutdown()
+        server.service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import sklearn
+from src.data_generator import TennisDataGenerator
+from src.data_processor import DataProcessor
+from src.model_trainer import ModelTrainer
+
+# End-to-end pipeline benchmarks. Run from the repository root:
+#   python -m benchmarks.run_benchmarks run --scales 1000,100000 --output base.json
+#   python -m benchmarks.run_benchmarks compare base.json new.json
+
+def timed(fn, repeat):
+    # Returns (median seconds, last result)
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+def record(results, stage, seconds, rows):
+    results[stage] = {'seconds': seconds, 'rows': rows,
+                      'rows_per_sec': rows / seconds if seconds else None}
+
+def bench_scale(n, args, workdir):
+    results = {}
+    generator = TennisDataGenerator(n, seed=0)
+    
+    if n <= args.legacy_generator_max:
+        seconds, _ = timed(generator.generate_data, args.repeat)
+        record(results, 'generate_data', seconds, n)
+    seconds, df = timed(generator.generate_data_fast, args.repeat)
+    record(results, 'generate_data_fast', seconds, n)
+    
+    csv_path = os.path.join(workdir, f'bookings_{n}.csv')
+    seconds, _ = timed(lambda: df.to_csv(csv_path, index=False), args.repeat)
+    record(results, 'csv_write', seconds, n)
+    seconds, df = timed(lambda: pd.read_csv(csv_path), args.repeat)
+    record(results, 'csv_read', seconds, n)
+    
+    # Training is capped so the largest scales stay tractable
+    train_df = df.head(args.max_train_rows)
+    processor = DataProcessor()
+    seconds, (X, y) = timed(lambda: processor.prepare_data(train_df.copy(), is_training=True),
+                            args.repeat)
+    record(results, 'prepare_data_training', seconds, len(train_df))
+    
+    trainer = ModelTrainer()
+    seconds, _ = timed(lambda: trainer.train(X, y, processor.preprocessor), 1)
+    record(results, 'train', seconds, len(train_df))
+    
+    model_path = os.path.join(workdir, f'model_{n}')
+    seconds, _ = timed(lambda: trainer.save_model(model_path), 1)
+    record(results, 'save_model', seconds, 1)
+    loaded = ModelTrainer()
+    seconds, _ = timed(lambda: loaded.load_model(model_path), args.repeat)
+    record(results, 'load_model', seconds, 1)
+    
+    inputs = df.drop(columns='price')
+    single = inputs.head(1)
+    seconds, X_one = timed(lambda: processor.prepare_data(single.copy(), is_training=False),
+                           args.repeat * 10)
+    record(results, 'prepare_data_inference_single', seconds, 1)
+    
+    batch = inputs.head(args.batch_rows)
+    seconds, X_batch = timed(lambda: processor.prepare_data(batch.copy(), is_training=False),
+                             args.repeat)
+    record(results, 'prepare_data_inference_batch', seconds, len(batch))
+    
+    seconds, _ = timed(lambda: loaded.predict(X_one), args.repeat * 10)
+    record(results, 'predict_single', seconds, 1)
+    seconds, _ = timed(lambda: loaded.predict(X_batch), args.repeat)
+    record(results, 'predict_batch', seconds, len(batch))
+    
+    loaded.explain_prediction(X_one)  # builds the explainer outside the timing
+    seconds, _ = timed(lambda: loaded.explain_prediction(X_one), args.repeat)
+    record(results, 'explain_prediction', seconds, 1)
+    return results
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+def run(args):
+    scales = [int(s) for s in args.scales.split(',')]
+    report = {'environment': environment(), 'results': {}}
+    
+    with tempfile.TemporaryDirectory(prefix='tennis_bench_') as workdir:
+        for n in scales:
+            print(f"scale {n:,} rows", file=sys.stderr)
+            report['results'][str(n)] = bench_scale(n, args, workdir)
+            for stage, r in report['results'][str(n)].items():
+                print(f"  {stage:<32}{r['seconds'] * 1000:>12.3f} ms", file=sys.stderr)
+    
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    with open(args.candidate) as f:
+        candidate = json.load(f)['results']
+    
+    regressions = 0
+    print(f"{'scale':>10}  {'stage':<32}{'base ms':>12}{'new ms':>12}{'change':>9}")
+    for scale, stages in candidate.items():
+        for stage, r in stages.items():
+            base = baseline.get(scale, {}).get(stage)
+            if base is None:
+                continue
+            change = r['seconds'] / base['seconds'] - 1
+            flag = ''
+            if change > args.threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"{scale:>10}  {stage:<32}{base['seconds'] * 1000:>12.3f}"
+                  f"{r['seconds'] * 1000:>12.3f}{change:>+9.1%}{flag}")
+    
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Pricing stack benchmark suite")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = commands.add_parser('run')
+    run_parser.add_argument('--scales', default='1000,10000,100000')
+    run_parser.add_argument('--output', default='benchmark_results.json')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--max-train-rows', type=int, default=200_000)
+    run_parser.add_argument('--batch-rows', type=int, default=10_000)
+    run_parser.add_argument('--legacy-generator-max', type=int, default=100_000,
+                            help="skip the per-row generate_data above this many rows")
+    
+    compare_parser = commands.add_parser('compare')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="relative slowdown flagged as a regression")
+    
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+        return 0
+    return compare(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import asyncio
+import json
+import random
+import re
+import time
+from langchain.llms.base import LLM
+from src.rule_parser import RuleBasedBookingParser
+
+class StubBookingLLM(LLM):
+    # Offline stand-in for the OpenAI LLM: answers extraction prompts with the
+    # rule parser's output after an injected latency, optionally failing
+    latency: float = 0.2
+    failure_rate: float = 0.0
+    calls: int = 0
+    
+    @property
+    def _llm_type(self):
+        return "stub-booking"
+    
+    def _call(self, prompt, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return self._respond(prompt)
+    
+    async def _acall(self, prompt, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._respond(prompt)
+    
+    def _respond(self, prompt):
+        self.calls += 1
+        if random.random() < self.failure_rate:
+            raise RuntimeError("stub LLM: injected failure")
+        parser = RuleBasedBookingParser()
+        
+        texts = re.findall(r'^\s*(\d+)\. (.*)$', prompt.split('Texts:')[-1], re.MULTILINE)
+        if 'Texts:' in prompt:
+            return json.dumps([dict(parser.parse(text).fields, id=int(i)) for i, text in texts])
+        text = prompt.split('Text:')[-1].strip()
+        return json.dumps(parser.parse(text).fields)
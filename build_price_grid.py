@@ -0,0 +1,52 @@
+import argparse
+import time
+import numpy as np
+from src.model_registry import get_registry
+from src.price_grid import PriceGrid, DEFAULT_GRID_PATH, DEFAULT_DEMAND_BUCKETS, bucket_centers
+
+def parse_values(text):
+    # "0,1,2" or a range "0-29"
+    if '-' in text.strip('-'):
+        low, high = text.split('-')
+        return list(range(int(low), int(high) + 1))
+    return [float(v) for v in text.split(',')]
+
+def bucketing_error(grid, loaded, n=2000, seed=0):
+    # Grid vs live price for random on-grid bookings with demand anywhere in
+    # its bucket, i.e. what keying demand into buckets costs
+    rng = np.random.default_rng(seed)
+    errors = []
+    for _ in range(n):
+        booking = {column: values[rng.integers(len(values))] for column, values, _ in grid.axes}
+        booking['historical_demand'] = rng.uniform(0, 1)
+        errors.append(abs(grid.lookup(booking) - loaded.fast_pricer.price(booking)))
+    return np.mean(errors), np.max(errors)
+
+def build_price_grid(lead_times=None, bin_numeric=False, demand_buckets=DEFAULT_DEMAND_BUCKETS,
+                     path=DEFAULT_GRID_PATH):
+    loaded = get_registry().get()
+    
+    numeric_axes = {'historical_demand': bucket_centers('historical_demand', demand_buckets)}
+    if lead_times is not None:
+        numeric_axes['booking_lead_time'] = lead_times
+    
+    start = time.time()
+    grid = PriceGrid.build(loaded, numeric_axes=numeric_axes, bin_numeric=bin_numeric)
+    grid.save(path)
+    
+    print(f"Price grid with {len(grid.prices):,} entries built in "
+          f"{time.time() - start:.1f}s for model {loaded.version}")
+    mean_error, max_error = bucketing_error(grid, loaded)
+    print(f"Demand bucketing error vs the live model: mean ${mean_error:.2f}, max ${max_error:.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the price table (run after train_model.py)")
+    parser.add_argument('--lead-times', type=parse_values, default=None,
+                        help="booking_lead_time values, e.g. 0-14 or 0,7,14")
+    parser.add_argument('--bin-numeric', action='store_true',
+                        help="snap in-range numeric inputs to the nearest grid value")
+    parser.add_argument('--demand-buckets', type=int, default=DEFAULT_DEMAND_BUCKETS,
+                        help="equal-width historical_demand buckets over [0, 1]")
+    args = parser.parse_args()
+    
+    build_price_grid(args.lead_times, args.bin_numeric, args.demand_buckets)
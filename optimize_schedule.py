@@ -0,0 +1,30 @@
+import argparse
+import time
+from src.schedule_optimizer import optimize_schedule, make_courts
+
+DEFAULT_SCHEDULE_PATH = 'data/priced_schedule.csv'
+
+def price_schedule(num_courts=12, days=7, durations=None, workers=None,
+                   output=DEFAULT_SCHEDULE_PATH):
+    start = time.time()
+    schedule = optimize_schedule(make_courts(num_courts), days=days, durations=durations,
+                                 n_jobs=workers)
+    schedule.to_csv(output, index=False)
+
+    print(f"Priced {len(schedule):,} slots for {num_courts} courts over {days} days "
+          f"in {time.time() - start:.1f}s; expected revenue "
+          f"{schedule['expected_revenue'].sum():,.2f}. Saved to {output}")
+    return schedule
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Post revenue-maximizing prices for every open slot")
+    parser.add_argument('--courts', type=int, default=12)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--durations', default='1',
+                        help="bookable durations in hours, e.g. 1,1.5,2")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=DEFAULT_SCHEDULE_PATH)
+    args = parser.parse_args()
+
+    price_schedule(args.courts, args.days, [float(d) for d in args.durations.split(',')],
+                   args.workers, args.output)
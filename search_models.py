@@ -0,0 +1,56 @@
+import argparse
+import json
+from sklearn.model_selection import train_test_split
+from src.dataset_store import load_bookings
+from src.data_processor import DataProcessor, TRAINING_COLUMNS
+from src.model_search import run_search, select_best, candidate_models
+from src.model_trainer import ModelTrainer
+from train_model import finish_training
+
+def search_models(latency_budget_ms=None, max_workers=None, output=None, save=False):
+    df = load_bookings(columns=TRAINING_COLUMNS)
+    processor = DataProcessor()
+    X, y = processor.prepare_data(df, is_training=True)
+    X_train, X_test, y_train, y_test = train_test_split(X, y.to_numpy(), test_size=0.2,
+                                                        random_state=42)
+    
+    results = run_search(X_train, y_train, X_test, y_test, max_workers=max_workers)
+    
+    print(f"{'model':<14}{'MAE':>8}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'batch rows/s':>14}{'size MB':>9}{'load s':>8}")
+    for r in results:
+        print(f"{r['name']:<14}{r['mae']:>8.3f}{r['p50_ms']:>9.3f}{r['p99_ms']:>9.3f}"
+              f"{r['batch_rows_per_sec']:>14,.0f}{r['size_bytes'] / 1e6:>9.2f}"
+              f"{r['load_seconds']:>8.3f}")
+    
+    best = select_best(results, latency_budget_ms)
+    if best is None:
+        print(f"No model meets a p99 budget of {latency_budget_ms} ms")
+    else:
+        print(f"Selected {best['name']} (MAE {best['mae']:.3f}, p99 {best['p99_ms']:.3f} ms)")
+    
+    if output:
+        with open(output, 'w') as f:
+            json.dump({'latency_budget_ms': latency_budget_ms, 'results': results,
+                       'selected': best and best['name']}, f, indent=2)
+    
+    if save and best is not None:
+        # Refit the winning configuration on all rows and publish it
+        model = dict(candidate_models())[best['name']]
+        trainer = ModelTrainer(model=model)
+        trainer.train(X, y, processor.preprocessor)
+        finish_training(trainer)
+        trainer.save_model()
+        print("Selected model trained and saved successfully!")
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare model families on accuracy and serving cost")
+    parser.add_argument('--latency-budget-ms', type=float, default=None,
+                        help="maximum p99 single-row latency for the selected model")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=None, help="write results as JSON")
+    parser.add_argument('--save', action='store_true', help="retrain and save the selected model")
+    args = parser.parse_args()
+    
+    search_models(args.latency_budget_ms, args.workers, args.output, args.save)
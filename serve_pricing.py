@@ -0,0 +1,31 @@
+import argparse
+from src.pricing_service import create_server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP pricing service (/price, /price/batch, /explain, /drift)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--max-queue-size', type=int, default=1024)
+    parser.add_argument('--workers', type=int, default=1, help="batch worker threads")
+    parser.add_argument('--latency-budget-ms', type=float, default=None)
+    parser.add_argument('--request-timeout-ms', type=float, default=30_000,
+                        help="fail a quote that waits longer than this for the model")
+    parser.add_argument('--no-prediction-log', action='store_true',
+                        help="do not log served quotes or monitor input drift")
+    args = parser.parse_args()
+    
+    server = create_server(args.host, args.port, max_batch_size=args.max_batch_size,
+                           max_wait_ms=args.max_wait_ms, max_queue_size=args.max_queue_size,
+                           workers=args.workers, latency_budget_ms=args.latency_budget_ms,
+                           request_timeout_ms=args.request_timeout_ms,
+                           log_predictions=not args.no_prediction_log)
+    print(f"Pricing service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
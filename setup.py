@@ -9,14 +9,15 @@ def setup():
     os.makedirs('models', exist_ok=True)
     
     # Generate dataset if it doesn't exist
-    if not os.path.exists('data/tennis_bookings.csv'):
+    if not (os.path.exists('data/tennis_bookings.csv') or
+            os.path.isdir('data/tennis_bookings')):
         generator = TennisDataGenerator(600)
         df = generator.generate_data()
         df.to_csv('data/tennis_bookings.csv', index=False)
         print("Dataset generated successfully!")
     
     # Train model if it doesn't exist
-    if not os.path.exists('models/trained_model.joblib'):
+    if not os.path.exists(os.path.join('models', 'trained_model', 'CURRENT')):
         from train_model import train_initial_model
         train_initial_model()
         print("Model trained successfully!")
@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from src.instrumentation import metrics
+
+class QueueFullError(RuntimeError):
+    pass
+
+class MicroBatcher:
+    # Collects concurrent requests for up to max_wait_ms (or max_batch_size
+    # items) and hands them to process_batch in one call. process_batch takes
+    # a list of items and returns a list of results in the same order.
+    #
+    # max_queue_size bounds the backlog: submit raises QueueFullError once it
+    # is reached. With latency_budget_ms the collection window shrinks so the
+    # oldest request's wait plus the expected batch time stays within budget.
+    # timeout_ms bounds how long a blocking call waits for its result.
+    def __init__(self, process_batch, max_batch_size=64, max_wait_ms=2.0,
+                 max_queue_size=1024, workers=1, latency_budget_ms=None, timeout_ms=None,
+                 name='batch'):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.latency_budget = latency_budget_ms / 1000 if latency_budget_ms else None
+        self.timeout = timeout_ms / 1000 if timeout_ms else None
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._batch_seconds = 0.0  # moving average of process_batch time
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True, name=f'{name}-batcher-{i}')
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+    
+    def submit(self, item, block=False, timeout=None):
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        try:
+            self._queue.put((item, future, time.monotonic()), block=block, timeout=timeout)
+        except queue.Full:
+            metrics.inc(f'{self.name}_rejected')
+            raise QueueFullError(f"{self.name} queue is full ({self._queue.maxsize} pending)")
+        metrics.set_gauge(f'{self.name}_queue_depth', self._queue.qsize())
+        if self._closed:
+            # Closed while we were enqueueing: don't leave the item behind the workers
+            self._fail_pending()
+        return future
+    
+    def __call__(self, item, timeout=None):
+        future = self.submit(item)
+        try:
+            return future.result(timeout if timeout is not None else self.timeout)
+        except TimeoutError:
+            # Still queued requests are dropped rather than scored for nobody
+            future.cancel()
+            metrics.inc(f'{self.name}_timeouts')
+            raise
+    
+    def close(self):
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._fail_pending()
+    
+    def _fail_pending(self):
+        # Fail whatever is still queued; stop sentinels stay for the workers
+        sentinels = 0
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                sentinels += 1
+            else:
+                _fail(entry[1], RuntimeError("MicroBatcher is closed"))
+        for _ in range(sentinels):
+            self._queue.put(None)
+    
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = self._deadline(first[2])
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    # Let this batch finish, then stop on the next loop
+                    self._queue.put(None)
+                    break
+                batch.append(entry)
+            self._dispatch(batch)
+    
+    def _deadline(self, enqueued_at):
+        deadline = time.monotonic() + self.max_wait
+        if self.latency_budget is not None:
+            # Leave room to run the batch before the oldest request's budget expires
+            deadline = min(deadline, enqueued_at + self.latency_budget - self._batch_seconds)
+        return deadline
+    
+    def _dispatch(self, batch):
+        # Skip requests whose caller gave up; the rest can no longer be cancelled
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        now = time.monotonic()
+        metrics.set_gauge(f'{self.name}_queue_depth', self._queue.qsize())
+        metrics.observe(f'{self.name}_queue_wait', now - batch[0][2])
+        metrics.inc(f'{self.name}_batches')
+        metrics.inc(f'{self.name}_rows', len(batch))
+        
+        items = [item for item, _, _ in batch]
+        start = time.perf_counter()
+        try:
+            results = list(self.process_batch(items))
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.name} process_batch returned {len(results)} "
+                                   f"results for {len(items)} items")
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        finally:
+            elapsed = time.perf_counter() - start
+            self._batch_seconds = 0.8 * self._batch_seconds + 0.2 * elapsed
+            metrics.observe(f'{self.name}_process', elapsed)
+        
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+def _fail(future, error):
+    if future.set_running_or_notify_cancel():
+        future.set_exception(error)
@@ -1,33 +1,73 @@
 import pandas as pd
 import numpy as np
-from faker import Faker
 from datetime import datetime, timedelta
 import os
 
+# Possible values for categorical features
+SURFACE_TYPES = ['Hard', 'Clay', 'Grass', 'Carpet']
+COURT_TYPES = ['Indoor', 'Outdoor']
+MATCH_TYPES = ['Singles', 'Doubles', 'Training']
+COURT_QUALITY = ['Standard', 'Premium', 'Elite']
+DURATIONS = [1, 1.5, 2, 2.5, 3]
+
+BOOLEAN_COLUMNS = [
+    'court_lighting', 'equipment_rental', 'coaching_requested',
+    'ball_machine', 'refreshments', 'special_requests'
+]
+
+# Season for each month (index 0 is unused so months index directly)
+MONTH_SEASONS = np.array([
+    '', 'Winter', 'Winter', 'Spring', 'Spring', 'Spring', 'Summer',
+    'Summer', 'Summer', 'Fall', 'Fall', 'Fall', 'Winter'
+], dtype=object)
+
+# Seeded runs end on this date unless told otherwise, so the same seed gives
+# the same bookings on any day it is run
+SEEDED_END_DATE = datetime(2025, 1, 1)
+
+# 'HH:MM' string for every minute of the day
+MINUTE_LABELS = np.array(
+    [f'{h:02d}:{m:02d}' for h in range(24) for m in range(60)], dtype=object
+)
+
 class TennisDataGenerator:
-    def __init__(self, num_records=600):
-        self.fake = Faker()
+    def __init__(self, num_records=600, seed=None, end_date=None):
+        self._fake = None
         self.num_records = num_records
+        self.seed = seed
+        # Bookings cover the year before end_date (default: now, or
+        # SEEDED_END_DATE when a seed is given)
+        self.end_date = end_date
+    
+    @property
+    def fake(self):
+        # Only the legacy row-by-row generator needs Faker, and importing it is
+        # slow, so serving processes that only read the constants never do
+        if self._fake is None:
+            from faker import Faker
+            self._fake = Faker()
+        return self._fake
         
     def generate_data(self):
         data = []
         
         # Define possible values for categorical features
-        surface_types = ['Hard', 'Clay', 'Grass', 'Carpet']
-        court_types = ['Indoor', 'Outdoor']
-        match_types = ['Singles', 'Doubles', 'Training']
-        court_quality = ['Standard', 'Premium', 'Elite']
+        surface_types = SURFACE_TYPES
+        court_types = COURT_TYPES
+        match_types = MATCH_TYPES
+        court_quality = COURT_QUALITY
         
-        start_date = datetime.now() - timedelta(days=365)
+        start_date, end_date = self._window_bounds()
         
         for _ in range(self.num_records):
-            booking_date = self.fake.date_time_between(start_date=start_date)
+            booking_date = self.fake.date_time_between(start_date=start_date,
+                                                       end_date=end_date)
             
             # Generate feature values
             record = {
                 'booking_date': booking_date,
                 'booking_time': booking_date.strftime('%H:%M'),
-                'duration': np.random.choice([1, 1.5, 2, 2.5, 3]),
+                'duration': np.random.choice(DURATIONS),
                 'court_surface': np.random.choice(surface_types),
                 'court_type': np.random.choice(court_types),
                 'court_lighting': bool(np.random.choice([0, 1])),
@@ -41,7 +81,6 @@ class TennisDataGenerator:
                 'day_of_week': booking_date.strftime('%A'),
                 'season': self._get_season(booking_date),
                 'booking_lead_time': np.random.randint(0, 30),
-                'historical_demand': np.random.uniform(0, 1),
                 'temperature': np.random.normal(20, 5),
                 'precipitation_chance': np.random.uniform(0, 1),
                 'special_requests': bool(np.random.choice([0, 1]))
@@ -53,7 +92,91 @@ class TennisDataGenerator:
             
             data.append(record)
         
-        return pd.DataFrame(data)
+        return self._add_demand(pd.DataFrame(data), self._demand_index())
+    
+    def generate_data_fast(self):
+        # Columnar equivalent of generate_data, as one DataFrame; stream
+        # larger datasets with generate_chunks
+        rng = np.random.default_rng(self.seed)
+        return self._generate_columns(self.num_records, rng, self._date_window(),
+                                      self._demand_index())
+    
+    def generate_chunks(self, chunk_size):
+        # DataFrames of at most chunk_size rows each
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        
+        # One generator for the whole stream keeps seeded output reproducible.
+        # Chunks cover consecutive slices of the date window, so one demand
+        # index replays the stream in order.
+        rng = np.random.default_rng(self.seed)
+        start, end = self._date_window()
+        span = int((end - start).astype(np.int64))
+        demand_index = self._demand_index()
+        
+        done = 0
+        while done < self.num_records:
+            n = min(chunk_size, self.num_records - done)
+            window = (start + np.timedelta64(span * done // self.num_records, 'us'),
+                      start + np.timedelta64(span * (done + n) // self.num_records, 'us'))
+            yield self._generate_columns(n, rng, window, demand_index)
+            done += n
+    
+    def _window_bounds(self):
+        end_date = self.end_date
+        if end_date is None:
+            end_date = SEEDED_END_DATE if self.seed is not None else datetime.now()
+        end_date = pd.Timestamp(end_date).to_pydatetime()
+        return end_date - timedelta(days=365), end_date
+    
+    def _date_window(self):
+        start_date, end_date = self._window_bounds()
+        return np.datetime64(start_date, 'us'), np.datetime64(end_date, 'us')
+    
+    def _demand_index(self):
+        # Imported here: demand_index imports this module's constants
+        from src.demand_index import DemandIndex
+        return DemandIndex()
+    
+    def _add_demand(self, df, demand_index):
+        # historical_demand is what the serving DemandIndex would have quoted
+        # for each booking given the bookings before it, not an independent draw
+        df.insert(df.columns.get_loc('booking_lead_time') + 1, 'historical_demand',
+                  demand_index.replay(df))
+        return df
+    
+    def _generate_columns(self, n, rng, window, demand_index):
+        start, end = window
+        span = max((end - start).astype(np.int64), 1)
+        booking_date = start + rng.integers(0, span, size=n).astype('timedelta64[us]')
+        dates = pd.DatetimeIndex(booking_date)
+        
+        minute_of_day = dates.hour.to_numpy() * 60 + dates.minute.to_numpy()
+        
+        data = {
+            'booking_date': booking_date,
+            'booking_time': MINUTE_LABELS[minute_of_day],
+            'duration': rng.choice(np.array(DURATIONS, dtype=float), size=n),
+            'court_surface': rng.choice(np.array(SURFACE_TYPES, dtype=object), size=n),
+            'court_type': rng.choice(np.array(COURT_TYPES, dtype=object), size=n),
+            'court_lighting': rng.integers(0, 2, size=n).astype(bool),
+            'num_players': rng.choice(np.array([2, 4]), size=n),
+            'match_type': rng.choice(np.array(MATCH_TYPES, dtype=object), size=n),
+            'equipment_rental': rng.integers(0, 2, size=n).astype(bool),
+            'coaching_requested': rng.integers(0, 2, size=n).astype(bool),
+            'ball_machine': rng.integers(0, 2, size=n).astype(bool),
+            'refreshments': rng.integers(0, 2, size=n).astype(bool),
+            'court_quality': rng.choice(np.array(COURT_QUALITY, dtype=object), size=n),
+            'day_of_week': dates.day_name().to_numpy(dtype=object),
+            'season': MONTH_SEASONS[dates.month.to_numpy()],
+            'booking_lead_time': rng.integers(0, 30, size=n),
+            'temperature': rng.normal(20, 5, size=n),
+            'precipitation_chance': rng.uniform(0, 1, size=n),
+            'special_requests': rng.integers(0, 2, size=n).astype(bool)
+        }
+        data['price'] = self._calculate_prices(data, rng)
+        
+        return self._add_demand(pd.DataFrame(data), demand_index)
     
     def _get_season(self, date):
         month = date.month
@@ -92,12 +215,46 @@ class TennisDataGenerator:
         price = base_price * np.random.uniform(0.9, 1.1)
         
         return round(price, 2)
+    
+    def _calculate_prices(self, data, rng):
+        # Vectorized version of _calculate_price over whole columns
+        quality = data['court_quality']
+        base_price = np.full(len(quality), 30.0)
+        base_price[quality == 'Premium'] *= 1.5
+        base_price[quality == 'Elite'] *= 2
+        base_price[data['court_type'] == 'Indoor'] *= 1.2
+        
+        base_price += 40 * data['coaching_requested']
+        base_price += 15 * data['ball_machine']
+        base_price += 10 * data['equipment_rental']
+        
+        # Add some random variation
+        price = base_price * rng.uniform(0.9, 1.1, size=len(base_price))
+        
+        return np.round(price, 2)
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate synthetic tennis bookings")
+    parser.add_argument('--records', type=int, default=600)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--end-date', default=None,
+                        help="last booking date (default: today, or a fixed date with --seed)")
+    args = parser.parse_args()
+    
     # Create data directory if it doesn't exist
     os.makedirs('data', exist_ok=True)
     
-    generator = TennisDataGenerator(600)
-    df = generator.generate_data()
-    df.to_csv('data/tennis_bookings.csv', index=False)
-    print("Dataset generated successfully!") 
\ No newline at end of file
+    generator = TennisDataGenerator(args.records, seed=args.seed, end_date=args.end_date)
+    if args.format == 'parquet':
+        # Stream chunks into the partitioned store (run as `python -m src.data_generator`)
+        from src.dataset_store import BookingDatasetWriter
+        writer = BookingDatasetWriter()
+        writer.write_chunks(generator.generate_chunks(args.chunk_size))
+    else:
+        df = generator.generate_data()
+        df.to_csv('data/tennis_bookings.csv', index=False)
+    print("Dataset generated successfully!")
@@ -1,7 +1,46 @@
+import numpy as np
 import pandas as pd
+import scipy.sparse
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
+from src.instrumentation import metrics
+
+NUMERIC_FEATURES = [
+    'duration', 'num_players', 'booking_lead_time',
+    'historical_demand', 'temperature', 'precipitation_chance'
+]
+
+CATEGORICAL_FEATURES = [
+    'court_surface', 'court_type', 'match_type',
+    'court_quality', 'day_of_week', 'season'
+]
+
+BOOLEAN_FEATURES = [
+    'court_lighting', 'equipment_rental', 'coaching_requested',
+    'ball_machine', 'refreshments', 'special_requests'
+]
+
+# Fixed one-hot vocabulary (sorted, as OneHotEncoder would learn it) so the
+# encoded columns stay identical across model versions and incremental updates
+CATEGORY_VOCABULARY = {
+    'court_surface': ['Carpet', 'Clay', 'Grass', 'Hard'],
+    'court_type': ['Indoor', 'Outdoor'],
+    'match_type': ['Doubles', 'Singles', 'Training'],
+    'court_quality': ['Elite', 'Premium', 'Standard'],
+    'day_of_week': ['Friday', 'Monday', 'Saturday', 'Sunday',
+                    'Thursday', 'Tuesday', 'Wednesday'],
+    'season': ['Fall', 'Spring', 'Summer', 'Winter']
+}
+
+FEATURE_COLUMNS = NUMERIC_FEATURES + CATEGORICAL_FEATURES + BOOLEAN_FEATURES
+
+# Everything training reads from storage; booking_date/booking_time are not model inputs
+TRAINING_COLUMNS = FEATURE_COLUMNS + ['price']
+
+# Integer columns that fit in narrower types. Float features stay float64 so
+# scaled values match the inference path exactly.
+COMPACT_INTEGERS = {'num_players': 'int8', 'booking_lead_time': 'int16'}
 
 class DataProcessor:
     def __init__(self):
@@ -9,20 +48,9 @@ class DataProcessor:
         
     def create_preprocessor(self):
         # Define numeric and categorical columns
-        numeric_features = [
-            'duration', 'num_players', 'booking_lead_time',
-            'historical_demand', 'temperature', 'precipitation_chance'
-        ]
-        
-        categorical_features = [
-            'court_surface', 'court_type', 'match_type',
-            'court_quality', 'day_of_week', 'season'
-        ]
-        
-        boolean_features = [
-            'court_lighting', 'equipment_rental', 'coaching_requested',
-            'ball_machine', 'refreshments', 'special_requests'
-        ]
+        numeric_features = NUMERIC_FEATURES
+        categorical_features = CATEGORICAL_FEATURES
+        boolean_features = BOOLEAN_FEATURES
         
         # Create preprocessing steps
         numeric_transformer = Pipeline(steps=[
@@ -30,7 +58,10 @@ class DataProcessor:
         ])
         
         categorical_transformer = Pipeline(steps=[
-            ('onehot', OneHotEncoder(drop='first', sparse_output=False))
+            ('onehot', OneHotEncoder(
+                categories=[CATEGORY_VOCABULARY[c] for c in categorical_features],
+                drop='first', sparse_output=False
+            ))
         ])
         
         # Combine all transformers
@@ -43,27 +74,93 @@ class DataProcessor:
         
         return self.preprocessor
     
-    def process_time_features(self, df):
-        # Convert booking_time to hour and minute features
-        df['booking_hour'] = pd.to_datetime(df['booking_time'], format='%H:%M').dt.hour
-        df['booking_minute'] = pd.to_datetime(df['booking_time'], format='%H:%M').dt.minute
-        
-        # Drop original time column
-        df = df.drop('booking_time', axis=1)
-        
-        return df
+    @property
+    def input_columns(self):
+        # Raw columns the fitted preprocessor reads; everything else is dropped
+        return [column
+                for name, _, columns in self.preprocessor.transformers_
+                if name != 'remainder'
+                for column in columns]
     
-    def prepare_data(self, df, is_training=True):
-        # Process datetime features
-        df = self.process_time_features(df)
-        
+    def update_scaler(self, df):
+        # Fold more rows into the fitted scaler statistics (streaming fit only:
+        # a trained model's scaler must stay as its trees were fitted)
+        scaler = self.preprocessor.named_transformers_['num'].named_steps['scaler']
+        scaler.partial_fit(df[NUMERIC_FEATURES])
+    
+    def compact_frame(self, df):
+        # Fixed-vocabulary categoricals, bools and narrow ints for the model inputs
+        columns = {}
+        for column in NUMERIC_FEATURES:
+            columns[column] = df[column].astype(COMPACT_INTEGERS.get(column, 'float64'))
+        for column in CATEGORICAL_FEATURES:
+            columns[column] = pd.Categorical(df[column],
+                                             categories=CATEGORY_VOCABULARY[column])
+        for column in BOOLEAN_FEATURES:
+            columns[column] = df[column].astype(bool)
+        if 'price' in df:
+            columns['price'] = df['price']
+        return pd.DataFrame(columns, index=df.index)
+    
+    @metrics.timed('prepare_data')
+    def prepare_data(self, df, is_training=True, dtype=np.float64):
+        # The preprocessor reads only FEATURE_COLUMNS, so booking_date and
+        # booking_time (whose hour/minute it never used) are not parsed here
         if is_training:
             # Create and fit preprocessor
             self.create_preprocessor()
-            X = self.preprocessor.fit_transform(df.drop('price', axis=1))
+            X = self.preprocessor.fit_transform(df[FEATURE_COLUMNS])
             y = df['price']
-            return X, y
+            return X.astype(dtype, copy=False), y
         else:
             # Use existing preprocessor
             X = self.preprocessor.transform(df)
-            return X 
\ No newline at end of file
+            return X
+    
+    def prepare_streaming(self, chunk_source, dtype=np.float32, sparse=False):
+        # Two passes over chunk_source() (a callable returning an iterator of
+        # frames): scaler statistics first, then encoding into a preallocated
+        # matrix. Peak memory is the output plus one chunk, however long the
+        # history. float32 is what the tree models train on internally anyway.
+        n_rows = self.fit_streaming(chunk_source())
+        return self.transform_streaming(chunk_source(), n_rows, dtype=dtype, sparse=sparse)
+    
+    def fit_streaming(self, chunks):
+        # The category vocabulary is fixed, so only the scaler needs the data
+        self.create_preprocessor()
+        n_rows = 0
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            chunk = self.compact_frame(chunk)
+            if n_rows == 0:
+                self.preprocessor.fit(chunk[FEATURE_COLUMNS])
+            else:
+                self.update_scaler(chunk)
+            n_rows += len(chunk)
+        if n_rows == 0:
+            raise ValueError("No bookings to train on")
+        return n_rows
+    
+    def transform_streaming(self, chunks, n_rows, dtype=np.float32, sparse=False):
+        n_features = len(self.preprocessor.get_feature_names_out())
+        X = None if sparse else np.empty((n_rows, n_features), dtype=dtype)
+        blocks = []
+        y = np.empty(n_rows)
+        start = 0
+        for chunk in chunks:
+            stop = start + len(chunk)
+            if stop > n_rows:
+                raise ValueError("Bookings changed between the fit and transform passes")
+            block = self.preprocessor.transform(self.compact_frame(chunk))
+            if sparse:
+                blocks.append(scipy.sparse.csr_matrix(block, dtype=dtype))
+            else:
+                X[start:stop] = block
+            y[start:stop] = chunk['price'].to_numpy()
+            start = stop
+        if start != n_rows:
+            raise ValueError("Bookings changed between the fit and transform passes")
+        if sparse:
+            X = scipy.sparse.vstack(blocks, format='csr')
+        return X, y
@@ -0,0 +1,307 @@
+import bisect
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.dataset_store import DEFAULT_DATASET_PATH, DEFAULT_CSV_PATH
+from src.instrumentation import metrics
+
+SUMMARY_COLUMNS = ['price', 'duration', 'num_players', 'booking_lead_time',
+                   'historical_demand', 'temperature', 'precipitation_chance']
+
+# Dimensions offered for revenue breakdowns on the dataset page
+GROUP_COLUMNS = ['court_type', 'court_surface', 'court_quality', 'day_of_week',
+                 'season', 'match_type']
+
+# Filter operators the per-day rollup can answer; anything else falls back
+# to a filtered scan
+ROLLUP_OPERATORS = {'=', '==', '!=', 'in', 'not in'}
+ROLLUP_DATE_OPERATORS = {'>=', '<'}
+
+class DatasetExplorer:
+    # Read-side view of the booking history for the dashboard. Each time the
+    # data changes it is scanned once into a rollup: row counts and per-column
+    # count/sum/variance/min/max for every (day, GROUP_COLUMNS) combination,
+    # a few tens of thousands of rows for a million bookings. Counts, summaries
+    # and revenue breakdowns filtered on those columns (dates on day
+    # boundaries) are sums over the rollup; other filters scan. Rows are
+    # fetched one page at a time, counting matches per row group only as far
+    # as the requested page.
+    def __init__(self, path=DEFAULT_DATASET_PATH, csv_path=DEFAULT_CSV_PATH,
+                 page_size=100, check_interval=2.0, cache_size=64):
+        self.path = path
+        self.csv_path = csv_path
+        self.page_size = page_size
+        self.check_interval = check_interval
+        self.cache_size = cache_size
+        self.signature = None
+        self._dataset = None
+        self._cache = OrderedDict()
+        self._last_checked = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def dataset(self):
+        self._refresh()
+        return self._dataset
+    
+    def count_rows(self, filters=None):
+        def compute():
+            rollup = self._rollup_rows(filters)
+            if rollup is None:
+                return self.dataset.count_rows(filter=_expression(filters))
+            return int(rollup['rows'].sum())
+        return self._cached(('count', _filter_key(filters)), compute)
+    
+    @metrics.timed('explorer_page')
+    def page(self, number, filters=None, columns=None, page_size=None):
+        # Only the requested slice is decoded; the scan stops at the last index
+        page_size = page_size or self.page_size
+        start = number * page_size
+        stop = min(start + page_size, self.count_rows(filters))
+        columns = columns or self._columns()
+        if start >= stop:
+            return pd.DataFrame(columns=columns)
+        
+        # Jump straight to the row groups holding the page instead of scanning from row 0
+        index = self._fragment_index(filters)
+        expression = _expression(filters)
+        pieces = []
+        while start < stop:
+            i = index.locate(start)
+            offset, end = index.offsets[i], index.offsets[i + 1]
+            scanner = index.fragments[i].scanner(schema=self.dataset.schema, columns=columns,
+                                                 filter=expression)
+            pieces.append(scanner.take(pa.array(range(start - offset, min(stop, end) - offset))))
+            start = min(stop, end)
+        return pa.concat_tables(pieces).to_pandas()
+    
+    def num_pages(self, filters=None, page_size=None):
+        page_size = page_size or self.page_size
+        return max(1, -(-self.count_rows(filters) // page_size))
+    
+    def summary(self, filters=None):
+        # describe()-style table, combined from the rollup's per-group
+        # moments or computed column by column in Arrow
+        def compute():
+            rollup = self._rollup_rows(filters)
+            if rollup is not None:
+                return pd.DataFrame({column: _combine_moments(rollup, column)
+                                     for column in SUMMARY_COLUMNS})
+            table = self.dataset.to_table(columns=SUMMARY_COLUMNS,
+                                          filter=_expression(filters))
+            stats = {}
+            for column in SUMMARY_COLUMNS:
+                values = table[column]
+                stats[column] = {
+                    'count': pc.count(values).as_py(),
+                    'mean': pc.mean(values).as_py(),
+                    'std': pc.stddev(values, ddof=1).as_py(),
+                    'min': pc.min(values).as_py(),
+                    'max': pc.max(values).as_py()
+                }
+            return pd.DataFrame(stats)
+        return self._cached(('summary', _filter_key(filters)), compute)
+    
+    def aggregate(self, by, filters=None):
+        # Revenue, bookings and average price per group, e.g. by=['court_type', 'day_of_week']
+        by = list(by)
+        def compute():
+            rollup = self._rollup_rows(filters) if set(by) <= set(GROUP_COLUMNS) else None
+            if rollup is not None:
+                grouped = rollup.groupby(by, observed=True)[['price_sum', 'price_count']].sum()
+                grouped = grouped.reset_index().rename(columns={
+                    'price_sum': 'revenue', 'price_count': 'bookings'
+                })
+                grouped['avg_price'] = grouped['revenue'] / grouped['bookings']
+            else:
+                table = self.dataset.to_table(columns=by + ['price'],
+                                              filter=_expression(filters))
+                grouped = table.group_by(by).aggregate([
+                    ('price', 'sum'), ('price', 'count'), ('price', 'mean')
+                ]).to_pandas()
+                grouped = grouped.rename(columns={
+                    'price_sum': 'revenue', 'price_count': 'bookings', 'price_mean': 'avg_price'
+                })
+            for column in by:
+                grouped[column] = grouped[column].astype(str)
+            return grouped.sort_values(by).reset_index(drop=True)
+        return self._cached(('aggregate', tuple(by), _filter_key(filters)), compute)
+    
+    def date_range(self):
+        rollup = self._rollup()
+        return (pd.Timestamp(rollup['booking_date_min'].min()),
+                pd.Timestamp(rollup['booking_date_max'].max()))
+    
+    def _rollup(self):
+        # One scan per data version; see the class comment
+        def compute():
+            table = self.dataset.to_table(columns=['booking_date'] + GROUP_COLUMNS
+                                          + SUMMARY_COLUMNS)
+            table = table.append_column('day', pc.floor_temporal(table['booking_date'],
+                                                                 unit='day'))
+            aggregations = [([], 'count_all'), ('booking_date', 'min'), ('booking_date', 'max')]
+            for column in SUMMARY_COLUMNS:
+                aggregations += [(column, 'count'), (column, 'sum'),
+                                 (column, 'variance', pc.VarianceOptions(ddof=0)),
+                                 (column, 'min'), (column, 'max')]
+            rollup = table.group_by(['day'] + GROUP_COLUMNS).aggregate(aggregations)
+            return rollup.to_pandas().rename(columns={'count_all': 'rows'})
+        return self._cached(('rollup',), compute)
+    
+    def _rollup_rows(self, filters):
+        # The rollup rows matching filters, or None if a filter needs a scan
+        rollup = self._rollup()
+        mask = np.ones(len(rollup), dtype=bool)
+        for column, op, value in filters or ():
+            if column == 'booking_date':
+                value = pd.Timestamp(value)
+                if op not in ROLLUP_DATE_OPERATORS or value != value.normalize():
+                    return None
+                values = rollup['day']
+                matched = values >= value if op == '>=' else values < value
+            elif column in GROUP_COLUMNS and op in ROLLUP_OPERATORS:
+                values = rollup[column]
+                if op in ('in', 'not in'):
+                    matched = values.isin(list(value))
+                else:
+                    matched = values == value
+                if op in ('!=', 'not in'):
+                    matched = ~matched
+            else:
+                return None
+            mask &= matched.to_numpy(dtype=bool)
+        return rollup[mask]
+    
+    def _fragment_index(self, filters):
+        # Row groups matching filters; their match counts are filled in lazily
+        def compute():
+            expression = _expression(filters)
+            fragments = []
+            for fragment in self.dataset.get_fragments(filter=expression):
+                if isinstance(fragment, ds.ParquetFileFragment):
+                    fragments.extend(fragment.split_by_row_group(expression,
+                                                                 schema=self.dataset.schema))
+                else:
+                    fragments.append(fragment)
+            return _FragmentIndex(fragments,
+                                  lambda fragment: self._count_fragment(fragment, expression))
+        return self._cached(('fragments', _filter_key(filters)), compute)
+    
+    def _count_fragment(self, fragment, expression):
+        # Row-group fragments report the whole file's row count from metadata,
+        # also from count_rows() when the filter only touches partition keys,
+        # so filtered counts materialize an empty projection instead
+        if expression is None and isinstance(fragment, ds.ParquetFileFragment):
+            return sum(row_group.num_rows for row_group in fragment.row_groups)
+        return fragment.to_table(schema=self.dataset.schema, columns=[],
+                                 filter=expression).num_rows
+    
+    def _columns(self):
+        return [name for name in self.dataset.schema.names if name != 'booking_month']
+    
+    def _cached(self, key, compute):
+        self._refresh()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        value = compute()
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+    
+    def _refresh(self):
+        # Re-open the dataset (and drop cached aggregates) only when files change
+        now = time.monotonic()
+        if self._dataset is not None and now - self._last_checked < self.check_interval:
+            return
+        self._last_checked = now
+        signature = self._signature()
+        if signature == self.signature and self._dataset is not None:
+            return
+        with self._lock:
+            self._dataset = self._open()
+            self.signature = signature
+            self._cache.clear()
+    
+    def _open(self):
+        if os.path.isdir(self.path):
+            return ds.dataset(self.path, format='parquet', partitioning='hive')
+        
+        # The CSV export is parsed once per change into an in-memory dataset
+        df = pd.read_csv(self.csv_path, parse_dates=['booking_date'])
+        return ds.dataset(pa.Table.from_pandas(df, preserve_index=False))
+    
+    def _signature(self):
+        if not os.path.isdir(self.path):
+            stat = os.stat(self.csv_path)
+            return (self.csv_path, stat.st_mtime_ns, stat.st_size)
+        files, newest, size = 0, 0, 0
+        for root, _, names in os.walk(self.path):
+            for name in names:
+                stat = os.stat(os.path.join(root, name))
+                files += 1
+                newest = max(newest, stat.st_mtime_ns)
+                size += stat.st_size
+        return (self.path, files, newest, size)
+
+class _FragmentIndex:
+    # Matching-row offsets per row group, counted only up to the rows asked for
+    def __init__(self, fragments, count):
+        self.fragments = fragments
+        self.offsets = [0]
+        self._count = count
+        self._lock = threading.Lock()
+    
+    def locate(self, row):
+        # Fragment holding matching row number `row` (which must exist)
+        with self._lock:
+            while self.offsets[-1] <= row:
+                fragment = self.fragments[len(self.offsets) - 1]
+                self.offsets.append(self.offsets[-1] + self._count(fragment))
+            return bisect.bisect_right(self.offsets, row) - 1
+
+def _combine_moments(rollup, column):
+    # Pooled count/mean/std (ddof=1)/min/max from per-group moments
+    counts = rollup[f'{column}_count'].to_numpy(np.float64)
+    n = counts.sum()
+    if n == 0:
+        return {'count': 0, 'mean': None, 'std': None, 'min': None, 'max': None}
+    sums = rollup[f'{column}_sum'].to_numpy(np.float64)
+    mean = sums.sum() / n
+    group_means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    variances = np.nan_to_num(rollup[f'{column}_variance'].to_numpy(np.float64))
+    m2 = (counts * variances).sum() + (counts * (group_means - mean) ** 2).sum()
+    return {
+        'count': int(n),
+        'mean': mean,
+        'std': float(np.sqrt(m2 / (n - 1))) if n > 1 else None,
+        'min': rollup[f'{column}_min'].min().item(),
+        'max': rollup[f'{column}_max'].max().item()
+    }
+
+def _expression(filters):
+    return pq.filters_to_expression(filters) if filters else None
+
+def _filter_key(filters):
+    if not filters:
+        return ()
+    return tuple((column, op, tuple(value) if isinstance(value, (list, tuple, set)) else value)
+                 for column, op, value in filters)
+
+_explorer = None
+
+def get_explorer():
+    global _explorer
+    if _explorer is None:
+        _explorer = DatasetExplorer()
+    return _explorer
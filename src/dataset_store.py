@@ -0,0 +1,160 @@
+import os
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.data_generator import SURFACE_TYPES, COURT_TYPES, MATCH_TYPES, COURT_QUALITY
+
+DEFAULT_DATASET_PATH = 'data/tennis_bookings'
+DEFAULT_CSV_PATH = 'data/tennis_bookings.csv'
+
+# Low-cardinality columns stored with dictionary encoding. Fixed category
+# lists keep the dictionary (and the schema) identical across chunks.
+CATEGORY_COLUMNS = {
+    'court_surface': SURFACE_TYPES,
+    'court_type': COURT_TYPES,
+    'match_type': MATCH_TYPES,
+    'court_quality': COURT_QUALITY,
+    'day_of_week': ['Monday', 'Tuesday', 'Wednesday', 'Thursday',
+                    'Friday', 'Saturday', 'Sunday'],
+    'season': ['Winter', 'Spring', 'Summer', 'Fall']
+}
+
+PARTITION_COLUMNS = ['season', 'booking_month']
+
+# Small row groups give filters and paged reads finer-grained statistics to skip on
+ROW_GROUP_SIZE = 16_384
+
+# Rows per frame when streaming bookings (e.g. for training)
+DEFAULT_BATCH_ROWS = 262_144
+
+class BookingDatasetWriter:
+    def __init__(self, path=DEFAULT_DATASET_PATH):
+        self.path = path
+        self.schema = None
+        self.rows_written = 0
+        
+    def write(self, df):
+        # Append one chunk of bookings to the partitioned dataset
+        table = self._to_table(df)
+        ds.write_dataset(
+            table,
+            self.path,
+            format='parquet',
+            partitioning=ds.partitioning(
+                pa.schema([table.schema.field(c) for c in PARTITION_COLUMNS]),
+                flavor='hive'
+            ),
+            basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            min_rows_per_group=ROW_GROUP_SIZE,
+            max_rows_per_group=ROW_GROUP_SIZE
+        )
+        self.rows_written += len(df)
+        
+    def write_chunks(self, chunks):
+        for chunk in chunks:
+            self.write(chunk)
+        return self.rows_written
+    
+    def _to_table(self, df):
+        df = df.copy()
+        df['booking_date'] = pd.to_datetime(df['booking_date'])
+        df['booking_month'] = df['booking_date'].dt.month.astype('int8')
+        for column, categories in CATEGORY_COLUMNS.items():
+            # A value outside the fixed list would otherwise be stored as null
+            unknown = df[column].notna() & ~df[column].isin(categories)
+            if unknown.any():
+                raise ValueError(f"Unknown {column} values {sorted(set(df[column][unknown]))}; "
+                                 f"add them to CATEGORY_COLUMNS")
+            df[column] = pd.Categorical(df[column], categories=categories)
+        
+        # Reuse the first chunk's schema so every file is identical
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        if self.schema is None:
+            self.schema = table.schema.remove_metadata()
+            table = table.replace_schema_metadata(None)
+        return table
+
+class BookingDatasetReader:
+    def __init__(self, path=DEFAULT_DATASET_PATH):
+        self.path = path
+        self.dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        
+    def read(self, columns=None, filters=None):
+        # filters use the pandas/pyarrow DNF form, e.g.
+        # [('season', '=', 'Winter'), ('booking_date', '>=', start)]
+        if columns is None:
+            columns = [name for name in self.dataset.schema.names
+                       if name != 'booking_month']
+        expression = pq.filters_to_expression(filters) if filters else None
+        
+        # Partition filters prune whole directories before any file is opened
+        table = self.dataset.to_table(columns=columns, filter=expression)
+        return table.to_pandas()
+    
+    def iter_batches(self, columns=None, filters=None, batch_size=DEFAULT_BATCH_ROWS):
+        # Bounded-memory scan: one pandas frame per record batch
+        if columns is None:
+            columns = [name for name in self.dataset.schema.names
+                       if name != 'booking_month']
+        expression = pq.filters_to_expression(filters) if filters else None
+        scanner = self.dataset.scanner(columns=columns, filter=expression,
+                                       batch_size=batch_size)
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield batch.to_pandas()
+    
+    def count_rows(self, filters=None):
+        expression = pq.filters_to_expression(filters) if filters else None
+        return self.dataset.count_rows(filter=expression)
+
+def load_bookings(columns=None, filters=None, path=DEFAULT_DATASET_PATH,
+                  csv_path=DEFAULT_CSV_PATH):
+    # Prefer the partitioned Parquet store and fall back to the CSV export
+    if os.path.isdir(path):
+        return BookingDatasetReader(path).read(columns=columns, filters=filters)
+    
+    usecols, extra = _csv_columns(columns, filters)
+    df = pd.read_csv(csv_path, usecols=usecols)
+    if filters:
+        df = df[_filter_mask(df, filters)].drop(columns=extra)
+    return df
+
+def iter_bookings(columns=None, filters=None, batch_size=DEFAULT_BATCH_ROWS,
+                  path=DEFAULT_DATASET_PATH, csv_path=DEFAULT_CSV_PATH):
+    # Streaming counterpart of load_bookings
+    if os.path.isdir(path):
+        yield from BookingDatasetReader(path).iter_batches(columns, filters, batch_size)
+        return
+    
+    usecols, extra = _csv_columns(columns, filters)
+    for chunk in pd.read_csv(csv_path, usecols=usecols, chunksize=batch_size):
+        if filters:
+            chunk = chunk[_filter_mask(chunk, filters)].drop(columns=extra)
+        yield chunk
+
+def _csv_columns(columns, filters):
+    # Filter columns are read alongside the projection and dropped after filtering
+    if columns is None or not filters:
+        return columns, []
+    extra = [column for column, _, _ in filters if column not in columns]
+    extra = list(dict.fromkeys(extra))
+    return list(columns) + extra, extra
+
+def _filter_mask(df, filters):
+    operators = {
+        '=': lambda s, v: s == v, '==': lambda s, v: s == v,
+        '!=': lambda s, v: s != v, '<': lambda s, v: s < v,
+        '<=': lambda s, v: s <= v, '>': lambda s, v: s > v,
+        '>=': lambda s, v: s >= v, 'in': lambda s, v: s.isin(v),
+        'not in': lambda s, v: ~s.isin(v)
+    }
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        series = df[column]
+        if column == 'booking_date':
+            series = pd.to_datetime(series)
+        mask &= operators[op](series, value)
+    return mask
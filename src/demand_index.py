@@ -0,0 +1,207 @@
+import calendar
+import math
+import threading
+import numpy as np
+import pandas as pd
+from src.data_generator import SURFACE_TYPES, COURT_TYPES, COURT_QUALITY
+from src.dataset_store import load_bookings
+
+DAYS_OF_WEEK = list(calendar.day_name)
+HOURS = list(range(24))
+
+# Slot key: (court_surface, court_type, court_quality, day_of_week, hour)
+SLOT_AXES = [
+    ('court_surface', SURFACE_TYPES),
+    ('court_type', COURT_TYPES),
+    ('court_quality', COURT_QUALITY),
+    ('day_of_week', DAYS_OF_WEEK),
+    ('hour', HOURS)
+]
+
+DEMAND_COLUMNS = ['booking_date', 'booking_time', 'court_surface', 'court_type',
+                  'court_quality', 'day_of_week']
+
+DEFAULT_HALF_LIFE_DAYS = 28.0
+
+# Returned before any booking has been seen (the old hard-coded feature value)
+DEFAULT_DEMAND = 0.5
+
+# Re-anchor the forward-decay weights before exp() gets anywhere near overflow
+MAX_EXPONENT = 60.0
+
+_NS_PER_DAY = 86_400 * 1_000_000_000
+
+class DemandIndex:
+    # Time-decayed booking counts per court/slot, normalized by the busiest
+    # slot so the feature stays in [0, 1] like the training data.
+    #
+    # Forward decay: an event at time t adds exp(rate * (t - reference)) to
+    # its slot. Every slot decays by the same factor, so ratios (and the
+    # running peak) never need touching as time passes; record and demand
+    # are O(1) and events may arrive out of order.
+    def __init__(self, half_life_days=DEFAULT_HALF_LIFE_DAYS):
+        self.half_life_days = half_life_days
+        self.rate = math.log(2) / half_life_days
+        sizes = [len(values) for _, values in SLOT_AXES]
+        self.strides = [int(np.prod(sizes[i + 1:], dtype=np.int64)) for i in range(len(sizes))]
+        self.weights = np.zeros(int(np.prod(sizes)))
+        self.reference = None
+        self.peak = 0.0
+        self.events = 0
+        self._index_maps = [{value: i for i, value in enumerate(values)}
+                            for _, values in SLOT_AXES]
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_bookings(cls, df, half_life_days=DEFAULT_HALF_LIFE_DAYS):
+        index = cls(half_life_days)
+        index.rebuild(df)
+        return index
+    
+    def slot(self, court_surface, court_type, court_quality, day_of_week, hour):
+        key = (court_surface, court_type, court_quality, day_of_week, int(hour))
+        slot = 0
+        for (column, _), index_map, stride, value in zip(SLOT_AXES, self._index_maps,
+                                                         self.strides, key):
+            if value not in index_map:
+                raise ValueError(f"Unknown {column}: {value!r}")
+            slot += index_map[value] * stride
+        return slot
+    
+    def booking_slot(self, booking):
+        return self.slot(booking['court_surface'], booking['court_type'],
+                         booking['court_quality'], booking['day_of_week'],
+                         _hour(booking['booking_time']))
+    
+    def record(self, booking, when=None):
+        # Ingest one booking event; `when` defaults to the booking date
+        slot = self.booking_slot(booking)
+        t = _to_days(booking['booking_date'] if when is None else when)
+        with self._lock:
+            if self.reference is None:
+                self.reference = t
+            exponent = self.rate * (t - self.reference)
+            if exponent > MAX_EXPONENT:
+                self._rebase(t)
+                exponent = 0.0
+            weight = self.weights[slot] + math.exp(exponent)
+            self.weights[slot] = weight
+            if weight > self.peak:
+                self.peak = weight
+            self.events += 1
+    
+    def demand(self, booking):
+        return self.lookup(self.booking_slot(booking))
+    
+    def lookup(self, slot):
+        peak = self.peak
+        if peak == 0.0:
+            return DEFAULT_DEMAND
+        return float(self.weights[slot] / peak)
+    
+    def demand_frame(self, df):
+        # Vectorized demand(); rows with unknown attributes get DEFAULT_DEMAND
+        slots, valid = self.frame_slots(df)
+        peak = self.peak
+        if peak == 0.0:
+            return np.full(len(df), DEFAULT_DEMAND)
+        return np.where(valid, self.weights[slots] / peak, DEFAULT_DEMAND)
+    
+    def frame_slots(self, df):
+        slots = np.zeros(len(df), dtype=np.int64)
+        valid = np.ones(len(df), dtype=bool)
+        for (column, values), index_map, stride in zip(SLOT_AXES, self._index_maps,
+                                                       self.strides):
+            if column == 'hour':
+                codes = _encode(df['booking_time'], lambda label: index_map.get(_hour(label), -1))
+            else:
+                codes = _encode(df[column], lambda label: index_map.get(label, -1))
+            valid &= codes >= 0
+            slots += codes * stride
+        return np.where(valid, slots, 0), valid
+    
+    def rebuild(self, df):
+        # One vectorized pass over the booking history
+        slots, valid = self.frame_slots(df)
+        t = _to_days(df['booking_date'])[valid]
+        slots = slots[valid]
+        with self._lock:
+            self.weights[:] = 0.0
+            self.reference = float(t.max()) if len(t) else None
+            self.peak = 0.0
+            self.events = int(len(t))
+            if len(t):
+                self.weights += np.bincount(slots, weights=np.exp(self.rate * (t - self.reference)),
+                                            minlength=len(self.weights))
+                self.peak = float(self.weights.max())
+        return self
+    
+    def replay(self, df):
+        # Record df's bookings in booking-date order and return, per booking,
+        # the demand quoted just before it was recorded: what demand() would
+        # have served at the time, so generated training data matches serving
+        slots, valid = self.frame_slots(df)
+        t = _to_days(df['booking_date'])
+        demand = np.full(len(df), DEFAULT_DEMAND)
+        order = np.flatnonzero(valid)
+        order = order[np.argsort(t[order], kind='stable')]
+        if len(order) == 0:
+            return demand
+        slots, t = slots[order], t[order]
+        with self._lock:
+            if self.reference is None or t[-1] > self.reference:
+                self._rebase(float(t[-1]))
+            increments = np.exp(self.rate * (t - self.reference))
+            # Slot weight after each booking, then the running peak before it
+            after = self.weights[slots] + pd.Series(increments).groupby(slots).cumsum().to_numpy()
+            peaks = np.maximum.accumulate(np.maximum(after, self.peak))
+            before = np.concatenate([[self.peak], peaks[:-1]])
+            demand[order] = np.where(before > 0.0, (after - increments) / np.maximum(before, 1e-300),
+                                     DEFAULT_DEMAND)
+            self.weights += np.bincount(slots, weights=increments, minlength=len(self.weights))
+            self.peak = float(peaks[-1])
+            self.events += int(len(order))
+        return demand
+    
+    def _rebase(self, t):
+        if self.reference is None:
+            self.reference = t
+            return
+        scale = math.exp(-self.rate * (t - self.reference))
+        self.weights *= scale
+        self.peak *= scale
+        self.reference = t
+
+def _to_days(value):
+    # Scalar or array of timestamps -> float days since the epoch
+    if np.ndim(value) == 0:
+        return pd.Timestamp(value).value / _NS_PER_DAY
+    values = pd.to_datetime(value).to_numpy().astype('datetime64[ns]')
+    return values.astype(np.int64) / _NS_PER_DAY
+
+def _hour(booking_time):
+    if isinstance(booking_time, str):
+        return int(booking_time.split(':', 1)[0])
+    return booking_time.hour
+
+def _encode(values, encode):
+    # Low-cardinality columns: encode each distinct label once, then broadcast.
+    # Missing values factorize to -1, which picks the trailing -1.
+    codes, labels = pd.factorize(values)
+    lookup = np.array([encode(label) for label in labels] + [-1], dtype=np.int64)
+    return lookup[codes]
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+def get_demand_index():
+    # Built once per process from the stored booking history
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            try:
+                history = load_bookings(columns=DEMAND_COLUMNS)
+            except FileNotFoundError:
+                history = pd.DataFrame(columns=DEMAND_COLUMNS)
+            _default_index = DemandIndex.from_bookings(history)
+        return _default_index
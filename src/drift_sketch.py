@@ -0,0 +1,220 @@
+import math
+import numpy as np
+import pandas as pd
+from src.data_processor import (NUMERIC_FEATURES, CATEGORICAL_FEATURES, BOOLEAN_FEATURES,
+                                CATEGORY_VOCABULARY)
+
+DEFAULT_BINS = 20
+
+# Population stability index above which a feature counts as drifted
+# (0.1-0.2 is the usual "moderate shift" band)
+PSI_THRESHOLD = 0.2
+
+# Served-price quantiles compared against the training prices
+PRICE_QUANTILES = [0.1, 0.5, 0.9, 0.99]
+
+class QuantileSketch:
+    # Log-bucketed histogram (DDSketch-style): any quantile of the positive
+    # values seen, within relative_accuracy, in a fixed number of buckets
+    def __init__(self, relative_accuracy=0.01, min_value=0.01, max_value=1e6, counts=None):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(gamma)
+        self._offset = math.floor(math.log(min_value) / self._log_gamma)
+        n = math.ceil(math.log(max_value) / self._log_gamma) - self._offset + 1
+        self.counts = np.zeros(n, dtype=np.int64) if counts is None else np.asarray(counts, np.int64)
+    
+    @property
+    def count(self):
+        return int(self.counts.sum())
+    
+    def update(self, values):
+        values = np.clip(np.asarray(values, dtype=np.float64), self.min_value, self.max_value)
+        index = np.ceil(np.log(values) / self._log_gamma).astype(np.int64) - self._offset
+        self.counts += np.bincount(index, minlength=len(self.counts))[:len(self.counts)]
+    
+    def quantile(self, q):
+        total = self.count
+        if total == 0:
+            return None
+        index = int(np.searchsorted(np.cumsum(self.counts), q * (total - 1), side='right'))
+        # Midpoint (in relative terms) of the bucket (gamma^(i-1), gamma^i]
+        return 2 * math.exp((index + self._offset) * self._log_gamma) / (
+            1 + math.exp(self._log_gamma))
+    
+    def merge(self, other):
+        self.counts += other.counts
+    
+    def to_dict(self):
+        nonzero = np.flatnonzero(self.counts)
+        return {'relative_accuracy': self.relative_accuracy, 'min_value': self.min_value,
+                'max_value': self.max_value, 'buckets': nonzero.tolist(),
+                'counts': self.counts[nonzero].tolist()}
+    
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'], data['min_value'], data['max_value'])
+        sketch.counts[data['buckets']] = data['counts']
+        return sketch
+
+class DriftSketch:
+    # Fixed-size summary of the model inputs and prices: binned histograms for
+    # numeric features (edges fixed when the sketch is created), per-category
+    # counts with an overflow slot for unseen values, true/false counts for
+    # booleans and a quantile sketch of the price. Memory does not grow with
+    # the number of rows, and sketches with the same edges add up.
+    def __init__(self, edges):
+        self.edges = {column: np.asarray(edges[column], dtype=np.float64)
+                      for column in NUMERIC_FEATURES}
+        self.numeric = {column: np.zeros(len(self.edges[column]) + 1, dtype=np.int64)
+                        for column in NUMERIC_FEATURES}
+        self.sums = {column: 0.0 for column in NUMERIC_FEATURES}
+        self.categorical = {column: np.zeros(len(CATEGORY_VOCABULARY[column]) + 1, dtype=np.int64)
+                            for column in CATEGORICAL_FEATURES}
+        self.boolean = {column: np.zeros(2, dtype=np.int64) for column in BOOLEAN_FEATURES}
+        self.price = QuantileSketch()
+        self.count = 0
+    
+    @classmethod
+    def from_sample(cls, df, bins=DEFAULT_BINS):
+        # Interior edges at the sample's quantiles; duplicates collapse, so
+        # low-cardinality columns get one bin per value
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        return cls({column: np.unique(np.quantile(df[column].to_numpy(np.float64), quantiles))
+                    for column in NUMERIC_FEATURES})
+    
+    @classmethod
+    def from_chunks(cls, make_chunks, bins=DEFAULT_BINS, sample_size=100_000, seed=0):
+        # Edges from a uniform sample of every chunk (the rows with the
+        # sample_size smallest random keys, so chunk order doesn't matter),
+        # then a second pass for the counts. make_chunks returns a fresh
+        # iterator of DataFrames per pass.
+        rng = np.random.default_rng(seed)
+        keys = np.empty(0)
+        sample = np.empty((0, len(NUMERIC_FEATURES)))
+        for chunk in make_chunks():
+            if len(chunk) == 0:
+                continue
+            keys = np.concatenate([keys, rng.random(len(chunk))])
+            sample = np.vstack([sample, chunk[NUMERIC_FEATURES].to_numpy(np.float64)])
+            if len(keys) > sample_size:
+                keep = np.argpartition(keys, sample_size)[:sample_size]
+                keys, sample = keys[keep], sample[keep]
+        if len(keys) == 0:
+            return None
+        sketch = cls.from_sample(pd.DataFrame(sample, columns=NUMERIC_FEATURES), bins)
+        for chunk in make_chunks():
+            if len(chunk):
+                sketch.update_frame(chunk)
+        return sketch
+    
+    def empty_like(self):
+        return DriftSketch(self.edges)
+    
+    def update_frame(self, df):
+        codes = {column: pd.Categorical(df[column], categories=CATEGORY_VOCABULARY[column]).codes
+                 for column in CATEGORICAL_FEATURES}
+        self.update_columns(
+            {column: df[column].to_numpy(np.float64) for column in NUMERIC_FEATURES},
+            codes,
+            {column: df[column].to_numpy(bool) for column in BOOLEAN_FEATURES},
+            df['price'].to_numpy(np.float64) if 'price' in df else None)
+    
+    def update_columns(self, numeric, codes, boolean, price=None):
+        # Already split columns: numeric arrays, category codes (anything
+        # outside the vocabulary counts as unseen) and boolean arrays
+        n = len(next(iter(numeric.values())))
+        for column in NUMERIC_FEATURES:
+            values = numeric[column]
+            counts = self.numeric[column]
+            counts += np.bincount(np.searchsorted(self.edges[column], values, side='right'),
+                                  minlength=len(counts))
+            self.sums[column] += float(values.sum())
+        for column in CATEGORICAL_FEATURES:
+            counts = self.categorical[column]
+            unseen = len(counts) - 1
+            column_codes = np.asarray(codes[column], dtype=np.int64)
+            column_codes = np.where((column_codes < 0) | (column_codes > unseen), unseen,
+                                    column_codes)
+            counts += np.bincount(column_codes, minlength=len(counts))
+        for column in BOOLEAN_FEATURES:
+            true = int(np.count_nonzero(boolean[column]))
+            self.boolean[column] += (n - true, true)
+        if price is not None:
+            self.price.update(price)
+        self.count += n
+    
+    def merge(self, other):
+        for column in NUMERIC_FEATURES:
+            self.numeric[column] += other.numeric[column]
+            self.sums[column] += other.sums[column]
+        for column in CATEGORICAL_FEATURES:
+            self.categorical[column] += other.categorical[column]
+        for column in BOOLEAN_FEATURES:
+            self.boolean[column] += other.boolean[column]
+        self.price.merge(other.price)
+        self.count += other.count
+    
+    def copy(self):
+        sketch = self.empty_like()
+        sketch.merge(self)
+        return sketch
+    
+    def distributions(self):
+        # Every feature's counts as one flat mapping
+        counts = dict(self.numeric)
+        counts.update(self.categorical)
+        counts.update(self.boolean)
+        return counts
+    
+    def means(self):
+        return {column: self.sums[column] / self.count if self.count else None
+                for column in NUMERIC_FEATURES}
+    
+    def compare(self, live, threshold=PSI_THRESHOLD):
+        # Per-feature PSI of `live` (same edges) against this reference
+        reference_counts = self.distributions()
+        features = {}
+        for column, counts in live.distributions().items():
+            value = psi(reference_counts[column], counts)
+            features[column] = {'psi': round(value, 4), 'drifted': value > threshold}
+        training_means = self.means()
+        for column, mean in live.means().items():
+            features[column]['training_mean'] = training_means[column]
+            features[column]['served_mean'] = mean
+        return features
+    
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'edges': {column: edges.tolist() for column, edges in self.edges.items()},
+            'numeric': {column: counts.tolist() for column, counts in self.numeric.items()},
+            'sums': self.sums,
+            'categorical': {column: counts.tolist() for column, counts in self.categorical.items()},
+            'boolean': {column: counts.tolist() for column, counts in self.boolean.items()},
+            'price': self.price.to_dict()
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['edges'])
+        sketch.count = data['count']
+        sketch.sums = dict(data['sums'])
+        for field in ('numeric', 'categorical', 'boolean'):
+            target = getattr(sketch, field)
+            for column, counts in data[field].items():
+                target[column] = np.asarray(counts, dtype=np.int64)
+        sketch.price = QuantileSketch.from_dict(data['price'])
+        return sketch
+
+def psi(reference, live, epsilon=1e-4):
+    # Population stability index between two count vectors over the same bins
+    reference = np.asarray(reference, dtype=np.float64)
+    live = np.asarray(live, dtype=np.float64)
+    if reference.sum() == 0 or live.sum() == 0:
+        return 0.0
+    p = np.maximum(reference / reference.sum(), epsilon)
+    q = np.maximum(live / live.sum(), epsilon)
+    return float(np.sum((q - p) * np.log(q / p)))
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.instrumentation import metrics
+
+EXPLANATION_MODES = ('exact', 'approximate')
+
+class ExplanationService:
+    # SHAP explanations with an LRU cache keyed on the encoded feature vector.
+    # 'exact' is tree SHAP; 'approximate' is Saabas path attribution, which
+    # is orders of magnitude cheaper but only approximately consistent.
+    def __init__(self, trainer, feature_names, cache_size=1024, max_workers=1):
+        self.trainer = trainer
+        self.feature_names = np.asarray(feature_names)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='explain')
+        self.hits = 0
+        self.misses = 0
+        
+    @classmethod
+    def from_loaded(cls, loaded, **kwargs):
+        # Feature names are resolved once here rather than on every quote
+        with metrics.span('feature_names'):
+            names = loaded.processor.preprocessor.get_feature_names_out()
+        return cls(loaded.trainer, names, **kwargs)
+    
+    def explain(self, X, mode='exact'):
+        # Attributions for a single encoded row (1-D array)
+        return self.explain_batch(np.atleast_2d(X), mode=mode)[0]
+    
+    def explain_batch(self, X, mode='exact'):
+        if mode not in EXPLANATION_MODES:
+            raise ValueError(f"Unknown explanation mode: {mode}")
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        result = np.empty(X.shape, dtype=np.float64)
+        
+        keys = [(mode, row.tobytes()) for row in X]
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    result[i] = cached
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        metrics.inc('explanation_cache_hits', len(keys) - len(missing))
+        metrics.inc('explanation_cache_misses', len(missing))
+        
+        if missing:
+            # All cache misses go to SHAP in one call
+            values = self._shap_values(X[missing], mode)
+            result[missing] = values
+            with self._lock:
+                for i, row_values in zip(missing, values):
+                    self._cache[keys[i]] = row_values
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        
+        return result
+    
+    def explain_async(self, X, mode='exact'):
+        # Returns a Future so the price can be shown before the explanation is ready
+        return self._executor.submit(self.explain, X, mode)
+    
+    def top_features(self, values, k=10):
+        # (feature name, attribution) pairs with the largest absolute impact
+        values = np.asarray(values)
+        k = min(k, len(values))
+        top = np.argpartition(-np.abs(values), k - 1)[:k]
+        top = top[np.argsort(-np.abs(values[top]))]
+        return [(self.feature_names[i], float(values[i])) for i in top]
+    
+    def _shap_values(self, X, mode):
+        if mode == 'approximate':
+            return self.trainer.explainer.shap_values(X, approximate=True)
+        return self.trainer.explain_prediction(X)
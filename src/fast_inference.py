@@ -0,0 +1,113 @@
+import threading
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor
+from src.instrumentation import metrics
+from src.forest_evaluator import FlatForest
+
+class CompiledPreprocessor:
+    # Plain-Python replica of the fitted ColumnTransformer for one booking dict.
+    # Produces exactly the values of DataProcessor.prepare_data(..., is_training=False).
+    def __init__(self, numeric, categorical, boolean, n_features):
+        self.numeric = numeric
+        self.categorical = categorical
+        self.boolean = boolean
+        self.n_features = n_features
+        
+    @classmethod
+    def from_preprocessor(cls, preprocessor):
+        numeric, categorical, boolean = [], [], []
+        offset = 0
+        
+        # Output blocks follow transformer order; the remainder is dropped
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == 'num':
+                scaler = transformer.named_steps['scaler']
+                for i, column in enumerate(columns):
+                    numeric.append((column, offset + i,
+                                    float(scaler.mean_[i]), float(scaler.scale_[i])))
+                offset += len(columns)
+            elif name == 'cat':
+                encoder = transformer.named_steps['onehot']
+                drop_idx = encoder.drop_idx_
+                for i, (column, categories) in enumerate(zip(columns, encoder.categories_)):
+                    dropped = None if drop_idx is None else drop_idx[i]
+                    index_map = {}
+                    position = offset
+                    for j, category in enumerate(categories):
+                        if j == dropped:
+                            index_map[category] = None
+                        else:
+                            index_map[category] = position
+                            position += 1
+                    categorical.append((column, index_map, offset, position))
+                    offset = position
+            elif name == 'bool':
+                for i, column in enumerate(columns):
+                    boolean.append((column, offset + i))
+                offset += len(columns)
+        
+        return cls(numeric, categorical, boolean, offset)
+    
+    def transform_into(self, booking, out):
+        # Write the feature vector for one booking into a preallocated 1-D buffer
+        for column, index, mean, scale in self.numeric:
+            out[index] = (float(booking[column]) - mean) / scale
+        
+        for column, index_map, start, stop in self.categorical:
+            out[start:stop] = 0.0
+            value = booking[column]
+            if value not in index_map:
+                raise ValueError(f"Found unknown category {value!r} in column {column!r}")
+            index = index_map[value]
+            if index is not None:
+                out[index] = 1.0
+        
+        for column, index in self.boolean:
+            out[index] = float(booking[column])
+        
+        return out
+    
+    def transform(self, booking):
+        return self.transform_into(booking, np.empty(self.n_features, dtype=np.float64))
+
+class FastPricer:
+    # dict-in/float-out quote path: no DataFrame, no ColumnTransformer, no joblib dispatch
+    def __init__(self, trainer, compiled):
+        self.compiled = compiled
+        self.model = trainer.model
+        
+        # Averaging forests are scored by the flat-array evaluator (memory-mapped
+        # from the artifact when available); other models use their own predict
+        self.forest = trainer.flat_forest
+        if self.forest is None and isinstance(trainer.model, (RandomForestRegressor,
+                                                              ExtraTreesRegressor)):
+            self.forest = FlatForest.from_sklearn(trainer.model)
+        self._local = threading.local()
+        
+    @classmethod
+    def from_loaded(cls, loaded):
+        compiled = CompiledPreprocessor.from_preprocessor(loaded.processor.preprocessor)
+        return cls(loaded.trainer, compiled)
+    
+    @metrics.timed('fast_features')
+    def features(self, booking):
+        # Per-thread buffer so concurrent sessions never share scratch space
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = np.empty((1, self.compiled.n_features), dtype=np.float64)
+            self._local.buffer = buffer
+        self.compiled.transform_into(booking, buffer[0])
+        return buffer
+    
+    def price(self, booking):
+        return self.predict_features(self.features(booking))
+    
+    @metrics.timed('fast_predict')
+    def predict_features(self, X):
+        return float(self.predict_matrix(X)[0])
+    
+    def predict_matrix(self, X):
+        # Equal to model.predict(X), without sklearn's per-call overhead
+        if self.forest is None:
+            return self.model.predict(X)
+        return self.forest.predict(X)
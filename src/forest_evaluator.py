@@ -0,0 +1,129 @@
+import json
+import os
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+FOREST_ARRAYS = ('feature', 'threshold', 'children_left', 'children_right', 'value', 'roots')
+
+class FlatForest:
+    # A fitted RandomForest/ExtraTrees regressor flattened into contiguous
+    # arrays. Predictions equal model.predict exactly: inputs are compared as
+    # float32 against float64 thresholds and tree outputs are summed in
+    # estimator order before dividing by the tree count, as sklearn does.
+    def __init__(self, feature, threshold, children_left, children_right, value, roots,
+                 max_depth, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+        
+    @classmethod
+    def from_sklearn(cls, model):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        sizes = [tree.node_count for tree in trees]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        
+        feature, threshold, left, right, value = [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count, dtype=np.int64) + offset
+            is_leaf = tree.children_left == -1
+            # Leaves point at themselves so every row can take max_depth steps
+            left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            value.append(tree.value[:, 0, 0])
+        
+        return cls(np.concatenate(feature), np.concatenate(threshold),
+                   np.concatenate(left), np.concatenate(right),
+                   np.concatenate(value).astype(np.float64), offsets,
+                   max(tree.max_depth for tree in trees), model.n_features_in_)
+    
+    def predict(self, X, batch_size=4096, use_numba=None):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        if use_numba is None:
+            use_numba = numba is not None
+        elif use_numba and numba is None:
+            raise ImportError("use_numba=True needs numba (pip install numba); "
+                              "pass use_numba=None to fall back to numpy")
+        if use_numba:
+            out = np.empty(X.shape[0], dtype=np.float64)
+            _predict_numba(X, self.feature, self.threshold, self.children_left,
+                           self.children_right, self.value, self.roots, out)
+            return out
+        
+        out = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], batch_size):
+            out[start:start + batch_size] = self._predict_numpy(X[start:start + batch_size])
+        return out
+    
+    def _predict_numpy(self, X):
+        # Advance every (row, tree) pair one level per step
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+        
+        # cumsum adds left to right, matching sklearn's per-tree accumulation
+        totals = np.cumsum(self.value[nodes], axis=1)[:, -1]
+        return totals / len(self.roots)
+    
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for name in FOREST_ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(path, 'forest.json'), 'w') as f:
+            json.dump({'max_depth': int(self.max_depth),
+                       'n_features': int(self.n_features)}, f)
+    
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        # With mmap_mode the arrays are shared through the page cache by every
+        # worker process that maps the same artifact
+        with open(os.path.join(path, 'forest.json')) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+                  for name in FOREST_ARRAYS}
+        return cls(max_depth=meta['max_depth'], n_features=meta['n_features'], **arrays)
+
+if numba is not None:
+    # Serial and GIL-free: callers such as the pricing service invoke this from
+    # worker threads, which numba's default parallel threading layer does not
+    # support (the process hangs at exit). Threads supply the parallelism instead.
+    @numba.njit(cache=True, nogil=True)
+    def _predict_numba(X, feature, threshold, children_left, children_right, value, roots, out,
+                       block=256):
+        # Each tree is walked for a block of rows before the next one, which
+        # keeps the tree's nodes in cache and still adds tree outputs to every
+        # row in estimator order
+        n_rows = X.shape[0]
+        n_blocks = (n_rows + block - 1) // block
+        for b in range(n_blocks):
+            start = b * block
+            stop = min(start + block, n_rows)
+            for i in range(start, stop):
+                out[i] = 0.0
+            for t in range(roots.shape[0]):
+                for i in range(start, stop):
+                    node = roots[t]
+                    while children_left[node] != node:
+                        if X[i, feature[node]] <= threshold[node]:
+                            node = children_left[node]
+                        else:
+                            node = children_right[node]
+                    out[i] += value[node]
+            for i in range(start, stop):
+                out[i] /= roots.shape[0]
+else:
+    _predict_numba = None
@@ -0,0 +1,245 @@
+import bisect
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Latency buckets in seconds, from sub-millisecond quotes to slow LLM calls
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+    
+    def quantile(self, q):
+        # Linear interpolation inside the bucket holding the q-th observation
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                low = self.buckets[i - 1] if i > 0 else 0.0
+                high = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return low + (high - low) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+class MetricsRegistry:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._histograms = {}
+        self._counters = Counter()
+        self._gauges = {}
+        self._lock = threading.Lock()
+        
+    @contextmanager
+    def span(self, stage):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc(f'{stage}_errors')
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+    
+    def timed(self, stage):
+        # Decorator form of span
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram()
+            histogram.observe(seconds)
+    
+    def inc(self, name, value=1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] += value
+    
+    def set_gauge(self, name, value):
+        if self.enabled:
+            self._gauges[name] = value
+    
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+    
+    def to_dict(self):
+        with self._lock:
+            stages = {
+                stage: {
+                    'count': h.count,
+                    'mean_ms': h.sum / h.count * 1000 if h.count else None,
+                    'p50_ms': _ms(h.quantile(0.5)),
+                    'p99_ms': _ms(h.quantile(0.99))
+                }
+                for stage, h in sorted(self._histograms.items())
+            }
+            return {'stages': stages, 'counters': dict(self._counters),
+                    'gauges': dict(self._gauges)}
+    
+    def render_prometheus(self):
+        lines = [
+            '# HELP tennis_stage_seconds Latency of pricing pipeline stages',
+            '# TYPE tennis_stage_seconds histogram'
+        ]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f'tennis_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'tennis_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'tennis_stage_seconds_sum{{stage="{stage}"}} {h.sum}')
+                lines.append(f'tennis_stage_seconds_count{{stage="{stage}"}} {h.count}')
+            
+            lines.append('# TYPE tennis_events_total counter')
+            for name, value in sorted(self._counters.items()):
+                lines.append(f'tennis_events_total{{event="{name}"}} {value}')
+            
+            lines.append('# TYPE tennis_gauge gauge')
+            for name, value in sorted(self._gauges.items()):
+                lines.append(f'tennis_gauge{{name="{name}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+# Process-wide registry; TENNIS_METRICS=0 turns timing off
+metrics = MetricsRegistry(enabled=os.environ.get('TENNIS_METRICS', '1') != '0')
+
+def peak_rss_mb():
+    # Process memory high-water mark, or None where getrusage is unavailable
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return usage / 2**20 if sys.platform == 'darwin' else usage / 1024
+
+def current_rss_mb():
+    # Resident set size right now (from /proc), or None off Linux
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+def start_metrics_server(port=9464, host='127.0.0.1', registry=None):
+    # Serves /metrics (Prometheus text) and /metrics.json from a daemon thread
+    registry = registry or metrics
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body, content_type = registry.render_prometheus(), 'text/plain; version=0.0.4'
+            elif self.path == '/metrics.json':
+                body, content_type = json.dumps(registry.to_dict()), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            payload = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name='metrics-server').start()
+    return server
+
+_server = None
+_server_lock = threading.Lock()
+
+def ensure_metrics_server(port, host='127.0.0.1'):
+    # Idempotent variant for scripts that rerun, like the Streamlit app
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = start_metrics_server(port, host)
+        return _server
+
+class SamplingProfiler:
+    # Samples one thread's stack at a fixed interval and aggregates the stacks
+    # in collapsed form ("frame;frame;frame count"), as flamegraph.pl and
+    # speedscope read it
+    def __init__(self, interval=0.002, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name='sampling-profiler')
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+    
+    def collapsed(self):
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common())
+    
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            f.write(self.collapsed() + '\n')
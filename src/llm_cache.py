@@ -0,0 +1,138 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_CACHE_PATH = 'data/llm_cache.sqlite'
+
+def normalize_text(text):
+    # Case and whitespace differences should not miss the cache
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+def cache_key(text, template):
+    template_hash = hashlib.sha256(template.encode('utf-8')).hexdigest()
+    return hashlib.sha256(
+        f"{template_hash}\n{normalize_text(text)}".encode('utf-8')
+    ).hexdigest()
+
+class LLMResponseCache:
+    # SQLite-backed response cache with TTL expiry, LRU eviction and
+    # merging of identical in-flight requests
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=7 * 24 * 3600, max_entries=10_000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+            'created_at REAL NOT NULL, last_access REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)'
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.merged = 0
+        
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                'UPDATE responses SET last_access = ? WHERE key = ?', (now, key)
+            )
+            self._conn.commit()
+            return value
+    
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)',
+                (key, value, now, now)
+            )
+            # Evict least recently used entries beyond the size limit
+            self._conn.execute(
+                'DELETE FROM responses WHERE key IN ('
+                'SELECT key FROM responses ORDER BY last_access DESC '
+                'LIMIT -1 OFFSET ?)', (self.max_entries,)
+            )
+            self._conn.commit()
+    
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is not None:
+            self._count('hits')
+            return value
+        
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+            else:
+                self.merged += 1
+        
+        if not owner:
+            # Someone is already asking the LLM the same thing; share their answer
+            return future.result()
+        
+        try:
+            value = compute()
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            # Failures are reported to every waiter but never cached
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.merged
+            entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'merged': self.merged,
+                'entries': entries,
+                'hit_rate': (self.hits + self.merged) / lookups if lookups else 0.0
+            }
+    
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_llm_cache(path=DEFAULT_CACHE_PATH):
+    # Process-wide cache so concurrent sessions share hits and in-flight calls
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache(path)
+        return _default_cache
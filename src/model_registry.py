@@ -0,0 +1,168 @@
+import hashlib
+import os
+import threading
+import time
+from src.data_processor import DataProcessor
+from src.fast_inference import FastPricer
+from src.explanations import ExplanationService
+from src.model_trainer import ModelTrainer, DEFAULT_MODEL_PATH, CURRENT_POINTER
+from src.price_grid import GridPricer
+
+# Wait before retrying a model version that failed to load, doubling per failure
+MIN_RELOAD_BACKOFF = 1.0
+MAX_RELOAD_BACKOFF = 60.0
+
+class LoadedModel:
+    # Immutable bundle shared read-only by every session; the fast pricer and
+    # explanation service are built once, on first use
+    def __init__(self, trainer, processor, digest):
+        self.trainer = trainer
+        self.processor = processor
+        self.digest = digest
+        self.version = trainer.version or digest[:12]
+        self.loaded_at = time.time()
+        self._fast_pricer = None
+        self._explanations = None
+        self._grid_pricer = None
+        self._grid_checked = False
+        self._init_lock = threading.Lock()
+        
+    @property
+    def fast_pricer(self):
+        # Compiled lazily, once per loaded model version, even when the first
+        # requests arrive on several threads at once
+        if self._fast_pricer is None:
+            with self._init_lock:
+                if self._fast_pricer is None:
+                    self._fast_pricer = FastPricer.from_loaded(self)
+        return self._fast_pricer
+    
+    @property
+    def explanations(self):
+        # One explanation cache per model version, shared by all sessions
+        if self._explanations is None:
+            with self._init_lock:
+                if self._explanations is None:
+                    self._explanations = ExplanationService.from_loaded(self)
+        return self._explanations
+    
+    @property
+    def grid_pricer(self):
+        # Precomputed price table from build_price_grid.py, or None when no
+        # grid was built for this model version
+        if not self._grid_checked:
+            with self._init_lock:
+                if not self._grid_checked:
+                    self._grid_pricer = GridPricer.for_loaded(self)
+                    self._grid_checked = True
+        return self._grid_pricer
+
+class ModelRegistry:
+    def __init__(self, check_interval=1.0):
+        self.check_interval = check_interval
+        self._entries = {}
+        # File signature each entry was loaded (or last confirmed) at
+        self._signatures = {}
+        self._last_checked = {}
+        # path -> (signature, attempts, retry_at) for the last failed reload
+        self._failures = {}
+        self._lock = threading.Lock()
+        
+    def get(self, path=DEFAULT_MODEL_PATH):
+        entry = self._entries.get(path)
+        if entry is not None and not self._check_due(path):
+            return entry
+        
+        signature = self._signature(path)
+        if entry is not None and (self._signatures.get(path) == signature
+                                  or self._backing_off(path, signature)):
+            return entry
+        
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            entry = self._entries.get(path)
+            if entry is None or (self._signatures.get(path) != signature
+                                 and not self._backing_off(path, signature)):
+                entry = self._reload(path, entry, signature)
+            return entry
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._signatures.clear()
+            self._last_checked.clear()
+            self._failures.clear()
+    
+    def _check_due(self, path):
+        now = time.monotonic()
+        if now - self._last_checked.get(path, 0) < self.check_interval:
+            return False
+        self._last_checked[path] = now
+        return True
+    
+    def _backing_off(self, path, signature):
+        # The same files failed to load recently; a new write changes the signature
+        failure = self._failures.get(path)
+        return (failure is not None and failure[0] == signature
+                and time.monotonic() < failure[2])
+    
+    def _record_failure(self, path, signature):
+        previous = self._failures.get(path)
+        attempts = previous[1] if previous is not None and previous[0] == signature else 0
+        base = max(self.check_interval, MIN_RELOAD_BACKOFF)
+        delay = min(base * 2 ** attempts, MAX_RELOAD_BACKOFF)
+        self._failures[path] = (signature, attempts + 1, time.monotonic() + delay)
+    
+    def _reload(self, path, current, signature):
+        digest = self._digest(path)
+        if current is not None and current.digest == digest:
+            # Touched but unchanged: keep the loaded objects
+            self._signatures[path] = signature
+            return current
+        
+        try:
+            trainer = ModelTrainer()
+            preprocessor = trainer.load_model(path)
+        except Exception:
+            # A half-written file must not take down serving; keep the old model
+            # and back off before loading the same files again
+            if current is None:
+                raise
+            self._record_failure(path, signature)
+            return current
+        
+        processor = DataProcessor()
+        processor.preprocessor = preprocessor
+        
+        # Publish the fully loaded bundle in one assignment
+        entry = LoadedModel(trainer, processor, digest)
+        self._entries[path] = entry
+        self._signatures[path] = signature
+        self._failures.pop(path, None)
+        return entry
+    
+    def _watched_file(self, path):
+        # Versioned artifacts change only through their CURRENT pointer
+        if os.path.isdir(path):
+            return os.path.join(path, CURRENT_POINTER)
+        return path
+    
+    def _signature(self, path):
+        stat = os.stat(self._watched_file(path))
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _digest(self, path):
+        if os.path.isdir(path):
+            with open(self._watched_file(path)) as f:
+                return f.read().strip()
+        
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+_registry = ModelRegistry()
+
+def get_registry():
+    return _registry
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
+from sklearn.ensemble import (RandomForestRegressor, ExtraTreesRegressor,
+                              HistGradientBoostingRegressor)
+from sklearn.metrics import mean_absolute_error
+
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+
+def candidate_models(random_state=42):
+    # (name, estimator) pairs covering each model family at a few sizes
+    candidates = []
+    for n_estimators, max_depth in [(100, 10), (50, 8), (25, 6)]:
+        candidates.append((f'rf_{n_estimators}x{max_depth}', RandomForestRegressor(
+            n_estimators=n_estimators, max_depth=max_depth,
+            random_state=random_state, n_jobs=1)))
+        candidates.append((f'et_{n_estimators}x{max_depth}', ExtraTreesRegressor(
+            n_estimators=n_estimators, max_depth=max_depth,
+            random_state=random_state, n_jobs=1)))
+    for max_iter, max_depth in [(200, 6), (100, 4)]:
+        candidates.append((f'hgb_{max_iter}x{max_depth}', HistGradientBoostingRegressor(
+            max_iter=max_iter, max_depth=max_depth, random_state=random_state)))
+    if XGBRegressor is not None:
+        for n_estimators, max_depth in [(200, 6), (100, 4)]:
+            candidates.append((f'xgb_{n_estimators}x{max_depth}', XGBRegressor(
+                n_estimators=n_estimators, max_depth=max_depth, learning_rate=0.1,
+                random_state=random_state, n_jobs=1)))
+    return candidates
+
+def _fit_candidate(name, model, X_train, y_train, X_test, y_test, workdir):
+    # Runs in a worker process: fit, score and persist one candidate
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    
+    mae = mean_absolute_error(y_test, model.predict(X_test))
+    path = os.path.join(workdir, f'{name}.joblib')
+    joblib.dump(model, path)
+    return {'name': name, 'family': type(model).__name__, 'mae': float(mae),
+            'fit_seconds': fit_seconds, 'path': path}
+
+def _measure_serving(result, X_test, single_row_samples, batch_size):
+    # Measured one candidate at a time in this process so timings don't compete
+    start = time.perf_counter()
+    model = joblib.load(result['path'])
+    result['load_seconds'] = time.perf_counter() - start
+    result['size_bytes'] = os.path.getsize(result['path'])
+    
+    latencies = []
+    for i in range(single_row_samples):
+        row = X_test[i % len(X_test)][np.newaxis, :]
+        start = time.perf_counter()
+        model.predict(row)
+        latencies.append(time.perf_counter() - start)
+    result['p50_ms'] = float(np.percentile(latencies, 50) * 1000)
+    result['p99_ms'] = float(np.percentile(latencies, 99) * 1000)
+    
+    batch = X_test[np.arange(batch_size) % len(X_test)]
+    start = time.perf_counter()
+    model.predict(batch)
+    result['batch_rows_per_sec'] = batch_size / (time.perf_counter() - start)
+    return model
+
+def run_search(X_train, y_train, X_test, y_test, candidates=None, max_workers=None,
+               single_row_samples=300, batch_size=50_000, workdir=None):
+    candidates = candidates if candidates is not None else candidate_models()
+    if workdir is None:
+        # Candidate artifacts are only needed to measure load time and size;
+        # without a workdir they are removed when the search finishes
+        with tempfile.TemporaryDirectory(prefix='model_search_') as workdir:
+            results = run_search(X_train, y_train, X_test, y_test, candidates, max_workers,
+                                 single_row_samples, batch_size, workdir)
+        for result in results:
+            del result['path']
+        return results
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_fit_candidate, name, model, X_train, y_train,
+                               X_test, y_test, workdir)
+                   for name, model in candidates]
+        results = [future.result() for future in futures]
+    
+    for result in results:
+        _measure_serving(result, X_test, single_row_samples, batch_size)
+    return sorted(results, key=lambda r: r['mae'])
+
+def select_best(results, latency_budget_ms=None):
+    # Most accurate candidate whose p99 single-row latency fits the budget
+    eligible = [r for r in results
+                if latency_budget_ms is None or r['p99_ms'] <= latency_budget_ms]
+    if not eligible:
+        return None
+    return min(eligible, key=lambda r: r['mae'])
@@ -1,44 +1,225 @@
 import joblib
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor
 import shap
+import hashlib
+import json
 import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from src.instrumentation import metrics
+from src.forest_evaluator import FlatForest
+from src.drift_sketch import DriftSketch
+
+DEFAULT_MODEL_PATH = 'models/trained_model'
+ARTIFACT_FORMAT_VERSION = 1
+CURRENT_POINTER = 'CURRENT'
 
 class ModelTrainer:
-    def __init__(self):
-        self.model = RandomForestRegressor(
+    def __init__(self, model=None):
+        # Any regressor SHAP's TreeExplainer supports can be swapped in
+        self.model = model if model is not None else RandomForestRegressor(
             n_estimators=100,
             max_depth=10,
             random_state=42
         )
-        self.explainer = None
+        self._explainer = None
+        self._explainer_lock = threading.Lock()
         self.preprocessor = None
+        self.metadata = {}
+        self.version = None
+        self.flat_forest = None
+        # Input distribution at training time, compared against served quotes
+        self.drift_snapshot = None
+        
+    @property
+    def explainer(self):
+        # Built on the first explanation request instead of being pickled, once
+        # even when several sessions ask at the same time
+        if self._explainer is None:
+            with self._explainer_lock:
+                if self._explainer is None:
+                    self._explainer = shap.TreeExplainer(self.model)
+        return self._explainer
+    
+    @explainer.setter
+    def explainer(self, explainer):
+        self._explainer = explainer
         
     def train(self, X, y, preprocessor):
+        start = time.time()
         self.model.fit(X, y)
-        self.explainer = shap.TreeExplainer(self.model)
+        self._explainer = None
+        self.flat_forest = None
+        self.drift_snapshot = None
         self.preprocessor = preprocessor
+        self.metadata = {
+            'trained_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'training_seconds': round(time.time() - start, 3),
+            'n_samples': int(X.shape[0]),
+            'n_features': int(X.shape[1]),
+            'model_class': type(self.model).__name__,
+            'model_params': _json_params(self.model.get_params())
+        }
+        
+    def train_incremental(self, X_new, y_new, n_new_estimators=20, max_estimators=None):
+        # Append trees fitted on the new rows only; existing trees are kept as-is.
+        # Boosted models have no independent trees to append or retire
+        if not isinstance(self.model, (RandomForestRegressor, ExtraTreesRegressor)):
+            raise TypeError(f"Incremental training needs a RandomForestRegressor or "
+                            f"ExtraTreesRegressor, not {type(self.model).__name__}; "
+                            f"run a full training instead")
+        start = time.time()
+        n_existing = len(self.model.estimators_)
+        self.model.set_params(warm_start=True, n_estimators=n_existing + n_new_estimators)
+        self.model.fit(X_new, y_new)
+        
+        if max_estimators is not None and len(self.model.estimators_) > max_estimators:
+            # Sliding window: retire the oldest trees to bound inference cost
+            self.model.estimators_ = self.model.estimators_[-max_estimators:]
+            self.model.n_estimators = max_estimators
+        self._explainer = None
+        self.flat_forest = None
         
-    def save_model(self, path='models/trained_model.joblib'):
-        # Create models directory if it doesn't exist
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.metadata = dict(self.metadata)
+        self.metadata.update({
+            'trained_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'training_seconds': round(time.time() - start, 3),
+            'n_samples': self.metadata.get('n_samples', 0) + int(X_new.shape[0]),
+            'incremental_updates': self.metadata.get('incremental_updates', 0) + 1,
+            'model_params': _json_params(self.model.get_params())
+        })
+    
+    def save_model(self, path=DEFAULT_MODEL_PATH, keep_versions=3):
+        # Layout: <path>/<version>/{manifest.json, model.joblib, preprocessor.joblib,
+        # forest/*.npy, drift_snapshot.json} plus <path>/CURRENT naming the live version
+        os.makedirs(path, exist_ok=True)
+        version = datetime.now().strftime('%Y%m%dT%H%M%S%f') + '-' + os.urandom(3).hex()
+        version_dir = os.path.join(path, version)
+        os.makedirs(version_dir)
         
-        model_data = {
-            'model': self.model,
-            'explainer': self.explainer,
-            'preprocessor': self.preprocessor
+        # The forest is stored uncompressed so its arrays can be memory-mapped;
+        # the preprocessor is small and compresses well
+        joblib.dump(self.model, os.path.join(version_dir, 'model.joblib'))
+        joblib.dump(self.preprocessor, os.path.join(version_dir, 'preprocessor.joblib'),
+                    compress=3)
+        
+        # Averaging forests are also exported as flat arrays that workers mmap and share
+        has_forest = isinstance(self.model, (RandomForestRegressor, ExtraTreesRegressor))
+        if has_forest:
+            FlatForest.from_sklearn(self.model).save(os.path.join(version_dir, 'forest'))
+        
+        has_snapshot = self.drift_snapshot is not None
+        if has_snapshot:
+            with open(os.path.join(version_dir, 'drift_snapshot.json'), 'w') as f:
+                json.dump(self.drift_snapshot.to_dict(), f)
+        
+        manifest = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'version': version,
+            'feature_names': list(self.preprocessor.get_feature_names_out()),
+            'schema': _input_schema(self.preprocessor),
+            'training': self.metadata,
+            'flat_forest': has_forest,
+            'drift_snapshot': has_snapshot,
+            'files': {
+                name: _sha256(os.path.join(version_dir, name))
+                for name in ('model.joblib', 'preprocessor.joblib')
+            }
         }
-        joblib.dump(model_data, path)
+        with open(os.path.join(version_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        
+        # Switch the pointer atomically so readers see the old or new version, never a mix
+        tmp_pointer = os.path.join(path, f'{CURRENT_POINTER}.tmp')
+        with open(tmp_pointer, 'w') as f:
+            f.write(version)
+        os.replace(tmp_pointer, os.path.join(path, CURRENT_POINTER))
         
-    def load_model(self, path='models/trained_model.joblib'):
-        model_data = joblib.load(path)
-        self.model = model_data['model']
-        self.explainer = model_data['explainer']
-        self.preprocessor = model_data['preprocessor']
+        self.version = version
+        self._prune_versions(path, keep_versions)
+        return version_dir
+        
+    def load_model(self, path=DEFAULT_MODEL_PATH, mmap_mode='r'):
+        if os.path.isfile(path):
+            # Legacy single joblib blob
+            model_data = joblib.load(path)
+            self.model = model_data['model']
+            self._explainer = model_data.get('explainer')
+            self.preprocessor = model_data['preprocessor']
+            self.flat_forest = None
+            self.drift_snapshot = None
+            return self.preprocessor
+        
+        version_dir = resolve_version_dir(path)
+        manifest = read_manifest(version_dir)
+        if manifest['format_version'] > ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported model artifact format: {manifest['format_version']}")
+        
+        self.model = joblib.load(os.path.join(version_dir, 'model.joblib'), mmap_mode=mmap_mode)
+        self.preprocessor = joblib.load(os.path.join(version_dir, 'preprocessor.joblib'))
+        self._explainer = None
+        self.flat_forest = None
+        if manifest.get('flat_forest'):
+            self.flat_forest = FlatForest.load(os.path.join(version_dir, 'forest'), mmap_mode)
+        self.drift_snapshot = None
+        if manifest.get('drift_snapshot'):
+            with open(os.path.join(version_dir, 'drift_snapshot.json')) as f:
+                self.drift_snapshot = DriftSketch.from_dict(json.load(f))
+        self.metadata = manifest['training']
+        self.version = manifest['version']
         return self.preprocessor
         
+    @metrics.timed('predict')
     def predict(self, X):
         return self.model.predict(X)
         
+    @metrics.timed('explain_prediction')
     def explain_prediction(self, X):
         shap_values = self.explainer.shap_values(X)
-        return shap_values 
\ No newline at end of file
+        return shap_values
+    
+    def _prune_versions(self, path, keep_versions):
+        versions = sorted(
+            name for name in os.listdir(path)
+            if os.path.isfile(os.path.join(path, name, 'manifest.json'))
+        )
+        for name in versions[:-keep_versions]:
+            if name != self.version:
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+def resolve_version_dir(path=DEFAULT_MODEL_PATH):
+    with open(os.path.join(path, CURRENT_POINTER)) as f:
+        return os.path.join(path, f.read().strip())
+
+def read_manifest(version_dir):
+    with open(os.path.join(version_dir, 'manifest.json')) as f:
+        return json.load(f)
+
+def _input_schema(preprocessor):
+    schema = {}
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == 'num':
+            for column in columns:
+                schema[column] = {'type': 'numeric'}
+        elif name == 'cat':
+            encoder = transformer.named_steps['onehot']
+            for column, categories in zip(columns, encoder.categories_):
+                schema[column] = {'type': 'categorical',
+                                  'categories': [str(c) for c in categories]}
+        elif name == 'bool':
+            for column in columns:
+                schema[column] = {'type': 'boolean'}
+    return schema
+
+def _json_params(params):
+    return {k: v for k, v in params.items()
+            if v is None or isinstance(v, (bool, int, float, str))}
+
+def _sha256(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
@@ -0,0 +1,401 @@
+import atexit
+import collections
+import glob
+import json
+import os
+import re
+import struct
+import threading
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from src.data_processor import (NUMERIC_FEATURES, CATEGORICAL_FEATURES, BOOLEAN_FEATURES,
+                                CATEGORY_VOCABULARY)
+from src.drift_sketch import PSI_THRESHOLD, PRICE_QUANTILES
+from src.instrumentation import metrics
+
+DEFAULT_LOG_DIR = 'data/prediction_log'
+LOG_MAGIC = b'TPLOG1\n'
+
+# One fixed-size record per served quote (43 bytes): the model version is in
+# the segment header, categories are codes into CATEGORY_VOCABULARY (255 for
+# anything else) and the boolean features are bits of `flags`
+RECORD_DTYPE = np.dtype(
+    [('time', '<f8'), ('price', '<f4')]
+    + [(column, '<f4') for column in NUMERIC_FEATURES]
+    + [(column, 'u1') for column in CATEGORICAL_FEATURES]
+    + [('flags', 'u1')])
+UNKNOWN_CODE = 255
+
+# predictions-<time>-<pid>-<tag>-<sequence>.bin; group 1 is the writer
+SEGMENT_NAME = re.compile(r'predictions-[^-]+-((\d+)-\w+)-(\d+)\.bin$')
+
+_CATEGORY_CODES = {column: {value: code for code, value in enumerate(CATEGORY_VOCABULARY[column])}
+                   for column in CATEGORICAL_FEATURES}
+
+class PredictionLog:
+    # Append-only binary log of served quotes in size-capped segments. A new
+    # segment starts when the current one reaches max_segment_bytes (checked
+    # per written batch) or the model version changes; only the newest
+    # max_segments in log_dir are kept, so disk use is bounded too. The limit
+    # covers every process sharing log_dir and segments left by earlier
+    # runs; the oldest go first, but never a segment a live process is
+    # still writing.
+    def __init__(self, log_dir=DEFAULT_LOG_DIR, max_segment_bytes=64 * 2**20, max_segments=16):
+        self.log_dir = log_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self._file = None
+        self._version = None
+        self._bytes = 0
+        self._sequence = 0
+        # pid plus a random tag: a reused pid never appends to an old segment
+        self._writer = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        os.makedirs(log_dir, exist_ok=True)
+    
+    def write(self, model_version, records):
+        if self._file is None or model_version != self._version or \
+                self._bytes >= self.max_segment_bytes:
+            self._rotate(model_version)
+        payload = records.tobytes()
+        self._file.write(payload)
+        self._bytes += len(payload)
+    
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def _rotate(self, model_version):
+        self.close()
+        self._sequence += 1
+        name = f"predictions-{time.strftime('%Y%m%dT%H%M%S')}-{self._writer}-{self._sequence:06d}.bin"
+        header = json.dumps({
+            'model_version': model_version,
+            'dtype': RECORD_DTYPE.descr,
+            'categories': {column: CATEGORY_VOCABULARY[column] for column in CATEGORICAL_FEATURES},
+            'flags': BOOLEAN_FEATURES
+        }).encode('utf-8')
+        path = os.path.join(self.log_dir, name)
+        self._file = open(path, 'wb')
+        self._file.write(LOG_MAGIC + struct.pack('<I', len(header)) + header)
+        self._version = model_version
+        self._bytes = 0
+        self._prune()
+    
+    def _prune(self):
+        paths = segment_paths(self.log_dir)
+        excess = len(paths) - self.max_segments
+        if excess <= 0:
+            return
+        active = active_segments(paths)
+        for path in paths:
+            if excess <= 0:
+                break
+            if path in active:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            excess -= 1
+
+class PredictionMonitor:
+    # Served quotes are queued by the request thread and encoded, logged and
+    # folded into the live drift sketch by one background thread, so logging
+    # costs a deque append (atomic, no lock handoff). The writer blocks on an
+    # event while idle; producers only set it when the writer is waiting.
+    # When max_queue_size quotes are pending the quote is dropped and counted
+    # rather than slowing the request down.
+    #
+    # Drift is measured over tumbling windows of window_size quotes against
+    # the training snapshot saved with the model (trainer.drift_snapshot).
+    def __init__(self, log_dir=DEFAULT_LOG_DIR, max_queue_size=65_536, batch_size=4096,
+                 flush_interval=1.0, window_size=50_000, min_quotes=1000,
+                 threshold=PSI_THRESHOLD, **log_kwargs):
+        self.log = PredictionLog(log_dir, **log_kwargs) if log_dir is not None else None
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.window_size = window_size
+        self.min_quotes = min_quotes
+        self.threshold = threshold
+        self.dropped = 0
+        self.logged = 0
+        self._pending = collections.deque()
+        self._wakeup = threading.Event()
+        self._idle = False
+        self._lock = threading.Lock()
+        self._version = None
+        self._reference = None
+        self._window = None
+        self._previous = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name='prediction-monitor')
+        self._thread.start()
+    
+    def record(self, loaded, booking, price):
+        # loaded is the LoadedModel that produced the price
+        if len(self._pending) < self.max_queue_size:
+            self._pending.append((loaded, time.time(), booking, price))
+            if self._idle:
+                self._wakeup.set()
+        else:
+            self._drop(1)
+    
+    def record_many(self, loaded, bookings, prices):
+        now = time.time()
+        room = max(self.max_queue_size - len(self._pending), 0)
+        items = [(loaded, now, booking, price) for booking, price in zip(bookings, prices)]
+        self._pending.extend(items[:room])
+        if self._idle:
+            self._wakeup.set()
+        if len(items) > room:
+            self._drop(len(items) - room)
+    
+    @property
+    def queue_depth(self):
+        return len(self._pending)
+    
+    def drift_report(self):
+        with self._lock:
+            reference = self._reference
+            # The open window once it is big enough, else the last full one
+            live = self._window
+            if live is None or live.count < self.min_quotes:
+                live = self._previous or live
+            live = live.copy() if live is not None else None
+            version = self._version
+        report = {'model_version': version, 'logged': self.logged, 'dropped': self.dropped}
+        if reference is None:
+            report['status'] = 'no_snapshot' if version is not None else 'no_quotes'
+            return report
+        report['window_quotes'] = live.count
+        report['training_rows'] = reference.count
+        if live.count < self.min_quotes:
+            report['status'] = 'insufficient_data'
+            return report
+        
+        features = reference.compare(live, self.threshold)
+        drifted = [column for column, result in features.items() if result['drifted']]
+        for column, result in features.items():
+            metrics.set_gauge(f'drift_psi_{column}', result['psi'])
+        report.update({
+            'status': 'drift' if drifted else 'ok',
+            'drifted': drifted,
+            'features': features,
+            'price': {f'p{round(q * 100)}': {'training': reference.price.quantile(q),
+                                            'served': live.price.quantile(q)}
+                      for q in PRICE_QUANTILES}
+        })
+        return report
+    
+    def flush(self, timeout=10.0):
+        # Wait until everything queued so far is written (benchmarks, tests, shutdown)
+        done = threading.Event()
+        self._pending.append((None, None, None, done))
+        self._wakeup.set()
+        done.wait(timeout)
+    
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._pending.append(None)
+        self._wakeup.set()
+        self._thread.join()
+        if self.log is not None:
+            self.log.close()
+    
+    def _drop(self, n):
+        self.dropped += n
+        metrics.inc('prediction_log_dropped', n)
+    
+    def _run(self):
+        last_flush = time.monotonic()
+        unflushed = False
+        while True:
+            batch = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._pending.popleft())
+            except IndexError:
+                pass
+            if batch:
+                if self._process(batch):
+                    return
+                unflushed = True
+                continue
+            if unflushed and time.monotonic() - last_flush >= self.flush_interval:
+                self._flush_log()
+                last_flush = time.monotonic()
+                unflushed = False
+            # Sleep until a producer queues something (or the next due flush).
+            # _idle is set before re-checking the queue, so an append after
+            # the check always sees it and sets the event.
+            self._wakeup.clear()
+            self._idle = True
+            if not self._pending:
+                timeout = (max(self.flush_interval - (time.monotonic() - last_flush), 0)
+                           if unflushed else None)
+                self._wakeup.wait(timeout)
+            self._idle = False
+    
+    def _process(self, batch):
+        # Runs of quotes from the same model version are written together.
+        # Returns True once close() has been requested.
+        run = []
+        for item in batch:
+            if item is not None and item[0] is not None and (not run or item[0] is run[0][0]):
+                run.append(item)
+                continue
+            if run:
+                self._write(run)
+                run = []
+            if item is None:
+                self._flush_log()
+                return True
+            if item[0] is None:
+                # flush() marker
+                self._flush_log()
+                item[3].set()
+            else:
+                run = [item]
+        if run:
+            self._write(run)
+        return False
+    
+    def _flush_log(self):
+        if self.log is not None:
+            self.log.flush()
+    
+    def _write(self, items):
+        loaded = items[0][0]
+        with metrics.span('prediction_log_write'):
+            try:
+                records = encode_quotes(items)
+            except Exception:
+                metrics.inc('prediction_log_errors')
+                return
+            self._update(loaded, records)
+        self.logged += len(records)
+        metrics.inc('prediction_log_records', len(records))
+    
+    def _update(self, loaded, records):
+        if self.log is not None:
+            self.log.write(loaded.version, records)
+        with self._lock:
+            if loaded.version != self._version:
+                self._start_version(loaded)
+            if self._reference is not None:
+                self._window.update_columns(*record_columns(records))
+                if self._window.count >= self.window_size:
+                    self._previous, self._window = self._window, self._reference.empty_like()
+    
+    def _start_version(self, loaded):
+        self._version = loaded.version
+        self._reference = getattr(loaded.trainer, 'drift_snapshot', None)
+        self._window = self._reference.empty_like() if self._reference is not None else None
+        self._previous = None
+
+def encode_quotes(items):
+    # (loaded, time, booking, price) tuples -> RECORD_DTYPE array
+    records = np.empty(len(items), dtype=RECORD_DTYPE)
+    records['time'] = [item[1] for item in items]
+    records['price'] = [item[3] for item in items]
+    bookings = [item[2] for item in items]
+    for column in NUMERIC_FEATURES:
+        records[column] = [float(booking[column]) for booking in bookings]
+    for column in CATEGORICAL_FEATURES:
+        codes = _CATEGORY_CODES[column]
+        records[column] = [codes.get(booking[column], UNKNOWN_CODE) for booking in bookings]
+    flags = np.zeros(len(items), dtype=np.uint8)
+    for bit, column in enumerate(BOOLEAN_FEATURES):
+        flags |= np.array([bool(booking[column]) for booking in bookings], dtype=np.uint8) << bit
+    records['flags'] = flags
+    return records
+
+def record_columns(records):
+    # Arguments for DriftSketch.update_columns
+    return ({column: records[column].astype(np.float64) for column in NUMERIC_FEATURES},
+            {column: records[column] for column in CATEGORICAL_FEATURES},
+            {column: (records['flags'] >> bit) & 1 for bit, column in enumerate(BOOLEAN_FEATURES)},
+            records['price'])
+
+def segment_paths(log_dir=DEFAULT_LOG_DIR):
+    # Oldest first
+    return sorted(glob.glob(os.path.join(log_dir, 'predictions-*.bin')), key=lambda path: (os.path.getmtime(path), path))
+
+def active_segments(paths):
+    # The newest segment of each writer whose process is still running
+    newest = {}
+    for path in paths:
+        match = SEGMENT_NAME.match(os.path.basename(path))
+        if match is None:
+            continue
+        writer, sequence = match.group(1), int(match.group(3))
+        if writer not in newest or sequence > newest[writer][0]:
+            newest[writer] = (sequence, path, int(match.group(2)))
+    return {path for _, path, pid in newest.values() if _process_running(pid)}
+
+def _process_running(pid):
+    if os.name != 'posix':
+        # No cheap liveness check (os.kill would terminate it): assume running
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def read_segment(path):
+    # Returns (header, records); a record cut short by a crash is ignored
+    with open(path, 'rb') as f:
+        if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{path} is not a prediction log segment")
+        (length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(length))
+        offset = f.tell()
+    dtype = np.dtype([tuple(field) for field in header['dtype']])
+    n = (os.path.getsize(path) - offset) // dtype.itemsize
+    return header, np.fromfile(path, dtype=dtype, count=n, offset=offset)
+
+def read_prediction_log(log_dir=DEFAULT_LOG_DIR):
+    # Decode every kept segment into one DataFrame of served quotes
+    frames = []
+    for path in segment_paths(log_dir):
+        header, records = read_segment(path)
+        frame = pd.DataFrame({'time': pd.to_datetime(records['time'], unit='s'),
+                              'model_version': header['model_version'],
+                              'price': records['price']})
+        for column in NUMERIC_FEATURES:
+            frame[column] = records[column]
+        for column, categories in header['categories'].items():
+            codes = records[column].astype(np.int16)
+            frame[column] = pd.Categorical.from_codes(
+                np.where(codes == UNKNOWN_CODE, -1, codes), categories=categories)
+        for bit, column in enumerate(header['flags']):
+            frame[column] = ((records['flags'] >> bit) & 1).astype(bool)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=['time', 'model_version', 'price'])
+    return pd.concat(frames, ignore_index=True)
+
+_default_monitor = None
+_default_monitor_lock = threading.Lock()
+
+def get_prediction_monitor(log_dir=DEFAULT_LOG_DIR):
+    # Process-wide monitor shared by every session and service thread
+    global _default_monitor
+    with _default_monitor_lock:
+        if _default_monitor is None:
+            _default_monitor = PredictionMonitor(log_dir)
+            atexit.register(_default_monitor.close)
+        return _default_monitor
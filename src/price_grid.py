@@ -0,0 +1,182 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from src.instrumentation import metrics
+
+DEFAULT_GRID_PATH = 'models/price_grid'
+
+# Continuous features keyed into equal-width buckets over these ranges; the
+# grid holds the model's price at each bucket's center
+BUCKET_RANGES = {
+    'historical_demand': (0.0, 1.0)
+}
+DEFAULT_DEMAND_BUCKETS = 5
+
+def bucket_centers(column, n):
+    low, high = BUCKET_RANGES[column]
+    return [low + (high - low) * (i + 0.5) / n for i in range(n)]
+
+# Numeric features are enumerated over these values. The remaining inputs
+# match the defaults app.py uses for quotes.
+DEFAULT_NUMERIC_AXES = {
+    'duration': [1, 1.5, 2, 2.5, 3],
+    'num_players': [2, 4],
+    'booking_lead_time': [0],
+    'historical_demand': bucket_centers('historical_demand', DEFAULT_DEMAND_BUCKETS),
+    'temperature': [20],
+    'precipitation_chance': [0]
+}
+
+class PriceGrid:
+    def __init__(self, axes, prices, model_version=None, bin_numeric=False):
+        # axes: ordered list of (column, values, kind); kind is 'numeric',
+        # 'bucket' (values are bucket centers, see BUCKET_RANGES) or 'exact'
+        self.axes = axes
+        self.prices = prices
+        self.model_version = model_version
+        self.bin_numeric = bin_numeric
+        
+        sizes = [len(values) for _, values, _ in axes]
+        self.strides = [int(np.prod(sizes[i + 1:], dtype=np.int64)) for i in range(len(sizes))]
+        self._index_maps = [{value: i for i, value in enumerate(values)} for _, values, _ in axes]
+        self._numeric_values = [np.asarray(values, dtype=float) if kind == 'numeric' else None
+                                for _, values, kind in axes]
+        
+    @classmethod
+    def build(cls, loaded, numeric_axes=None, bin_numeric=False, batch_size=200_000):
+        # Enumerate every configuration and price it in large batches
+        numeric_axes = dict(DEFAULT_NUMERIC_AXES, **(numeric_axes or {}))
+        axes = cls._make_axes(loaded.processor.preprocessor, numeric_axes)
+        
+        sizes = [len(values) for _, values, _ in axes]
+        total = int(np.prod(sizes, dtype=np.int64))
+        prices = np.empty(total, dtype=np.float64)
+        
+        for start in range(0, total, batch_size):
+            keys = np.arange(start, min(start + batch_size, total))
+            indices = np.unravel_index(keys, sizes)
+            batch = pd.DataFrame({
+                column: np.asarray(values, dtype=object)[idx]
+                for (column, values, _), idx in zip(axes, indices)
+            })
+            X = loaded.processor.preprocessor.transform(batch)
+            prices[start:start + len(keys)] = loaded.trainer.predict(X)
+        
+        return cls(axes, prices, model_version=loaded.version, bin_numeric=bin_numeric)
+    
+    @staticmethod
+    def _make_axes(preprocessor, numeric_axes):
+        axes = []
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == 'num':
+                for column in columns:
+                    kind = 'bucket' if column in BUCKET_RANGES else 'numeric'
+                    axes.append((column, list(numeric_axes[column]), kind))
+            elif name == 'cat':
+                encoder = transformer.named_steps['onehot']
+                for column, categories in zip(columns, encoder.categories_):
+                    axes.append((column, [str(c) for c in categories], 'exact'))
+            elif name == 'bool':
+                for column in columns:
+                    axes.append((column, [False, True], 'exact'))
+        return axes
+    
+    def key(self, booking):
+        # Packed mixed-radix integer for a booking, or None when it is off-grid
+        key = 0
+        for i, (column, _, kind) in enumerate(self.axes):
+            value = booking[column]
+            if kind == 'bucket':
+                index = self._bucket(i, value)
+            else:
+                index = self._index_maps[i].get(value)
+            if index is None and kind == 'numeric' and self.bin_numeric:
+                index = self._snap(i, value)
+            if index is None:
+                return None
+            key += index * self.strides[i]
+        return key
+    
+    def lookup(self, booking):
+        key = self.key(booking)
+        if key is None:
+            return None
+        return float(self.prices[key])
+    
+    def _bucket(self, i, value):
+        # Equal-width bucket holding value, or None outside the bucketed range
+        low, high = BUCKET_RANGES[self.axes[i][0]]
+        value = float(value)
+        if not low <= value <= high:
+            return None
+        n = len(self.axes[i][1])
+        return min(int((value - low) / (high - low) * n), n - 1)
+    
+    def _snap(self, i, value):
+        # Nearest grid value, but only inside the enumerated range
+        values = self._numeric_values[i]
+        value = float(value)
+        if value < values.min() or value > values.max():
+            return None
+        return int(np.abs(values - value).argmin())
+    
+    def save(self, path=DEFAULT_GRID_PATH):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'prices.npy'), self.prices)
+        meta = {
+            'model_version': self.model_version,
+            'bin_numeric': self.bin_numeric,
+            'axes': [[column, values, kind] for column, values, kind in self.axes]
+        }
+        with open(os.path.join(path, 'grid.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+    
+    @classmethod
+    def load(cls, path=DEFAULT_GRID_PATH, mmap_mode='r'):
+        with open(os.path.join(path, 'grid.json')) as f:
+            meta = json.load(f)
+        prices = np.load(os.path.join(path, 'prices.npy'), mmap_mode=mmap_mode)
+        axes = [(column, values, kind) for column, values, kind in meta['axes']]
+        return cls(axes, prices, model_version=meta['model_version'],
+                   bin_numeric=meta['bin_numeric'])
+
+class GridPricer:
+    # O(1) grid lookup with the live model as fallback for off-grid bookings
+    def __init__(self, grid, loaded):
+        if grid.model_version != loaded.version:
+            raise ValueError(
+                f"Price grid was built for model {grid.model_version}, "
+                f"but model {loaded.version} is loaded"
+            )
+        self.grid = grid
+        self.loaded = loaded
+        self.hits = 0
+        self.misses = 0
+    
+    @classmethod
+    def for_loaded(cls, loaded, path=DEFAULT_GRID_PATH):
+        # The grid built for this model version, or None (no grid, or a stale one)
+        if not os.path.exists(os.path.join(path, 'grid.json')):
+            return None
+        grid = PriceGrid.load(path)
+        if grid.model_version != loaded.version:
+            return None
+        return cls(grid, loaded)
+    
+    def lookup(self, booking):
+        # Grid price, or None when the booking is off-grid
+        price = self.grid.lookup(booking)
+        if price is None:
+            self.misses += 1
+            metrics.inc('price_grid_misses')
+        else:
+            self.hits += 1
+            metrics.inc('price_grid_hits')
+        return price
+    
+    def price(self, booking):
+        price = self.lookup(booking)
+        if price is None:
+            return self.loaded.fast_pricer.price(booking)
+        return price
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from src.model_registry import get_registry
+from src.model_trainer import DEFAULT_MODEL_PATH
+from src.instrumentation import metrics
+
+class PricingEngine:
+    def __init__(self, trainer, processor, batch_size=50_000, n_jobs=-1):
+        self.trainer = trainer
+        self.processor = processor
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        
+    @classmethod
+    def from_registry(cls, path=DEFAULT_MODEL_PATH, **kwargs):
+        loaded = get_registry().get(path)
+        return cls(loaded.trainer, loaded.processor, **kwargs)
+    
+    def price(self, requests):
+        # Accepts a DataFrame, a pyarrow Table, a NumPy record array or a dict of columns
+        df = self._to_frame(requests)
+        prices = np.empty(len(df), dtype=np.float64)
+        
+        for start in range(0, len(df), self.batch_size):
+            stop = min(start + self.batch_size, len(df))
+            prices[start:stop] = self._price_batch(df.iloc[start:stop])
+        
+        return prices
+    
+    def price_frame(self, requests):
+        df = self._to_frame(requests).copy()
+        df['price'] = self.price(df)
+        return df
+    
+    @metrics.timed('price_batch')
+    def _price_batch(self, batch):
+        X = self.processor.preprocessor.transform(batch)
+        
+        # Threads split the rows, not the trees: each row then sums the trees
+        # in model.predict's order, so prices match it exactly for any n_jobs
+        # (tree-parallel predict reorders the sum and can differ in the last bit)
+        n_jobs = min(effective_n_jobs(self.n_jobs), len(X))
+        if n_jobs <= 1:
+            return self.trainer.predict(X)
+        parts = Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(self.trainer.predict)(rows) for rows in np.array_split(X, n_jobs))
+        return np.concatenate(parts)
+    
+    def _to_frame(self, requests):
+        if isinstance(requests, pd.DataFrame):
+            df = requests
+        elif hasattr(requests, 'to_pandas'):
+            df = requests.to_pandas()
+        elif isinstance(requests, np.ndarray) and requests.dtype.names:
+            df = pd.DataFrame.from_records(requests)
+        else:
+            df = pd.DataFrame(requests)
+        
+        missing = set(self.processor.input_columns) - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing booking columns: {sorted(missing)}")
+        
+        # Only the columns the preprocessor reads are carried into each batch
+        return df[self.processor.input_columns]
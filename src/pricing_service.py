@@ -0,0 +1,240 @@
+import json
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from src.batching import MicroBatcher, QueueFullError
+from src.data_generator import MONTH_SEASONS
+from src.demand_index import get_demand_index
+from src.explanations import EXPLANATION_MODES
+from src.instrumentation import metrics
+from src.model_registry import get_registry
+from src.model_trainer import DEFAULT_MODEL_PATH
+from src.prediction_monitor import get_prediction_monitor
+
+class RequestError(ValueError):
+    pass
+
+class PricingService:
+    # Headless pricing over the shared model: requests are encoded on the
+    # calling thread and concurrent ones are scored in a single predict call
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, max_batch_size=64, max_wait_ms=2.0,
+                 max_queue_size=1024, workers=1, latency_budget_ms=None,
+                 request_timeout_ms=30_000, log_predictions=True):
+        self.model_path = model_path
+        self.registry = get_registry()
+        batching = dict(max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                        max_queue_size=max_queue_size, workers=workers,
+                        latency_budget_ms=latency_budget_ms, timeout_ms=request_timeout_ms)
+        self.batcher = MicroBatcher(self._predict_batch, name='predict', **batching)
+        self.explain_batcher = MicroBatcher(self._explain_batch, name='explain', **batching)
+        # Load once at startup rather than on the first request
+        self.registry.get(model_path)
+        self.demand_index = get_demand_index()
+        # Every served quote goes to the prediction log and drift monitor
+        self.monitor = get_prediction_monitor() if log_predictions else None
+        
+    def price(self, booking):
+        loaded, booking, features = self._encode(booking)
+        # Precomputed grid first; off-grid quotes are scored by the live model
+        price = loaded.grid_pricer.lookup(booking) if loaded.grid_pricer else None
+        if price is None:
+            price = self.batcher((loaded, features))
+        if self.monitor is not None:
+            self.monitor.record(loaded, booking, price)
+        return loaded, features, price
+    
+    def price_batch(self, bookings):
+        # Large client batches skip the batcher and go straight to the model
+        loaded = self.registry.get(self.model_path)
+        X = np.empty((len(bookings), loaded.fast_pricer.compiled.n_features))
+        bookings = [self._encode_into(loaded, booking, X[i]) for i, booking in enumerate(bookings)]
+        with metrics.span('service_batch_predict'):
+            prices = loaded.fast_pricer.predict_matrix(X)
+        if self.monitor is not None:
+            self.monitor.record_many(loaded, bookings, prices)
+        return loaded, prices
+    
+    def explain(self, booking, mode='exact', top_k=10):
+        if mode not in EXPLANATION_MODES:
+            raise RequestError(f"mode must be one of {list(EXPLANATION_MODES)}")
+        if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
+            raise RequestError(f"top_k must be a positive integer, got {top_k!r}")
+        loaded, features, price = self.price(booking)
+        values = self.explain_batcher((loaded, features, mode))
+        return loaded, price, loaded.explanations.top_features(values, k=top_k)
+    
+    def record_booking(self, booking):
+        booking = complete_booking(booking)
+        try:
+            self.demand_index.record(booking)
+        except KeyError as e:
+            raise RequestError(f"Missing booking field: {e.args[0]}")
+        except (TypeError, ValueError) as e:
+            raise RequestError(str(e))
+    
+    def close(self):
+        self.batcher.close()
+        self.explain_batcher.close()
+    
+    def _encode(self, booking):
+        loaded = self.registry.get(self.model_path)
+        features = np.empty(loaded.fast_pricer.compiled.n_features)
+        booking = self._encode_into(loaded, booking, features)
+        return loaded, booking, features
+    
+    def _encode_into(self, loaded, booking, out):
+        # Returns the completed booking
+        booking = complete_booking(booking, self.demand_index)
+        try:
+            loaded.fast_pricer.compiled.transform_into(booking, out)
+        except KeyError as e:
+            raise RequestError(f"Missing booking field: {e.args[0]}")
+        except (TypeError, ValueError) as e:
+            raise RequestError(str(e))
+        return booking
+    
+    def _predict_batch(self, items):
+        # Requests encoded against different model versions are scored separately
+        prices = [None] * len(items)
+        groups = {}
+        for i, (loaded, features) in enumerate(items):
+            groups.setdefault(id(loaded), (loaded, []))[1].append(i)
+        for loaded, indices in groups.values():
+            X = np.vstack([items[i][1] for i in indices])
+            with metrics.span('service_batch_predict'):
+                predictions = loaded.fast_pricer.predict_matrix(X)
+            for i, price in zip(indices, predictions):
+                prices[i] = float(price)
+        return prices
+    
+    def _explain_batch(self, items):
+        # One SHAP call per (model version, mode) group
+        values = [None] * len(items)
+        groups = {}
+        for i, (loaded, _, mode) in enumerate(items):
+            groups.setdefault((id(loaded), mode), (loaded, mode, []))[2].append(i)
+        for loaded, mode, indices in groups.values():
+            X = np.vstack([items[i][1] for i in indices])
+            for i, row in zip(indices, loaded.explanations.explain_batch(X, mode=mode)):
+                values[i] = row
+        return values
+
+def complete_booking(booking, demand_index=None):
+    # Derive day_of_week/season from booking_date when the caller leaves them out,
+    # and historical_demand from the demand index
+    if not isinstance(booking, dict):
+        raise RequestError("booking must be a JSON object")
+    if 'booking_date' in booking and ('day_of_week' not in booking or 'season' not in booking):
+        try:
+            date = datetime.fromisoformat(str(booking['booking_date']))
+        except ValueError:
+            raise RequestError("booking_date must be an ISO date")
+        booking = dict(booking)
+        booking.setdefault('day_of_week', date.strftime('%A'))
+        booking.setdefault('season', MONTH_SEASONS[date.month])
+    if demand_index is not None and 'historical_demand' not in booking:
+        try:
+            demand = demand_index.demand(booking)
+        except KeyError as e:
+            raise RequestError(f"Missing booking field: {e.args[0]}")
+        except (TypeError, ValueError) as e:
+            raise RequestError(str(e))
+        booking = dict(booking)
+        booking['historical_demand'] = demand
+    return booking
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_GET(self):
+            if self.path == '/health':
+                loaded = service.registry.get(service.model_path)
+                self._send(200, {'status': 'ok', 'model_version': loaded.version})
+            elif self.path == '/metrics':
+                self._send_text(200, metrics.render_prometheus())
+            elif self.path == '/drift' and service.monitor is not None:
+                self._send(200, service.monitor.drift_report())
+            else:
+                self._send(404, {'error': 'not found'})
+        
+        def do_POST(self):
+            try:
+                body = self._read_json()
+                if self.path == '/price':
+                    with metrics.span('service_price'):
+                        loaded, _, price = service.price(body.get('booking', body))
+                    self._send(200, {'price': price, 'model_version': loaded.version})
+                elif self.path == '/price/batch':
+                    bookings = body.get('bookings')
+                    if not isinstance(bookings, list):
+                        raise RequestError("expected {\"bookings\": [...]}")
+                    with metrics.span('service_price_batch'):
+                        loaded, prices = service.price_batch(bookings)
+                    self._send(200, {'prices': prices.tolist(), 'model_version': loaded.version})
+                elif self.path == '/bookings':
+                    service.record_booking(body.get('booking', body))
+                    self._send(200, {'recorded': True,
+                                     'events': service.demand_index.events})
+                elif self.path == '/explain':
+                    with metrics.span('service_explain'):
+                        loaded, price, top = service.explain(
+                            body.get('booking', body), body.get('mode', 'exact'),
+                            body.get('top_k', 10))
+                    self._send(200, {
+                        'price': price, 'model_version': loaded.version,
+                        'top_features': [{'feature': name, 'shap_value': value}
+                                         for name, value in top]
+                    })
+                else:
+                    self._send(404, {'error': 'not found'})
+            except RequestError as e:
+                self._send(400, {'error': str(e)})
+            except QueueFullError as e:
+                # Backpressure: ask clients to retry instead of queueing without bound
+                self._send(503, {'error': str(e)})
+            except TimeoutError:
+                metrics.inc('service_timeouts')
+                self._send(504, {'error': 'timed out waiting for the model'})
+            except Exception as e:
+                metrics.inc('service_errors')
+                self._send(500, {'error': str(e)})
+        
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length', 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b'{}')
+            except json.JSONDecodeError:
+                raise RequestError("request body must be JSON")
+            if not isinstance(body, dict):
+                raise RequestError("request body must be a JSON object")
+            return body
+        
+        def _send(self, status, payload):
+            self._send_bytes(status, json.dumps(payload).encode('utf-8'), 'application/json')
+        
+        def _send_text(self, status, text):
+            self._send_bytes(status, text.encode('utf-8'), 'text/plain; version=0.0.4')
+        
+        def _send_bytes(self, status, payload, content_type):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return Handler
+
+class PricingHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The stdlib default backlog of 5 drops connections under bursty load
+    request_queue_size = 256
+
+def create_server(host='127.0.0.1', port=8000, **service_kwargs):
+    service = PricingService(**service_kwargs)
+    server = PricingHTTPServer((host, port), make_handler(service))
+    server.service = service
+    return server
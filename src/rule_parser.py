@@ -0,0 +1,192 @@
+import re
+
+# Fields the extraction prompt asks for, with their allowed values
+BOOKING_SCHEMA = {
+    'duration': {'type': 'number', 'min': 0.5, 'max': 8},
+    'court_surface': {'type': 'choice', 'values': ['Hard', 'Clay', 'Grass', 'Carpet']},
+    'court_type': {'type': 'choice', 'values': ['Indoor', 'Outdoor']},
+    'num_players': {'type': 'choice', 'values': [2, 4]},
+    'match_type': {'type': 'choice', 'values': ['Singles', 'Doubles', 'Training']},
+    'coaching_requested': {'type': 'boolean'},
+    'ball_machine': {'type': 'boolean'},
+    'court_quality': {'type': 'choice', 'values': ['Standard', 'Premium', 'Elite']}
+}
+
+# Fields that must be found, unambiguously, to skip the LLM
+REQUIRED_FIELDS = ('duration',)
+
+KEYWORDS = {
+    'court_surface': {
+        'Hard': r'hard(?:\s*court)?', 'Clay': r'clay', 'Grass': r'grass', 'Carpet': r'carpet'
+    },
+    'court_type': {
+        'Indoor': r'indoors?|inside|covered', 'Outdoor': r'outdoors?|outside|open[- ]air'
+    },
+    'court_quality': {
+        'Standard': r'standard|basic|regular', 'Premium': r'premium', 'Elite': r'elite'
+    },
+    'match_type': {
+        'Singles': r'singles?', 'Doubles': r'doubles?',
+        'Training': r'training|practi[cs]e|drills?|lessons?'
+    }
+}
+
+NUMBER_WORDS = {
+    'one': 1, 'an': 1, 'a': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5
+}
+
+# A mention right after one of these is negated ("not premium", "without a coach")
+NEGATED = re.compile(r'\b(?:no|not|without|(?:don\'t|do not) (?:need|want))\s+'
+                     r'(?:(?:on|in|for|with)\s+)?(?:an?\s+|the\s+)?$')
+COACHING = r'coach(?:ing|es)?|instructor|lessons?|pro\b'
+BALL_MACHINE = r'ball[- ]?machine'
+
+# Halves and fractions are rewritten to decimals before the duration
+# patterns run, so "half an hour" can't match as "an hour" or "1/2 hour" as "2 hour"
+MIXED_FRACTION = re.compile(r'(\d+)\s*(?:1/2|½)')
+AND_A_HALF = re.compile(r'\b(\d+|one|two|three|four|five)\s+and\s+a\s+half\s+(?=hours?\b|hrs?\b)')
+HALF = re.compile(r'(?<![\w/])(?:1/2|½|half(?:\s+an?)?)\s*(?=hours?\b|hrs?\b|h\b)')
+
+DURATION_PATTERNS = [
+    (re.compile(r'(\d+(?:\.\d+)?)\s*(?:-\s*)?(?:hours?|hrs?|h)\b'), 1.0),
+    (re.compile(r'(\d+)\s*(?:-\s*)?(?:minutes?|mins?)\b'), 1 / 60),
+    (re.compile(r'\b(one|two|three|four|five|an|a)\s+(?:-\s*)?hours?\b'), 1.0)
+]
+HALF_HOUR = re.compile(r'\s*and a half\b')
+PLAYERS = re.compile(r'\b(\d|two|four)\s+(?:players?|people|persons?)\b')
+
+class ParseResult:
+    def __init__(self, fields, confidence, ambiguous):
+        self.fields = fields
+        self.confidence = confidence
+        self.ambiguous = ambiguous
+        
+    def needs_llm(self, required_fields=REQUIRED_FIELDS, min_confidence=0.5):
+        if self.ambiguous:
+            return True
+        return any(self.confidence.get(field, 0.0) < min_confidence
+                   for field in required_fields)
+
+class RuleBasedBookingParser:
+    # Deterministic keyword/regex extractor returning the LLM prompt's JSON schema.
+    # Confidence is 1.0 for a single explicit mention, 0.6 when a field is
+    # inferred from another one (e.g. players from match type). Negated
+    # mentions ("not premium") never set a field; mentions that contradict
+    # each other make it ambiguous.
+    def __init__(self):
+        self._keywords = {
+            field: [(value, re.compile(rf'\b(?:{pattern})\b')) for value, pattern in options.items()]
+            for field, options in KEYWORDS.items()
+        }
+        self._coaching = re.compile(rf'\b(?:{COACHING})')
+        self._ball_machine = re.compile(rf'\b{BALL_MACHINE}\b')
+        
+    def parse(self, text):
+        text = text.lower()
+        fields, confidence, ambiguous = {}, {}, set()
+        
+        for field, options in self._keywords.items():
+            found = []
+            for value, pattern in options:
+                negated = self._negations(pattern.finditer(text), text)
+                if False in negated:
+                    found.append(value)
+                    if True in negated:
+                        ambiguous.add(field)
+            if field == 'match_type' and len(found) == 2 and 'Training' in found:
+                # "singles training" is a training session for singles players
+                found = ['Training']
+                confidence[field] = 0.6
+            if len(found) == 1:
+                fields[field] = found[0]
+                confidence.setdefault(field, 1.0)
+            elif len(found) > 1:
+                ambiguous.add(field)
+        
+        durations = self._durations(text)
+        if len(durations) == 1:
+            fields['duration'] = durations.pop()
+            confidence['duration'] = 1.0
+        elif len(durations) > 1:
+            ambiguous.add('duration')
+        
+        players = {self._number(m.group(1)) for m in PLAYERS.finditer(text)
+                   if not self._negated(text, m.start())}
+        if len(players) == 1 and players <= {2, 4}:
+            fields['num_players'] = players.pop()
+            confidence['num_players'] = 1.0
+        elif players:
+            ambiguous.add('num_players')
+        elif fields.get('match_type') in ('Singles', 'Doubles'):
+            fields['num_players'] = 4 if fields['match_type'] == 'Doubles' else 2
+            confidence['num_players'] = 0.6
+        
+        for field, pattern in (('coaching_requested', self._coaching),
+                               ('ball_machine', self._ball_machine)):
+            negated = self._negations(pattern.finditer(text), text)
+            if len(negated) == 1:
+                fields[field] = not negated.pop()
+                confidence[field] = 1.0
+            elif negated:
+                ambiguous.add(field)
+        
+        # Keep the prompt's field order
+        fields = {field: fields[field] for field in BOOKING_SCHEMA if field in fields}
+        return ParseResult(fields, confidence, ambiguous)
+    
+    def _durations(self, text):
+        text = MIXED_FRACTION.sub(lambda m: f'{m.group(1)}.5', text)
+        text = AND_A_HALF.sub(lambda m: f'{self._number(m.group(1)) + 0.5} ', text)
+        text = HALF.sub('0.5 ', text)
+        durations = set()
+        for pattern, unit in DURATION_PATTERNS:
+            for match in pattern.finditer(text):
+                if self._negated(text, match.start()):
+                    continue
+                hours = self._number(match.group(1)) * unit
+                if unit == 1.0 and HALF_HOUR.match(text, match.end()):
+                    hours += 0.5
+                durations.add(round(hours * 2) / 2)
+        return {d for d in durations if d > 0}
+    
+    def _negated(self, text, start):
+        return NEGATED.search(text, max(0, start - 30), start) is not None
+    
+    def _negations(self, matches, text):
+        # Set of negated flags over a pattern's mentions (empty when unmentioned)
+        return {self._negated(text, match.start()) for match in matches}
+    
+    def _number(self, token):
+        if token in NUMBER_WORDS:
+            return NUMBER_WORDS[token]
+        value = float(token)
+        return int(value) if value.is_integer() else value
+
+def validate_booking_fields(fields):
+    # Check an extracted dict against BOOKING_SCHEMA; returns a cleaned copy
+    if not isinstance(fields, dict):
+        raise ValueError(f"Expected a JSON object, got {type(fields).__name__}")
+    
+    cleaned = {}
+    for field, value in fields.items():
+        spec = BOOKING_SCHEMA.get(field)
+        if spec is None or value is None:
+            continue
+        if spec['type'] == 'boolean':
+            if isinstance(value, str) and value.lower() in ('true', 'false'):
+                value = value.lower() == 'true'
+            if not isinstance(value, bool):
+                raise ValueError(f"{field} must be true/false, got {value!r}")
+        elif spec['type'] == 'number':
+            value = float(value)
+            if not spec['min'] <= value <= spec['max']:
+                raise ValueError(f"{field} out of range: {value}")
+        else:
+            if field == 'num_players':
+                value = int(value)
+            elif isinstance(value, str):
+                value = value.strip().title()
+            if value not in spec['values']:
+                raise ValueError(f"{field} must be one of {spec['values']}, got {value!r}")
+        cleaned[field] = value
+    return cleaned
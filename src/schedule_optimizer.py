@@ -0,0 +1,140 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.data_generator import SURFACE_TYPES, COURT_TYPES, COURT_QUALITY, MONTH_SEASONS
+from src.demand_index import get_demand_index
+from src.instrumentation import metrics
+from src.model_registry import get_registry
+from src.model_trainer import DEFAULT_MODEL_PATH
+
+DEFAULT_OPEN_HOURS = list(range(7, 22))
+DEFAULT_DURATIONS = [1.0]
+
+# Posted price as a multiple of the model's price for the slot
+DEFAULT_PRICE_MULTIPLIERS = np.round(np.arange(0.7, 1.5001, 0.05), 2)
+
+# Fixed inputs for posted prices: a plain two-player booking with no extras
+SLOT_DEFAULTS = {
+    'court_lighting': False,
+    'num_players': 2,
+    'match_type': 'Singles',
+    'equipment_rental': False,
+    'coaching_requested': False,
+    'ball_machine': False,
+    'refreshments': False,
+    'temperature': 20,
+    'precipitation_chance': 0,
+    'special_requests': False
+}
+
+SCHEDULE_COLUMNS = ['court_id', 'court_surface', 'court_type', 'court_quality',
+                    'booking_date', 'booking_time', 'day_of_week', 'duration',
+                    'historical_demand', 'model_price', 'price_multiplier', 'price',
+                    'booking_probability', 'expected_revenue']
+
+class DemandCurve:
+    # Probability that a slot sells at a posted price, as a logistic fall-off
+    # around a reservation price (relative to the model's price). Busier
+    # slots have a higher reservation price, so revenue peaks at a higher
+    # multiplier there.
+    def __init__(self, steepness=6.0, reservation=0.9, demand_weight=0.4):
+        self.steepness = steepness
+        self.reservation = reservation
+        self.demand_weight = demand_weight
+    
+    def booking_probability(self, demand, price_ratio):
+        reservation = self.reservation + self.demand_weight * np.asarray(demand)
+        return 1.0 / (1.0 + np.exp(self.steepness * (np.asarray(price_ratio) - reservation)))
+
+def make_courts(n):
+    # n courts cycling through every surface/type/quality combination
+    combos = list(itertools.product(SURFACE_TYPES, COURT_TYPES, COURT_QUALITY))
+    return [dict(zip(['court_surface', 'court_type', 'court_quality'], combos[i % len(combos)]),
+                 court_id=f'court_{i + 1}')
+            for i in range(n)]
+
+def build_schedule(courts, start=None, days=7, open_hours=None, durations=None,
+                   demand_index=None):
+    # One row per (court, slot, duration), courts outermost so each court is contiguous
+    start = pd.Timestamp(start or pd.Timestamp.now()).normalize()
+    open_hours = DEFAULT_OPEN_HOURS if open_hours is None else open_hours
+    durations = DEFAULT_DURATIONS if durations is None else durations
+    demand_index = demand_index or get_demand_index()
+    
+    slot_starts = (start + pd.to_timedelta(np.repeat(np.arange(days), len(open_hours)), unit='D')
+                   + pd.to_timedelta(np.tile(open_hours, days), unit='h'))
+    courts = pd.DataFrame(courts)
+    if 'court_id' not in courts:
+        courts['court_id'] = [f'court_{i + 1}' for i in range(len(courts))]
+    
+    n_slots, n_durations = len(slot_starts), len(durations)
+    rows_per_court = n_slots * n_durations
+    df = courts.loc[np.repeat(courts.index, rows_per_court)].reset_index(drop=True)
+    booking_date = np.tile(np.repeat(slot_starts.to_numpy(), n_durations), len(courts))
+    dates = pd.DatetimeIndex(booking_date)
+    df['booking_date'] = booking_date
+    df['booking_time'] = dates.strftime('%H:%M')
+    df['duration'] = np.tile(np.asarray(durations, dtype=float), n_slots * len(courts))
+    df['day_of_week'] = dates.day_name()
+    df['season'] = MONTH_SEASONS[dates.month.to_numpy()]
+    df['booking_lead_time'] = (dates.normalize() - pd.Timestamp.now().normalize()).days
+    for column, value in SLOT_DEFAULTS.items():
+        if column not in df:
+            df[column] = value
+    # Lights on for evening slots unless the court says otherwise
+    df['court_lighting'] = df['court_lighting'] | (dates.hour >= 18)
+    df['historical_demand'] = demand_index.demand_frame(df)
+    return df
+
+def optimize_schedule(courts, start=None, days=7, open_hours=None, durations=None,
+                      multipliers=None, curve=None, n_jobs=None, model_path=DEFAULT_MODEL_PATH):
+    # Revenue-maximizing posted price (and duration) for every court slot
+    multipliers = DEFAULT_PRICE_MULTIPLIERS if multipliers is None else np.asarray(multipliers)
+    durations = DEFAULT_DURATIONS if durations is None else durations
+    curve = curve or DemandCurve()
+    
+    with metrics.span('schedule_build'):
+        schedule = build_schedule(courts, start, days, open_hours, durations)
+    
+    # Courts are independent, so each worker solves a contiguous group of them
+    court_ids = schedule['court_id'].unique()
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(court_ids))
+    groups = [schedule[schedule['court_id'].isin(ids)]
+              for ids in np.array_split(court_ids, n_jobs)]
+    args = (len(durations), multipliers, curve, model_path)
+    
+    with metrics.span('schedule_solve'):
+        if n_jobs == 1:
+            results = [_solve_courts(groups[0], *args)]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                results = list(pool.map(_solve_courts, groups, *zip(*[args] * len(groups))))
+    return pd.concat(results, ignore_index=True)
+
+def _solve_courts(schedule, n_durations, multipliers, curve, model_path):
+    # Runs in a worker process: one batched model call, then a vectorized argmax
+    loaded = get_registry().get(model_path)
+    X = loaded.processor.preprocessor.transform(schedule)
+    model_price = loaded.fast_pricer.predict_matrix(X)
+    
+    # revenue[slot, duration, multiplier], normalized per court-hour so
+    # longer bookings compete fairly with back-to-back short ones
+    shape = (len(schedule) // n_durations, n_durations, len(multipliers))
+    price = model_price[:, np.newaxis] * multipliers[np.newaxis, :]
+    probability = curve.booking_probability(
+        schedule['historical_demand'].to_numpy()[:, np.newaxis], multipliers[np.newaxis, :])
+    hourly = (price * probability / schedule['duration'].to_numpy()[:, np.newaxis]).reshape(shape)
+    
+    best = hourly.reshape(shape[0], -1).argmax(axis=1)
+    duration_choice, multiplier_choice = np.divmod(best, len(multipliers))
+    rows = np.arange(shape[0]) * n_durations + duration_choice
+    
+    result = schedule.iloc[rows].reset_index(drop=True)
+    result['model_price'] = model_price[rows]
+    result['price_multiplier'] = multipliers[multiplier_choice]
+    result['price'] = np.round(price[rows, multiplier_choice], 2)
+    result['booking_probability'] = probability[rows, multiplier_choice]
+    result['expected_revenue'] = result['price'] * result['booking_probability']
+    return result[SCHEDULE_COLUMNS]
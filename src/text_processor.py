@@ -1,15 +1,15 @@
 from langchain.llms import OpenAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
+import asyncio
+import json
+import random
+import time
+from src.llm_cache import cache_key
+from src.instrumentation import metrics
+from src.rule_parser import RuleBasedBookingParser, REQUIRED_FIELDS, validate_booking_fields
 
-class TextProcessor:
-    def __init__(self, api_key):
-        self.llm = OpenAI(api_key=api_key)
-        self.prompt = PromptTemplate(
-            input_variables=["text"],
-            template="""
-            Extract tennis court booking details from the following text. 
-            Return a JSON with the following fields (if mentioned):
+FIELD_INSTRUCTIONS = """
             - duration (in hours)
             - court_surface (Hard/Clay/Grass/Carpet)
             - court_type (Indoor/Outdoor)
@@ -18,15 +18,165 @@ class TextProcessor:
             - coaching_requested (true/false)
             - ball_machine (true/false)
             - court_quality (Standard/Premium/Elite)
-            
+"""
+
+class ExtractionResult:
+    def __init__(self, index, text, fields=None, source=None, error=None):
+        self.index = index
+        self.text = text
+        self.fields = fields
+        self.source = source
+        self.error = error
+
+class TextProcessor:
+    def __init__(self, api_key=None, llm=None, cache=None, use_rules=True,
+                 required_fields=REQUIRED_FIELDS):
+        # Any LangChain LLM can be injected (e.g. a fake LLM for offline runs)
+        self.llm = llm if llm is not None else OpenAI(api_key=api_key)
+        self.cache = cache
+        self.rule_parser = RuleBasedBookingParser() if use_rules else None
+        self.required_fields = required_fields
+        self.rule_hits = 0
+        self.llm_calls = 0
+        self.last_run_stats = None
+        self.prompt = PromptTemplate(
+            input_variables=["text"],
+            template="""
+            Extract tennis court booking details from the following text. 
+            Return a JSON with the following fields (if mentioned):""" + FIELD_INSTRUCTIONS + """
             Text: {text}
             """
         )
         self.chain = LLMChain(llm=self.llm, prompt=self.prompt)
+        
+        # Several texts per request for bulk extraction
+        self.batch_prompt = PromptTemplate(
+            input_variables=["texts"],
+            template="""
+            Extract tennis court booking details from each numbered text below.
+            Return a JSON array with one object per text, in the same order. Each
+            object has an "id" field with the text's number and the following
+            fields (if mentioned):""" + FIELD_INSTRUCTIONS + """
+            Texts:
+            {texts}
+            """
+        )
+        self.batch_chain = LLMChain(llm=self.llm, prompt=self.batch_prompt)
     
     def process_text(self, text):
+        # Local rules answer the common phrasings; the LLM handles the rest
+        if self.rule_parser is not None:
+            with metrics.span('rule_parse'):
+                parsed = self.rule_parser.parse(text)
+            if not parsed.needs_llm(self.required_fields):
+                self.rule_hits += 1
+                metrics.inc('text_rule_hits')
+                return json.dumps(parsed.fields)
+        
+        self.llm_calls += 1
         try:
-            result = self.chain.run(text)
-            return result
+            with metrics.span('llm_extract'):
+                if self.cache is None:
+                    return self.chain.run(text)
+                key = cache_key(text, self.prompt.template)
+                return self.cache.get_or_compute(key, lambda: self.chain.run(text))
         except Exception as e:
-            return f"Error processing text: {str(e)}" 
\ No newline at end of file
+            return f"Error processing text: {str(e)}"
+    
+    async def process_texts(self, texts, batch_size=8, concurrency=4,
+                            max_retries=3, backoff=0.5):
+        # Async generator yielding ExtractionResults as they complete (not in input order)
+        stats = {'texts': 0, 'rules': 0, 'cache': 0, 'llm_requests': 0,
+                 'retries': 0, 'failed': 0}
+        self.last_run_stats = stats
+        start = time.perf_counter()
+        pending = []
+        
+        for index, text in enumerate(texts):
+            stats['texts'] += 1
+            result = self._local_result(index, text)
+            if result is None:
+                pending.append((index, text))
+                continue
+            stats[result.source] += 1
+            yield result
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        tasks = [asyncio.ensure_future(
+                    self._extract_batch(batch, semaphore, max_retries, backoff, stats))
+                 for batch in batches]
+        
+        try:
+            for task in asyncio.as_completed(tasks):
+                for result in await task:
+                    if result.error is not None:
+                        stats['failed'] += 1
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        stats['seconds'] = time.perf_counter() - start
+        stats['texts_per_sec'] = stats['texts'] / stats['seconds'] if stats['seconds'] else 0.0
+    
+    def _local_result(self, index, text):
+        if self.rule_parser is not None:
+            parsed = self.rule_parser.parse(text)
+            if not parsed.needs_llm(self.required_fields):
+                return ExtractionResult(index, text, parsed.fields, source='rules')
+        
+        if self.cache is not None:
+            cached = self.cache.get(cache_key(text, self.prompt.template))
+            if cached is not None:
+                try:
+                    fields = validate_booking_fields(json.loads(cached))
+                    return ExtractionResult(index, text, fields, source='cache')
+                except ValueError:
+                    pass
+        return None
+    
+    async def _extract_batch(self, batch, semaphore, max_retries, backoff, stats):
+        numbered = "\n".join(f"{i + 1}. {text}" for i, (_, text) in enumerate(batch))
+        
+        for attempt in range(max_retries + 1):
+            try:
+                async with semaphore:
+                    stats['llm_requests'] += 1
+                    response = await self.batch_chain.arun(texts=numbered)
+                results = self._parse_batch_response(batch, response)
+                break
+            except Exception as e:
+                if attempt == max_retries:
+                    return [ExtractionResult(index, text, error=str(e))
+                            for index, text in batch]
+                stats['retries'] += 1
+                # Exponential backoff with jitter
+                await asyncio.sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+        
+        if self.cache is not None:
+            for result in results:
+                if result.error is None:
+                    self.cache.set(cache_key(result.text, self.prompt.template),
+                                   json.dumps(result.fields))
+        return results
+    
+    def _parse_batch_response(self, batch, response):
+        start, end = response.find('['), response.rfind(']')
+        if start == -1 or end == -1:
+            raise ValueError("LLM response does not contain a JSON array")
+        items = json.loads(response[start:end + 1])
+        by_id = {int(item.get('id', 0)): item for item in items if isinstance(item, dict)}
+        
+        results = []
+        for i, (index, text) in enumerate(batch):
+            item = by_id.get(i + 1)
+            if item is None:
+                results.append(ExtractionResult(index, text, error="missing from LLM response"))
+                continue
+            try:
+                fields = validate_booking_fields(item)
+                results.append(ExtractionResult(index, text, fields, source='llm'))
+            except ValueError as e:
+                results.append(ExtractionResult(index, text, error=str(e)))
+        return results
@@ -0,0 +1,18 @@
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from src.data_generator import TennisDataGenerator
+from src.data_processor import DataProcessor
+from src.model_trainer import ModelTrainer
+
+@pytest.fixture(scope='session')
+def bookings():
+    return TennisDataGenerator(2000, seed=0).generate_data_fast()
+
+@pytest.fixture(scope='session')
+def trained(bookings):
+    # A small forest on the same features and preprocessing as train_model.py
+    processor = DataProcessor()
+    X, y = processor.prepare_data(bookings, is_training=True)
+    trainer = ModelTrainer(RandomForestRegressor(n_estimators=10, max_depth=8, random_state=0))
+    trainer.train(X, y, processor.preprocessor)
+    return trainer, processor
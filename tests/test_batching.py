@@ -0,0 +1,82 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+import pytest
+from src.batching import MicroBatcher
+from src.model_trainer import ModelTrainer
+from src.pricing_service import create_server
+
+def test_short_result_lists_fail_every_request():
+    batcher = MicroBatcher(lambda items: items[:-1], max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="2 results for 3 items"):
+            future.result(timeout=5)
+    batcher.close()
+
+def test_close_fails_items_queued_behind_the_stop_sentinel():
+    release = threading.Event()
+    started = threading.Event()
+    def process(items):
+        started.set()
+        release.wait()
+        return items
+    batcher = MicroBatcher(process, max_wait_ms=0)
+    first = batcher.submit('first')
+    started.wait(5)
+    
+    closer = threading.Thread(target=batcher.close)
+    closer.start()
+    while batcher.queue_depth == 0:
+        time.sleep(0.001)
+    # A submit that passed the closed check just before close() ran
+    late = Future()
+    batcher._queue.put(('late', late, time.monotonic()))
+    release.set()
+    closer.join(5)
+    
+    assert first.result(timeout=5) == 'first'
+    with pytest.raises(RuntimeError, match="closed"):
+        late.result(timeout=5)
+
+def test_timed_out_calls_are_dropped_from_the_queue():
+    seen = []
+    release = threading.Event()
+    def process(items):
+        seen.extend(items)
+        release.wait()
+        return items
+    batcher = MicroBatcher(process, max_wait_ms=0, timeout_ms=20)
+    blocking = batcher.submit('blocking')
+    with pytest.raises(TimeoutError):
+        batcher('abandoned')
+    release.set()
+    assert blocking.result(timeout=5) == 'blocking'
+    batcher.close()
+    assert seen == ['blocking']
+
+def test_explain_rejects_a_bad_top_k(tmp_path, trained, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    trainer, processor = trained
+    copy = ModelTrainer(trainer.model)
+    copy.preprocessor = processor.preprocessor
+    copy.save_model('models')
+    server = create_server('127.0.0.1', 0, model_path='models', log_predictions=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for top_k in ('abc', 0, None):
+            request = urllib.request.Request(
+                f'http://127.0.0.1:{server.server_port}/explain',
+                data=json.dumps({'booking': {}, 'top_k': top_k}).encode('utf-8'),
+                headers={'Content-Type': 'application/json'})
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(request, timeout=5)
+            assert error.value.code == 400
+            assert 'top_k' in json.loads(error.value.read())['error']
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.service.close()
@@ -0,0 +1,18 @@
+import pandas as pd
+from src.data_generator import TennisDataGenerator, SEEDED_END_DATE
+
+def test_seeded_output_is_reproducible():
+    first = TennisDataGenerator(500, seed=7).generate_data_fast()
+    second = TennisDataGenerator(500, seed=7).generate_data_fast()
+    pd.testing.assert_frame_equal(first, second)
+    assert pd.to_datetime(first['booking_date']).max() <= SEEDED_END_DATE
+    
+    chunks = list(TennisDataGenerator(500, seed=7).generate_chunks(120))
+    again = list(TennisDataGenerator(500, seed=7).generate_chunks(120))
+    pd.testing.assert_frame_equal(pd.concat(chunks), pd.concat(again))
+
+def test_end_date_bounds_the_window():
+    df = TennisDataGenerator(500, seed=7, end_date='2023-06-30').generate_data_fast()
+    dates = pd.to_datetime(df['booking_date'])
+    assert dates.max() <= pd.Timestamp('2023-06-30')
+    assert dates.min() >= pd.Timestamp('2023-06-30') - pd.Timedelta(days=365)
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+from src.dataset_explorer import DatasetExplorer, _expression
+from src.dataset_store import BookingDatasetWriter
+
+# A filter the rollup can't answer (it matches every row), forcing a scan
+SCAN = [('price', '>=', -1e9)]
+
+@pytest.fixture(scope='module')
+def explorer(tmp_path_factory, bookings):
+    path = tmp_path_factory.mktemp('explorer') / 'bookings'
+    BookingDatasetWriter(str(path)).write(bookings)
+    return DatasetExplorer(str(path), page_size=50)
+
+def filter_cases(explorer):
+    first, _ = explorer.date_range()
+    start = pd.Timestamp(first.date()) + pd.Timedelta(days=30)
+    return [
+        [],
+        [('season', 'in', ['Summer', 'Fall'])],
+        [('court_surface', 'in', ['Clay']), ('court_quality', 'in', ['Elite', 'Premium']),
+         ('booking_date', '>=', start), ('booking_date', '<', start + pd.Timedelta(days=90))],
+        [('court_type', '!=', 'Indoor'), ('match_type', 'not in', ['Doubles'])],
+        [('court_surface', 'in', ['Sand'])],
+    ]
+
+def test_rollup_answers_match_scans(explorer):
+    for filters in filter_cases(explorer):
+        assert explorer._rollup_rows(filters) is not None
+        assert explorer.count_rows(filters) == explorer.count_rows(filters + SCAN)
+        pd.testing.assert_frame_equal(explorer.summary(filters).astype(float),
+                                      explorer.summary(filters + SCAN).astype(float), rtol=1e-9)
+        for by in (['court_type'], ['court_surface', 'day_of_week']):
+            pd.testing.assert_frame_equal(explorer.aggregate(by, filters),
+                                          explorer.aggregate(by, filters + SCAN),
+                                          rtol=1e-9, check_dtype=False)
+
+def test_unsupported_filters_fall_back_to_scans(explorer):
+    assert explorer._rollup_rows(SCAN) is None
+    assert explorer._rollup_rows([('booking_date', '<', pd.Timestamp('2026-01-01 12:00'))]) is None
+
+def test_pages_match_filtered_read(explorer):
+    for filters in filter_cases(explorer):
+        expected = explorer.dataset.to_table(columns=explorer._columns(),
+                                             filter=_expression(filters)).to_pandas()
+        if expected.empty:
+            assert explorer.page(0, filters).empty
+            continue
+        for number in range(explorer.num_pages(filters)):
+            page = explorer.page(number, filters)
+            pd.testing.assert_frame_equal(
+                page, expected.iloc[number * 50:(number + 1) * 50].reset_index(drop=True))
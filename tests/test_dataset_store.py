@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+from src.dataset_store import BookingDatasetWriter, load_bookings, iter_bookings
+
+def test_csv_filters_on_columns_outside_the_projection(tmp_path, bookings):
+    csv_path = tmp_path / 'bookings.csv'
+    bookings.to_csv(csv_path, index=False)
+    start = pd.to_datetime(bookings['booking_date']).median()
+    filters = [('booking_date', '>', start), ('court_type', '=', 'Indoor')]
+    expected = bookings[(pd.to_datetime(bookings['booking_date']) > start)
+                        & (bookings['court_type'] == 'Indoor')]
+    
+    df = load_bookings(columns=['price'], filters=filters, path=str(tmp_path / 'none'),
+                       csv_path=csv_path)
+    assert list(df.columns) == ['price']
+    assert len(df) == len(expected)
+    chunks = list(iter_bookings(columns=['price'], filters=filters, batch_size=500,
+                                path=str(tmp_path / 'none'), csv_path=csv_path))
+    assert all(list(chunk.columns) == ['price'] for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == len(expected)
+
+def test_unknown_category_values_are_rejected(tmp_path, bookings):
+    df = bookings.head(10).copy()
+    df.loc[df.index[3], 'court_surface'] = 'Astroturf'
+    with pytest.raises(ValueError, match="Astroturf"):
+        BookingDatasetWriter(str(tmp_path / 'bookings')).write(df)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+from src.data_generator import TennisDataGenerator
+from src.demand_index import DemandIndex
+from src.drift_sketch import DriftSketch, PSI_THRESHOLD, psi
+
+def test_replay_matches_quoting_then_recording_each_booking(bookings):
+    replayed = DemandIndex()
+    demand = np.concatenate([replayed.replay(bookings.iloc[:1500]),
+                             replayed.replay(bookings.iloc[1500:])])
+    index, expected = DemandIndex(), {}
+    for part in (bookings.iloc[:1500], bookings.iloc[1500:]):
+        for i, booking in part.sort_values('booking_date', kind='stable').iterrows():
+            expected[i] = index.demand(booking)
+            index.record(booking)
+    assert np.allclose(demand, [expected[i] for i in bookings.index], rtol=1e-9, atol=0)
+    assert np.allclose(replayed.weights / replayed.peak, index.weights / index.peak)
+    assert replayed.events == index.events == len(bookings)
+
+def test_chunked_generation_replays_the_whole_stream():
+    generator = TennisDataGenerator(3000, seed=3)
+    chunks = list(generator.generate_chunks(700))
+    for earlier, later in zip(chunks, chunks[1:]):
+        assert earlier['booking_date'].max() <= later['booking_date'].min()
+    history = pd.concat(chunks, ignore_index=True)
+    assert np.allclose(history['historical_demand'], DemandIndex().replay(history),
+                       rtol=1e-9, atol=0)
+
+def test_training_demand_matches_served_demand():
+    # Served quotes are looked up in the index built over the whole history
+    history = TennisDataGenerator(50_000, seed=0).generate_data_fast()
+    index = DemandIndex.from_bookings(history)
+    quotes = TennisDataGenerator(20_000, seed=1).generate_data_fast()
+    quotes['historical_demand'] = index.demand_frame(quotes)
+    training = DriftSketch.from_sample(history)
+    served = training.empty_like()
+    training.update_frame(history)
+    served.update_frame(quotes)
+    reference = training.distributions()['historical_demand']
+    live = served.distributions()['historical_demand']
+    assert psi(reference, live) < PSI_THRESHOLD
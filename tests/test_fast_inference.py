@@ -0,0 +1,71 @@
+import json
+import numpy as np
+import pytest
+from src.fast_inference import CompiledPreprocessor, FastPricer
+
+@pytest.fixture(scope='module')
+def pricer(trained):
+    trainer, processor = trained
+    return FastPricer(trainer, CompiledPreprocessor.from_preprocessor(processor.preprocessor))
+
+def test_features_match_prepare_data_from_dataframe_rows(bookings, trained, pricer):
+    _, processor = trained
+    expected = processor.prepare_data(bookings, is_training=False)
+    for i, booking in enumerate(bookings.to_dict('records')):
+        assert np.array_equal(pricer.compiled.transform(booking), expected[i])
+
+def test_features_match_prepare_data_from_plain_dicts(bookings, trained, pricer):
+    # JSON round trip: plain Python scalars and date strings, as the HTTP service receives them
+    _, processor = trained
+    expected = processor.prepare_data(bookings, is_training=False)
+    records = json.loads(json.dumps(bookings.to_dict('records'), default=str))
+    for i, booking in enumerate(records):
+        assert np.array_equal(pricer.compiled.transform(booking), expected[i])
+
+def test_prices_match_model_predict(bookings, trained, pricer):
+    trainer, processor = trained
+    expected = trainer.model.predict(processor.prepare_data(bookings, is_training=False))
+    prices = [pricer.price(booking) for booking in bookings.to_dict('records')]
+    assert np.array_equal(prices, expected)
+    assert np.array_equal(pricer.predict_matrix(processor.preprocessor.transform(bookings)),
+                          expected)
+
+@pytest.mark.parametrize('changes', [
+    {'duration': '1.5', 'num_players': '2'},
+    {'court_lighting': 1, 'refreshments': 0},
+    {'court_lighting': np.bool_(True), 'special_requests': np.bool_(False)},
+    {'num_players': np.int8(4), 'temperature': np.float32(21.5)},
+])
+def test_edge_values_match_prepare_data(bookings, trained, pricer, changes):
+    trainer, processor = trained
+    frame = bookings.head(1).astype(object)
+    for column, value in changes.items():
+        frame[column] = [value]
+    X = processor.prepare_data(frame, is_training=False)
+    booking = dict(bookings.iloc[0].to_dict(), **changes)
+    assert np.array_equal(pricer.compiled.transform(booking), X[0])
+    assert pricer.price(booking) == trainer.model.predict(X.astype(np.float64))[0]
+
+def test_unknown_category_is_rejected_by_both_paths(bookings, trained, pricer):
+    _, processor = trained
+    frame = bookings.head(1).copy()
+    frame['court_surface'] = 'Sand'
+    with pytest.raises(ValueError):
+        processor.prepare_data(frame, is_training=False)
+    with pytest.raises(ValueError, match='Sand'):
+        pricer.price(frame.iloc[0].to_dict())
+
+def test_string_boolean_is_rejected_by_both_paths(bookings, trained, pricer):
+    trainer, processor = trained
+    frame = bookings.head(1).astype(object)
+    frame['court_lighting'] = ['True']
+    with pytest.raises(ValueError):
+        trainer.model.predict(processor.prepare_data(frame, is_training=False))
+    with pytest.raises(ValueError):
+        pricer.price(frame.iloc[0].to_dict())
+
+def test_missing_field_raises_key_error(bookings, pricer):
+    booking = bookings.iloc[0].to_dict()
+    del booking['season']
+    with pytest.raises(KeyError):
+        pricer.price(booking)
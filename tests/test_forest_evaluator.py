@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesRegressor
+from src.forest_evaluator import FlatForest
+
+@pytest.fixture(scope='module')
+def features(bookings, trained):
+    _, processor = trained
+    return processor.prepare_data(bookings, is_training=False)
+
+def on_thresholds(model, X):
+    # Rows whose values sit exactly on (and one float32 step either side of)
+    # split thresholds, where float32/float64 handling differences would show
+    rng = np.random.default_rng(0)
+    rows = X[rng.integers(0, len(X), size=300)].copy()
+    tree = model.estimators_[0].tree_
+    internal = np.flatnonzero(tree.children_left != -1)
+    for i, node in enumerate(rng.choice(internal, size=len(rows))):
+        value = np.float32(tree.threshold[node])
+        rows[i, tree.feature[node]] = [value, np.nextafter(value, np.float32(-np.inf)),
+                                       np.nextafter(value, np.float32(np.inf))][i % 3]
+    return rows
+
+@pytest.mark.parametrize('use_numba', [True, False])
+def test_matches_sklearn_on_batches_and_single_rows(trained, features, use_numba):
+    if use_numba:
+        pytest.importorskip('numba')
+    trainer, _ = trained
+    forest = FlatForest.from_sklearn(trainer.model)
+    assert np.array_equal(forest.predict(features, use_numba=use_numba),
+                          trainer.model.predict(features))
+    for row in features[:50]:
+        assert np.array_equal(forest.predict(row, use_numba=use_numba),
+                              trainer.model.predict(row[np.newaxis, :]))
+
+def test_matches_sklearn_on_split_thresholds(trained, features):
+    trainer, _ = trained
+    X = on_thresholds(trainer.model, features)
+    assert np.array_equal(FlatForest.from_sklearn(trainer.model).predict(X),
+                          trainer.model.predict(X))
+
+def test_matches_extra_trees(bookings, features):
+    model = ExtraTreesRegressor(n_estimators=10, max_depth=8, random_state=0)
+    model.fit(features, bookings['price'])
+    X = np.vstack([features, on_thresholds(model, features)])
+    assert np.array_equal(FlatForest.from_sklearn(model).predict(X), model.predict(X))
+
+def test_memory_mapped_artifact_predicts_the_same(tmp_path, trained, features):
+    trainer, _ = trained
+    FlatForest.from_sklearn(trainer.model).save(tmp_path / 'forest')
+    loaded = FlatForest.load(tmp_path / 'forest', mmap_mode='r')
+    assert isinstance(loaded.threshold, np.memmap)
+    assert np.array_equal(loaded.predict(features), trainer.model.predict(features))
+
+def test_numba_kernel_without_numba_is_a_clear_error(trained, features, monkeypatch):
+    trainer, _ = trained
+    monkeypatch.setattr('src.forest_evaluator.numba', None)
+    forest = FlatForest.from_sklearn(trainer.model)
+    with pytest.raises(ImportError, match='numba'):
+        forest.predict(features, use_numba=True)
+    assert np.array_equal(forest.predict(features), trainer.model.predict(features))
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import HistGradientBoostingRegressor
+from src.data_generator import TennisDataGenerator
+from src.model_trainer import ModelTrainer
+from train_model import train_initial_model, train_incremental_model
+
+def load_current():
+    trainer = ModelTrainer()
+    preprocessor = trainer.load_model(mmap_mode=None)
+    return trainer, preprocessor
+
+def test_incremental_update_keeps_existing_tree_predictions(tmp_path, monkeypatch):
+    # train_model.py reads data/ and writes models/ relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data').mkdir()
+    history = TennisDataGenerator(1500, seed=1).generate_data_fast()
+    history.to_csv('data/tennis_bookings.csv', index=False)
+    train_initial_model()
+    before, before_preprocessor = load_current()
+
+    # Newer bookings, with shifted numeric inputs so fresh scaler
+    # statistics would differ from the fitted ones
+    newer = TennisDataGenerator(800, seed=2).generate_data_fast()
+    newer['booking_date'] = pd.to_datetime(newer['booking_date']) + pd.Timedelta(days=400)
+    newer['temperature'] += 8
+    newer['booking_lead_time'] *= 2
+    pd.concat([history, newer]).to_csv('data/tennis_bookings.csv', index=False)
+    assert train_incremental_model(new_trees=5, max_regression=10) is not None
+    after, after_preprocessor = load_current()
+
+    n_old = len(before.model.estimators_)
+    assert len(after.model.estimators_) == n_old + 5
+    rows = pd.concat([history, newer])
+    X_before = before_preprocessor.transform(rows)
+    X_after = after_preprocessor.transform(rows)
+    for old, kept in zip(before.model.estimators_, after.model.estimators_[:n_old]):
+        assert np.array_equal(old.predict(X_before), kept.predict(X_after))
+
+def test_incremental_update_rejects_boosted_models():
+    boosted = ModelTrainer(model=HistGradientBoostingRegressor(max_iter=5))
+    X = np.zeros((4, 3))
+    with pytest.raises(TypeError, match="full training"):
+        boosted.train_incremental(X, np.zeros(4))
@@ -0,0 +1,69 @@
+import threading
+import time
+import pytest
+from src.llm_cache import LLMResponseCache, cache_key
+
+def test_key_ignores_case_and_whitespace_but_not_template():
+    assert cache_key("Clay  court\n2 hours", "t") == cache_key(" clay court 2 HOURS ", "t")
+    assert cache_key("clay court", "t") != cache_key("clay court", "u")
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path / 'cache.sqlite'), ttl=60)
+    now = [1000.0]
+    monkeypatch.setattr('src.llm_cache.time.time', lambda: now[0])
+    cache.set('k', 'v')
+    now[0] += 59
+    assert cache.get('k') == 'v'
+    now[0] += 2
+    assert cache.get('k') is None
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    cache = LLMResponseCache(':memory:', max_entries=2)
+    now = [0.0]
+    def tick():
+        now[0] += 1
+        return now[0]
+    monkeypatch.setattr('src.llm_cache.time.time', tick)
+    cache.set('a', '1')
+    cache.set('b', '2')
+    cache.get('a')
+    cache.set('c', '3')
+    assert [cache.get(key) for key in 'abc'] == ['1', None, '3']
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    LLMResponseCache(path).set('k', 'v')
+    assert LLMResponseCache(path).get('k') == 'v'
+
+def test_concurrent_misses_share_one_call():
+    cache = LLMResponseCache(':memory:')
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'answer'
+    results = []
+    owner = threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute)))
+    owner.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute)))
+    waiter.start()
+    while cache.merged == 0:
+        time.sleep(0.001)
+    release.set()
+    owner.join()
+    waiter.join()
+    assert results == ['answer', 'answer'] and len(calls) == 1
+    assert cache.get_or_compute('k', compute) == 'answer'
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+def test_failures_are_not_cached():
+    cache = LLMResponseCache(':memory:')
+    def fail():
+        raise RuntimeError("LLM down")
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('k', fail)
+    assert cache.get('k') is None
+    assert cache.get_or_compute('k', lambda: 'v') == 'v'
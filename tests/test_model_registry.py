@@ -0,0 +1,63 @@
+import threading
+import time
+from src import model_trainer
+from src.model_registry import ModelRegistry
+from src.model_trainer import ModelTrainer, CURRENT_POINTER
+
+def publish(trained, path):
+    trainer, processor = trained
+    # A fresh trainer so the shared fixture's version stays unset
+    copy = ModelTrainer(trainer.model)
+    copy.preprocessor = processor.preprocessor
+    copy.save_model(str(path))
+
+def test_failed_reload_backs_off_until_the_files_change(tmp_path, trained, monkeypatch):
+    path = str(tmp_path / 'models')
+    publish(trained, path)
+    registry = ModelRegistry(check_interval=0)
+    first = registry.get(path)
+    
+    loads = []
+    original = ModelTrainer.load_model
+    def counting_load(self, *args, **kwargs):
+        loads.append(args)
+        return original(self, *args, **kwargs)
+    monkeypatch.setattr(ModelTrainer, 'load_model', counting_load)
+    
+    # CURRENT now names a version that doesn't exist: keep serving the old one
+    (tmp_path / 'models' / CURRENT_POINTER).write_text('missing-version')
+    for _ in range(5):
+        assert registry.get(path) is first
+    assert len(loads) == 1
+    
+    # Once the backoff expires the same files are tried again
+    signature, attempts, _ = registry._failures[path]
+    registry._failures[path] = (signature, attempts, 0)
+    assert registry.get(path) is first
+    assert len(loads) == 2
+    
+    # A new publish changes the signature and loads straight away
+    time.sleep(0.01)
+    publish(trained, path)
+    assert registry.get(path) is not first
+    assert len(loads) == 3
+    assert path not in registry._failures
+
+def test_explainer_is_built_once_across_threads(trained, monkeypatch):
+    built = []
+    def slow_explainer(model):
+        built.append(model)
+        time.sleep(0.05)
+        return object()
+    monkeypatch.setattr(model_trainer.shap, 'TreeExplainer', slow_explainer)
+    trainer = ModelTrainer(trained[0].model)
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(trainer.explainer))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1
+    assert len({id(explainer) for explainer in results}) == 1
@@ -0,0 +1,57 @@
+import os
+import time
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from src.data_processor import NUMERIC_FEATURES
+from src.drift_sketch import DriftSketch
+from src.prediction_monitor import (PredictionLog, PredictionMonitor, RECORD_DTYPE,
+                                    read_prediction_log, segment_paths)
+
+def test_chunked_edges_cover_every_chunk(bookings):
+    # Sorted chunks: the first one alone sees only the lowest temperatures
+    ordered = bookings.sort_values('temperature', ignore_index=True)
+    chunks = [ordered.iloc[i:i + 250] for i in range(0, len(ordered), 250)]
+    sketch = DriftSketch.from_chunks(lambda: iter(chunks), sample_size=500)
+    full = DriftSketch.from_sample(bookings)
+    for column in NUMERIC_FEATURES:
+        assert sketch.numeric[column].sum() == len(bookings)
+    edges = sketch.edges['temperature']
+    assert edges[-1] > ordered['temperature'].iloc[249]
+    assert np.allclose(edges, full.edges['temperature'], atol=2.0)
+
+def test_chunked_sketch_of_nothing_is_none():
+    assert DriftSketch.from_chunks(lambda: iter([pd.DataFrame()])) is None
+
+def test_retention_covers_every_writer_but_keeps_active_segments(tmp_path):
+    # A segment left by a process that has exited, older than everything else
+    stale = tmp_path / 'predictions-20200101T000000-999999999-dead-000001.bin'
+    stale.write_bytes(b'')
+    os.utime(stale, (0, 0))
+    records = np.zeros(1, dtype=RECORD_DTYPE)
+    first = PredictionLog(tmp_path, max_segments=2)
+    second = PredictionLog(tmp_path, max_segments=2)
+    first.write('v1', records)
+    first_segment = segment_paths(tmp_path)[-1]
+    for version in ['v1', 'v2', 'v3', 'v4']:
+        second.write(version, records)
+    second_segment = segment_paths(tmp_path)[-1]
+    first.close()
+    second.close()
+    # The stale segment went first; the live writers' open segments stay
+    assert set(segment_paths(tmp_path)) == {first_segment, second_segment}
+
+def test_idle_writer_is_woken_by_new_quotes(tmp_path, bookings):
+    monitor = PredictionMonitor(tmp_path, flush_interval=0.01)
+    loaded = SimpleNamespace(version='v1', trainer=SimpleNamespace(drift_snapshot=None))
+    try:
+        for _ in range(3):
+            time.sleep(0.05)
+            monitor.record(loaded, bookings.iloc[0].to_dict(), 10.0)
+            deadline = time.monotonic() + 5
+            while monitor.logged < _ + 1 and time.monotonic() < deadline:
+                time.sleep(0.001)
+        assert monitor.logged == 3
+    finally:
+        monitor.close()
+    assert len(read_prediction_log(tmp_path)) == 3
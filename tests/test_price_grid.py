@@ -0,0 +1,45 @@
+import pytest
+from src.model_registry import LoadedModel
+from src.price_grid import PriceGrid, GridPricer, bucket_centers
+
+AXES = {'duration': [1, 2], 'num_players': [2],
+        'historical_demand': bucket_centers('historical_demand', 2)}
+
+@pytest.fixture(scope='module')
+def loaded(trained):
+    trainer, processor = trained
+    return LoadedModel(trainer, processor, digest='0' * 64)
+
+@pytest.fixture(scope='module')
+def grid(loaded):
+    return PriceGrid.build(loaded, numeric_axes=AXES)
+
+@pytest.fixture
+def booking(bookings):
+    return dict(bookings.iloc[0].to_dict(), duration=2, num_players=2, booking_lead_time=0,
+                temperature=20, precipitation_chance=0)
+
+def test_lookup_matches_live_model_at_bucket_centers(grid, loaded, booking):
+    for center in AXES['historical_demand']:
+        booking['historical_demand'] = center
+        assert grid.lookup(booking) == loaded.fast_pricer.price(booking)
+
+def test_demand_is_keyed_into_its_bucket(grid, loaded, booking):
+    expected = loaded.fast_pricer.price(dict(booking, historical_demand=0.25))
+    for demand in (0.0, 0.1, 0.49):
+        assert grid.lookup(dict(booking, historical_demand=demand)) == expected
+    assert grid.lookup(dict(booking, historical_demand=1.2)) is None
+
+def test_off_grid_bookings_fall_back_to_live_model(grid, loaded, booking):
+    pricer = GridPricer(grid, loaded)
+    off_grid = dict(booking, temperature=27.5)
+    assert pricer.price(off_grid) == loaded.fast_pricer.price(off_grid)
+    assert (pricer.hits, pricer.misses) == (0, 1)
+
+def test_saved_grid_is_used_only_for_its_model_version(tmp_path, grid, loaded, booking):
+    grid.save(tmp_path)
+    pricer = GridPricer.for_loaded(loaded, tmp_path)
+    assert pricer.price(booking) == grid.lookup(booking)
+    PriceGrid(grid.axes, grid.prices, model_version='other').save(tmp_path)
+    assert GridPricer.for_loaded(loaded, tmp_path) is None
+    assert GridPricer.for_loaded(loaded, tmp_path / 'missing') is None
@@ -0,0 +1,46 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+from src.pricing_engine import PricingEngine
+
+@pytest.fixture(scope='module')
+def engine(trained):
+    trainer, processor = trained
+    # An odd batch size so the last batch is partial
+    return PricingEngine(trainer, processor, batch_size=333, n_jobs=2)
+
+@pytest.fixture(scope='module')
+def expected(bookings, trained):
+    trainer, processor = trained
+    return trainer.model.predict(processor.prepare_data(bookings, is_training=False))
+
+def test_dataframe_matches_per_row_path(bookings, engine, expected):
+    # The batched engine over the whole frame against the engine called one booking at a time
+    batched = engine.price(bookings)
+    per_row = [engine.price(bookings.iloc[[i]])[0] for i in range(0, len(bookings), 97)]
+    assert np.array_equal(batched[::97], per_row)
+    assert np.array_equal(batched, expected)
+
+@pytest.mark.parametrize('convert', [
+    lambda df: df,
+    lambda df: pa.Table.from_pandas(df),
+    lambda df: df.to_records(index=False),
+    lambda df: {column: df[column].tolist() for column in df.columns},
+], ids=['dataframe', 'arrow', 'records', 'columns'])
+def test_input_formats_match_model_predict(bookings, engine, expected, convert):
+    assert np.array_equal(engine.price(convert(bookings)), expected)
+
+def test_batch_size_does_not_change_prices(bookings, trained, expected):
+    trainer, processor = trained
+    for batch_size in (1, 64, len(bookings) + 1):
+        engine = PricingEngine(trainer, processor, batch_size=batch_size, n_jobs=1)
+        assert np.array_equal(engine.price(bookings.head(200)), expected[:200])
+
+def test_extra_columns_are_ignored_and_missing_ones_rejected(bookings, engine, expected):
+    assert np.array_equal(engine.price(bookings.assign(notes='x')), expected)
+    with pytest.raises(ValueError, match='historical_demand'):
+        engine.price(bookings.drop(columns='historical_demand'))
+
+def test_price_frame_adds_price_column(bookings, engine, expected):
+    priced = engine.price_frame(bookings.drop(columns='price'))
+    assert np.array_equal(priced['price'].to_numpy(), expected)
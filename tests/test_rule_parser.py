@@ -0,0 +1,68 @@
+import pytest
+from src.rule_parser import RuleBasedBookingParser, validate_booking_fields
+
+@pytest.fixture(scope='module')
+def parser():
+    return RuleBasedBookingParser()
+
+@pytest.mark.parametrize('text, duration', [
+    ("half an hour on clay", 0.5),
+    ("half hour hard court", 0.5),
+    ("1/2 hour lesson", 0.5),
+    ("½ hour on grass", 0.5),
+    ("2 1/2 hrs premium grass court", 2.5),
+    ("one and a half hours on grass", 1.5),
+    ("An hour and a half on clay", 1.5),
+    ("90 minutes of doubles", 1.5),
+    ("Two hour singles game outside", 2),
+    ("not 1 hour but 2 hours", 2),
+])
+def test_durations(parser, text, duration):
+    result = parser.parse(text)
+    assert result.fields['duration'] == duration
+    assert not result.needs_llm()
+
+@pytest.mark.parametrize('text, field', [
+    ("for 2 hours not premium", 'court_quality'),
+    ("not indoors, 2 hours", 'court_type'),
+    ("1 hour, not on clay", 'court_surface'),
+    ("2 hours, not doubles", 'match_type'),
+])
+def test_negated_choices_are_not_extracted(parser, text, field):
+    assert field not in parser.parse(text).fields
+
+def test_negated_choice_with_an_alternative(parser):
+    fields = parser.parse("2 hours, not premium, a standard court is fine").fields
+    assert fields['court_quality'] == 'Standard'
+
+@pytest.mark.parametrize('text, fields', [
+    ("1 hour, no coach please", {'coaching_requested': False}),
+    ("1 hour without a ball machine", {'ball_machine': False}),
+    ("1 hour with the ball machine and an instructor",
+     {'ball_machine': True, 'coaching_requested': True}),
+])
+def test_add_ons(parser, text, fields):
+    result = parser.parse(text).fields
+    assert {field: result[field] for field in fields} == fields
+
+@pytest.mark.parametrize('text', [
+    "Either 1 hour or 2 hours on hard court",
+    "No coach, just a lesson for 1 hour",
+    "Can we get a court this weekend?",
+])
+def test_ambiguous_or_missing_goes_to_llm(parser, text):
+    assert parser.parse(text).needs_llm()
+
+def test_players_inferred_from_match_type(parser):
+    result = parser.parse("2 hours of doubles")
+    assert result.fields['num_players'] == 4
+    assert result.confidence['num_players'] < 1.0
+    assert parser.parse("2 hours, 4 players").fields['num_players'] == 4
+
+def test_validate_booking_fields():
+    assert validate_booking_fields({'duration': '1.5', 'court_surface': ' clay ', 'num_players': '4',
+                                    'ball_machine': 'false', 'notes': 'x', 'court_type': None}) == \
+        {'duration': 1.5, 'court_surface': 'Clay', 'num_players': 4, 'ball_machine': False}
+    for fields in ({'duration': 12}, {'court_surface': 'Sand'}, {'coaching_requested': 'yes'}, []):
+        with pytest.raises(ValueError):
+            validate_booking_fields(fields)
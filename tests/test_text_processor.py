@@ -0,0 +1,93 @@
+import asyncio
+import json
+import re
+from langchain.llms.base import LLM
+from src.llm_cache import LLMResponseCache
+from src.text_processor import TextProcessor
+
+class ScriptedLLM(LLM):
+    # Answers extraction prompts from a {text: fields} table; texts without
+    # an answer are left out of batch responses, and the first `failures`
+    # requests raise
+    answers: dict = {}
+    failures: int = 0
+    prompts: list = []
+    
+    @property
+    def _llm_type(self):
+        return "scripted"
+    
+    def _call(self, prompt, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(prompt)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("injected failure")
+        if 'Texts:' in prompt:
+            texts = re.findall(r'^\s*(\d+)\. (.*)$', prompt.split('Texts:')[-1], re.MULTILINE)
+            return json.dumps([dict(self.answers[text], id=int(i))
+                               for i, text in texts if text in self.answers])
+        return json.dumps(self.answers[prompt.split('Text:')[-1].strip()])
+
+RULE_TEXT = "2 hours of singles on clay"
+LLM_ANSWERS = {
+    "Something nice for my birthday": {'duration': 2, 'court_quality': 'Elite'},
+    "The usual court for the club": {'court_surface': 'Grass', 'num_players': '4'},
+    "Same as last week please": {'duration': 1.5, 'ball_machine': 'true'},
+}
+
+def run(processor, texts, **kwargs):
+    async def collect():
+        return [result async for result in processor.process_texts(texts, **kwargs)]
+    return {result.index: result for result in asyncio.run(collect())}
+
+def test_rules_answer_locally_and_the_rest_is_batched():
+    llm = ScriptedLLM(answers=LLM_ANSWERS)
+    processor = TextProcessor(llm=llm)
+    texts = [RULE_TEXT] + list(LLM_ANSWERS)
+    results = run(processor, texts, batch_size=2, concurrency=2, backoff=0)
+    assert results[0].source == 'rules' and results[0].fields['court_surface'] == 'Clay'
+    assert [results[i].source for i in (1, 2, 3)] == ['llm'] * 3
+    assert results[2].fields == {'court_surface': 'Grass', 'num_players': 4}
+    assert results[3].fields == {'duration': 1.5, 'ball_machine': True}
+    assert len(llm.prompts) == 2
+    assert processor.last_run_stats['llm_requests'] == 2
+    assert processor.last_run_stats['rules'] == 1
+
+def test_missing_and_invalid_answers_fail_per_text():
+    answers = dict(LLM_ANSWERS, **{"The usual court for the club": {'court_surface': 'Sand'}})
+    del answers["Same as last week please"]
+    results = run(TextProcessor(llm=ScriptedLLM(answers=answers)), list(LLM_ANSWERS),
+                  batch_size=8, backoff=0)
+    assert results[0].error is None
+    assert 'Sand' in results[1].error
+    assert results[2].error == "missing from LLM response"
+
+def test_failed_requests_are_retried():
+    llm = ScriptedLLM(answers=LLM_ANSWERS, failures=1)
+    processor = TextProcessor(llm=llm)
+    results = run(processor, list(LLM_ANSWERS), batch_size=8, backoff=0)
+    assert all(result.error is None for result in results.values())
+    assert processor.last_run_stats['retries'] == 1
+    
+    processor = TextProcessor(llm=ScriptedLLM(answers=LLM_ANSWERS, failures=5))
+    results = run(processor, list(LLM_ANSWERS), batch_size=8, max_retries=2, backoff=0)
+    assert all('injected failure' in result.error for result in results.values())
+    assert processor.last_run_stats['failed'] == 3
+
+def test_batched_answers_are_cached_for_later_runs():
+    cache = LLMResponseCache(':memory:')
+    llm = ScriptedLLM(answers=LLM_ANSWERS)
+    run(TextProcessor(llm=llm, cache=cache), list(LLM_ANSWERS), backoff=0)
+    again = run(TextProcessor(llm=llm, cache=cache), list(LLM_ANSWERS), backoff=0)
+    assert [again[i].source for i in range(3)] == ['cache'] * 3
+    assert len(llm.prompts) == 1
+
+def test_process_text_uses_rules_then_the_cached_llm():
+    cache = LLMResponseCache(':memory:')
+    llm = ScriptedLLM(answers=LLM_ANSWERS)
+    processor = TextProcessor(llm=llm, cache=cache)
+    assert json.loads(processor.process_text(RULE_TEXT))['duration'] == 2
+    text = "Something nice for my birthday"
+    assert json.loads(processor.process_text(text)) == LLM_ANSWERS[text]
+    assert json.loads(processor.process_text(text.upper())) == LLM_ANSWERS[text]
+    assert (processor.rule_hits, processor.llm_calls, len(llm.prompts)) == (1, 2, 1)
@@ -1,21 +1,109 @@
+import argparse
+import numpy as np
 import pandas as pd
-from src.data_processor import DataProcessor
+from sklearn.metrics import mean_absolute_error
+from src.dataset_store import load_bookings, iter_bookings
+from src.data_processor import DataProcessor, TRAINING_COLUMNS
+from src.drift_sketch import DriftSketch
+from src.instrumentation import peak_rss_mb
 from src.model_trainer import ModelTrainer
 
-def train_initial_model():
-    # Load data
-    df = pd.read_csv('data/tennis_bookings.csv')
-    
-    # Initialize processor and prepare data
+def train_initial_model(dtype=np.float32, sparse=False):
+    # Stream only the model's columns (Parquet store if present, otherwise the
+    # CSV export); the feature matrix is the only thing held in full
     processor = DataProcessor()
-    X, y = processor.prepare_data(df, is_training=True)
+    X, y = processor.prepare_streaming(lambda: iter_bookings(columns=TRAINING_COLUMNS),
+                                       dtype=dtype, sparse=sparse)
     
     # Train and save model
     trainer = ModelTrainer()
     trainer.train(X, y, processor.preprocessor)
+    finish_training(trainer)
     trainer.save_model()
     
     print("Model trained and saved successfully!")
+    _report_memory(X)
+
+def finish_training(trainer):
+    # Two more passes (bin edges, then counts) for the latest booking date and
+    # the input distribution that served quotes are later checked against for drift;
+    # every full training runs this before publishing so incremental updates and
+    # the drift monitor have what they need
+    latest = []
+    def chunks():
+        for chunk in iter_bookings(columns=TRAINING_COLUMNS + ['booking_date']):
+            latest.append(pd.to_datetime(chunk['booking_date']).max())
+            yield chunk
+    trainer.drift_snapshot = DriftSketch.from_chunks(chunks)
+    trainer.metadata['data_until'] = str(max(latest))
+    trainer.metadata['peak_rss_mb'] = peak_rss_mb()
+
+def train_incremental_model(since=None, new_trees=20, max_trees=None,
+                            holdout_fraction=0.2, max_regression=0.05, seed=42):
+    # Update the current model with bookings newer than `since` only
+    trainer = ModelTrainer()
+    processor = DataProcessor()
+    processor.preprocessor = trainer.load_model(mmap_mode=None)
+    
+    since = since or trainer.metadata.get('data_until')
+    if since is None:
+        raise ValueError("Current model has no data_until; pass since= or run a full training")
+    
+    df = load_bookings(columns=TRAINING_COLUMNS + ['booking_date'],
+                       filters=[('booking_date', '>', pd.Timestamp(since))])
+    if df.empty:
+        print(f"No new bookings since {since}; model unchanged.")
+        return None
+    
+    holdout = df.sample(frac=holdout_fraction, random_state=seed)
+    new_data = df.drop(holdout.index)
+    mae_before = mean_absolute_error(
+        holdout['price'], trainer.predict(processor.preprocessor.transform(holdout)))
+    
+    # The fitted scaler stays frozen: new trees are fitted on the transform the
+    # existing trees were, so those trees return exactly what they did before.
+    # (Rescaling their thresholds instead moved float32 inputs across splits.)
+    X_new = processor.preprocessor.transform(new_data)
+    trainer.train_incremental(X_new, new_data['price'], new_trees, max_trees)
+    if trainer.drift_snapshot is not None:
+        trainer.drift_snapshot.update_frame(new_data)
+    
+    mae_after = mean_absolute_error(
+        holdout['price'], trainer.predict(processor.preprocessor.transform(holdout)))
+    print(f"Holdout MAE: {mae_before:.3f} before, {mae_after:.3f} after "
+          f"({len(new_data)} new rows, {len(trainer.model.estimators_)} trees)")
+    
+    if mae_after > mae_before * (1 + max_regression):
+        print("Holdout error regressed; keeping the current model.")
+        return None
+    
+    trainer.metadata['data_until'] = str(pd.to_datetime(df['booking_date']).max())
+    trainer.metadata['holdout_mae'] = round(mae_after, 4)
+    trainer.save_model()
+    print("Model updated incrementally and saved successfully!")
+    _report_memory(X_new)
+    return trainer
+
+def _report_memory(X):
+    peak = peak_rss_mb()
+    if peak is not None:
+        size = X.data.nbytes if hasattr(X, 'nnz') else X.nbytes
+        print(f"Peak RSS: {peak:.0f} MB (feature matrix {size / 2**20:.1f} MB, {X.dtype})")
 
 if __name__ == "__main__":
-    train_initial_model() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the price model")
+    parser.add_argument('--incremental', action='store_true',
+                        help="add trees for bookings newer than the current model's data")
+    parser.add_argument('--since', default=None, help="override the incremental start date")
+    parser.add_argument('--new-trees', type=int, default=20)
+    parser.add_argument('--max-trees', type=int, default=None)
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float32',
+                        help="feature matrix precision for full training")
+    parser.add_argument('--sparse', action='store_true',
+                        help="build a sparse feature matrix for full training")
+    args = parser.parse_args()
+    
+    if args.incremental:
+        train_incremental_model(args.since, args.new_trees, args.max_trees)
+    else:
+        train_initial_model(np.dtype(args.dtype), args.sparse)